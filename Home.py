@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.prewarm import prewarm
 from utils.style import load_css
 
 # Set page config
@@ -18,6 +19,7 @@ for _ in range(20):
 
 
 # Caption at the bottom
-st.caption("Built with ❤️ by BADA") 
-
+st.caption("Built with ❤️ by BADA")
 
+# Home needs no data modules; start loading them for the next page
+prewarm()
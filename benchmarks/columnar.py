@@ -0,0 +1,128 @@
+"""Row-by-row loading versus the columnar Arrow reader, for what st.dataframe shows.
+
+    python -m benchmarks.columnar                           # 100k and 1M bookings
+    python -m benchmarks.columnar --size 100000 --output columnar.json
+
+Reads Travel_View and Customer from a throwaway copy of a generated database
+three ways and ends each with the Arrow table st.dataframe sends to the
+browser: cursor.fetchall() into a DataFrame, pd.read_sql_query(), both then
+converted with pa.Table.from_pandas() as Streamlit does, and fetch_arrow(),
+which is Arrow already. Every load runs in its own process; reported are the
+elapsed time, the growth of the process's peak resident memory (Linux
+ru_maxrss) and the size of what was loaded (the DataFrame, or the table).
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.run import ROOT, database_for
+
+DEFAULT_SIZES = [100000, 1000000]
+
+QUERIES = {
+    "Travel_View": "SELECT * FROM Travel_View ORDER BY travel_id",
+    "Customer": "SELECT * FROM Customer ORDER BY customer_id",
+}
+
+METHODS = ["fetchall + DataFrame", "read_sql_query", "fetch_arrow"]
+
+
+# --- Worker ---
+
+def _peak_bytes():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+def load(method, query):
+    import pandas as pd
+    import pyarrow as pa
+    from utils.database import fetch_arrow, get_read_connection
+
+    if method == "fetch_arrow":
+        table = fetch_arrow(query)
+        return table, table.nbytes
+    with get_read_connection() as conn:
+        if method == "read_sql_query":
+            df = pd.read_sql_query(query, conn)
+        else:
+            cursor = conn.execute(query)
+            df = pd.DataFrame(cursor.fetchall(), columns=[col[0] for col in cursor.description])
+    frame_bytes = int(df.memory_usage(deep=True).sum())
+    return pa.Table.from_pandas(df, preserve_index=False), frame_bytes
+
+
+def run(method, name):
+    import pandas  # noqa: F401  Imported before the baseline, like a page does
+    import pyarrow  # noqa: F401
+    from utils.database import get_read_pool
+
+    get_read_pool()  # Migrations and connection setup are not part of the load
+    baseline = _peak_bytes()
+    started = time.perf_counter()
+    table, result_bytes = load(method, QUERIES[name])
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": table.num_rows,
+        "ms": round(elapsed * 1000, 1),
+        "peak_bytes": _peak_bytes() - baseline,
+        "result_bytes": int(result_bytes),
+    }
+
+
+# --- Runner ---
+
+def run_size(size, seed):
+    source = database_for(size, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "travel.database")
+        shutil.copyfile(source, database)
+        env = dict(os.environ, TRAVEL_DATABASE=database,
+                   TRAVEL_SLOW_QUERY_LOG=os.path.join(workdir, "slow_queries.log"))
+        for name in QUERIES:
+            for method in METHODS:
+                # A fresh process per load, so one load's peak memory does not hide the next
+                command = [sys.executable, "-m", "benchmarks.columnar", "--worker", method, name]
+                output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+                if output.returncode != 0:
+                    raise RuntimeError(f"Columnar worker failed:\n{output.stderr[-4000:]}")
+                results.setdefault(name, {})[method] = json.loads(output.stdout)
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        import logging
+        logging.disable(logging.WARNING)
+        return json.dump(run(argv[1], argv[2]), sys.stdout)
+
+    parser = argparse.ArgumentParser(description="Compare row-by-row loading with the columnar Arrow reader.")
+    parser.add_argument("--size", type=int, action="append", help="Bookings in the generated database (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.size or DEFAULT_SIZES:
+        results[size] = run_size(size, args.seed)
+        print(f"\n{size:,} bookings")
+        print(f"  {'query':<12} {'method':<22} {'rows':>10} {'ms':>9} {'peak MB':>9} {'result MB':>10}")
+        for name, methods in results[size].items():
+            for method, result in methods.items():
+                print(f"  {name:<12} {method:<22} {result['rows']:>10,} {result['ms']:>9.0f} "
+                      f"{result['peak_bytes'] / 1e6:>9.1f} {result['result_bytes'] / 1e6:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Write amplification of a typical editing session, before and after change-only triggers.
+
+    python -m benchmarks.edit_session
+    python -m benchmarks.edit_session --size 100000 --saves 100 --output edits.json
+
+Replays the same generated editing session against two throwaway copies of a
+generated database: one at schema version 5 (history and summary triggers
+fire on every UPDATE of Travel) and one at the latest version (they fire
+only when a column they track changed). Each save is one transaction of
+editor-style UPDATEs that set only the edited columns, mixing Notes edits,
+pickup changes, payments and re-saves of unchanged values. Reported per
+variant: Travel_History rows added, rows written including trigger writes,
+WAL bytes written and elapsed time.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.run import database_for
+
+DEFAULT_SIZE = 100000
+DEFAULT_SAVES = 40
+ROWS_PER_SAVE = 25
+
+# Share of edits per kind in a session
+EDIT_MIX = {"notes": 0.4, "pickup": 0.25, "payment": 0.2, "resave": 0.15}
+
+BEFORE_VERSION = 5
+
+
+# --- Session ---
+
+def build_session(database, saves, seed):
+    """[[(sql, params), ...] per save], the same for every variant."""
+    rng = random.Random(seed)
+    with sqlite3.connect(database) as conn:
+        rows = conn.execute("SELECT travel_id, pickup_time, pickup_id, deposite, payment FROM Travel").fetchall()
+        pickup_ids = [row[0] for row in conn.execute("SELECT pickup_id FROM Pickup")]
+    kinds, weights = zip(*EDIT_MIX.items())
+    session = []
+    for save in range(saves):
+        statements = []
+        for travel_id, pickup_time, pickup_id, deposite, payment in rng.sample(rows, ROWS_PER_SAVE):
+            kind = rng.choices(kinds, weights)[0]
+            if kind == "notes":
+                statements.append(("UPDATE Travel SET Notes = ? WHERE travel_id = ?",
+                                   (f"edited in save {save}", travel_id)))
+            elif kind == "pickup":
+                statements.append(("UPDATE Travel SET pickup_id = ?, pickup_time = ? WHERE travel_id = ?",
+                                   (rng.choice(pickup_ids), pickup_time, travel_id)))
+            elif kind == "payment":
+                statements.append(("UPDATE Travel SET payment = ? WHERE travel_id = ?",
+                                   ((payment or 0) + 100, travel_id)))
+            else:
+                # Edited and changed back, or a cell the editor reports with its old value
+                statements.append(("UPDATE Travel SET deposite = ?, payment = ? WHERE travel_id = ?",
+                                   (deposite, payment, travel_id)))
+        session.append(statements)
+    return session
+
+
+def replay(database, session, target):
+    from utils.migrations import upgrade
+
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        upgrade(conn, target)
+        conn.execute("PRAGMA wal_autocheckpoint=0")  # Keep every frame so the WAL size is the bytes written
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        history_before = conn.execute("SELECT COUNT(*) FROM Travel_History").fetchone()[0]
+        changes_before = conn.total_changes
+
+        started = time.perf_counter()
+        for statements in session:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        elapsed = time.perf_counter() - started
+
+        return {
+            "edits": sum(len(statements) for statements in session),
+            "history_rows": conn.execute("SELECT COUNT(*) FROM Travel_History").fetchone()[0] - history_before,
+            "rows_written": conn.total_changes - changes_before,
+            "wal_bytes": os.path.getsize(database + "-wal"),
+            "ms": round(elapsed * 1000, 1),
+        }
+    finally:
+        conn.close()
+
+
+# --- Runner ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare history/summary write amplification of an editing session.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Bookings in the generated database")
+    parser.add_argument("--saves", type=int, default=DEFAULT_SAVES, help=f"Saves of {ROWS_PER_SAVE} edited rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.disable(logging.WARNING)
+    from utils.migrations import LATEST_VERSION
+
+    source = database_for(args.size, args.seed)
+    session = build_session(source, args.saves, args.seed)
+    results = {}
+    for name, target in (("every update", BEFORE_VERSION), ("changed columns only", LATEST_VERSION)):
+        with tempfile.TemporaryDirectory() as workdir:
+            database = os.path.join(workdir, "travel.database")
+            shutil.copyfile(source, database)
+            results[name] = replay(database, session, target)
+
+    print(f"{args.saves} saves of {ROWS_PER_SAVE} rows against {args.size:,} bookings")
+    print(f"  {'triggers':<22} {'history rows':>12} {'rows written':>12} {'WAL KiB':>10} {'ms':>8}")
+    for name, result in results.items():
+        print(f"  {name:<22} {result['history_rows']:>12,} {result['rows_written']:>12,} "
+              f"{result['wal_bytes'] / 1024:>10,.0f} {result['ms']:>8.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Memory of the editor frames, as loaded and after compact_frame().
+
+    python -m benchmarks.frame_memory                       # 100k bookings
+    python -m benchmarks.frame_memory --size 1000000 --output memory.json
+
+Loads the Travel_View and Customer frames the editor pages use from a
+throwaway copy of a generated database and reports, per frame, the memory
+of the frame as read (object and string columns) and after typing, with
+the columns that shrank most and the load time. "Per session" is what one
+editor page rerun holds: the frame plus the copy st.data_editor makes of it
+(the pages used to keep a display copy too).
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.run import ROOT, database_for
+
+DEFAULT_SIZE = 100000
+DEFAULT_TOP = 6
+
+
+def measure(load):
+    started = time.perf_counter()
+    df = load()
+    elapsed = time.perf_counter() - started
+    return df, round(elapsed * 1000, 1)
+
+
+def column_savings(raw, compact):
+    before = raw.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    return sorted(((column, int(before[column]), int(after[column]), str(compact[column].dtype))
+                   for column in raw.columns), key=lambda item: item[2] - item[1])
+
+
+def run(top):
+    import pandas as pd
+    from utils.database import get_read_connection, get_table_data
+    from utils.lookups import get_lookup_options, LOOKUP_TABLES
+    from utils.travels import load_travel_view
+
+    def raw_frame(query):
+        with get_read_connection() as conn:
+            return pd.read_sql_query(query, conn)
+
+    lookup_options = get_lookup_options()
+    categories = {table: list(lookup_options[table].values()) for table in LOOKUP_TABLES}
+    loaders = {
+        "Travel_View": (lambda: raw_frame("SELECT * FROM Travel_View ORDER BY travel_id"),
+                        lambda: load_travel_view(categories)),
+        "Customer": (lambda: raw_frame("SELECT * FROM Customer ORDER BY customer_id"),
+                     lambda: get_table_data("Customer")),
+    }
+    results = {}
+    for name, (load_raw, load_compact) in loaders.items():
+        raw, raw_ms = measure(load_raw)
+        compact, compact_ms = measure(load_compact)
+        before = int(raw.memory_usage(deep=True).sum())
+        after = int(compact.memory_usage(deep=True).sum())
+        results[name] = {
+            "rows": len(compact),
+            "before_bytes": before,
+            "after_bytes": after,
+            # Page frame + display copy + data_editor copy before; frame + data_editor copy now
+            "session_before_bytes": 3 * before,
+            "session_after_bytes": 2 * after,
+            "load_ms_before": raw_ms,
+            "load_ms_after": compact_ms,
+            "columns": column_savings(raw, compact)[:top],
+        }
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        import logging
+        logging.disable(logging.WARNING)
+        return json.dump(run(int(argv[1])), sys.stdout)
+
+    parser = argparse.ArgumentParser(description="Memory of the editor frames before and after typing.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Bookings in the generated database")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Columns listed per frame")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    source = database_for(args.size, args.seed)
+    # A fresh process per run, so DB_PATH and the caches point at the copy
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "travel.database")
+        shutil.copyfile(source, database)
+        env = dict(os.environ, TRAVEL_DATABASE=database,
+                   TRAVEL_SLOW_QUERY_LOG=os.path.join(workdir, "slow_queries.log"))
+        command = [sys.executable, "-m", "benchmarks.frame_memory", "--worker", str(args.top)]
+        output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            raise RuntimeError(f"Frame memory worker failed:\n{output.stderr[-4000:]}")
+        results = json.loads(output.stdout)
+
+    for name, result in results.items():
+        print(f"\n{name}: {result['rows']:,} rows, {result['before_bytes'] / 1e6:.1f} MB -> "
+              f"{result['after_bytes'] / 1e6:.1f} MB ({result['before_bytes'] / max(result['after_bytes'], 1):.1f}x), "
+              f"per session {result['session_before_bytes'] / 1e6:.1f} MB -> "
+              f"{result['session_after_bytes'] / 1e6:.1f} MB, "
+              f"load {result['load_ms_before']:.0f} ms -> {result['load_ms_after']:.0f} ms")
+        for column, before, after, dtype in result["columns"]:
+            print(f"  {column:<20} {before / 1e6:>7.2f} MB -> {after / 1e6:>6.2f} MB  {dtype}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
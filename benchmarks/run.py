@@ -0,0 +1,260 @@
+"""Headless microbenchmarks for utils.database and the page data loaders.
+
+    python -m benchmarks.run                                   # 1k and 100k bookings
+    python -m benchmarks.run --sizes 1000 1000000 --output results.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.25
+
+Each size gets a generated database (cached under benchmarks/.data) and a
+fresh worker process that works on a throwaway copy of it, so the pool,
+Streamlit caches and DB_PATH start clean. Page functions are loaded from
+the page files without running the page itself. The run exits with
+status 1 when a benchmark's metric regresses past the threshold.
+"""
+import argparse
+import ast
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "benchmarks", ".data")
+
+DEFAULT_SIZES = [1000, 100000]
+DEFAULT_REPEAT = 20
+DEFAULT_THRESHOLD = 0.25  # 25% slower than the baseline fails
+METRICS = ["min_ms", "median_ms", "p95_ms"]
+
+
+# --- Page Functions ---
+
+def load_page_functions(page, names):
+    """Returns {name: function} for top-level functions of a page file.
+
+    Only the page's imports and the requested function definitions are
+    executed, so no widgets are rendered.
+    """
+    path = os.path.join(ROOT, "pages", page)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    body = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+            or (isinstance(node, ast.FunctionDef) and node.name in names)]
+    namespace = {"__name__": f"page_{os.path.splitext(page)[0]}"}
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, "exec"), namespace)
+    missing = [name for name in names if name not in namespace]
+    if missing:
+        raise LookupError(f"{page} has no function(s) {', '.join(missing)}")
+    return {name: namespace[name] for name in names}
+
+
+# --- Worker ---
+
+def _time(function, repeat, setup=None):
+    samples = []
+    for iteration in range(repeat):
+        argument = setup(iteration) if setup else None
+        started = time.perf_counter()
+        function(argument) if setup else function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(repeat, only=None):
+    """Runs every benchmark against TRAVEL_DATABASE; returns {name: stats}."""
+    from utils.database import get_db_connection, get_table_data, update_row, delete_row, read_snapshot
+    from utils.lookups import get_lookup_options, invalidate_lookups
+    from utils.travels import fetch_travel_page, count_travels
+    from utils.search import search_customers
+    from utils.dispatch import fetch_pickups, day_window
+    from utils.reports import run_report
+    from utils.history import book_totals_as_of, booking_as_of
+    get_all_customers = load_page_functions("11_Customer.py", ["get_all_customers"])["get_all_customers"]
+
+    with get_db_connection() as conn:
+        travel_ids = [row[0] for row in conn.execute(
+            "SELECT travel_id FROM Travel ORDER BY travel_id DESC LIMIT ?", (repeat,))]
+        product_id, = conn.execute("SELECT MIN(product_id) FROM Product").fetchone()
+        vendor_id, = conn.execute("SELECT MIN(vendor_id) FROM Vendor").fetchone()
+        pickup_id, busiest_day = conn.execute(
+            "SELECT pickup_id, substr(MAX(pickup_time), 1, 10) FROM Travel WHERE pickup_id IS NOT NULL"
+        ).fetchone()
+    dispatch_window = day_window(datetime.date.fromisoformat(busiest_day)) if busiest_day else None
+    # Month-end close: the last month with bookings
+    close_month = {"date_from": busiest_day[:8] + "01", "date_to": busiest_day} if busiest_day else None
+
+    def connection_round_trip():
+        with get_db_connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+
+    def listing_snapshot():
+        with read_snapshot():
+            fetch_travel_page(page_size=50)
+            count_travels(exact=False)
+
+    def cold_lookups():
+        invalidate_lookups()
+        get_lookup_options()
+
+    benchmarks = {
+        "get_db_connection": (connection_round_trip, None),
+        "get_table_data[Customer]": (lambda: get_table_data("Customer"), None),
+        "get_table_data[Product]": (lambda: get_table_data("Product"), None),
+        "update_row[Product]": (lambda: update_row("Product", "product_id",
+                                                   {"product_id": product_id, "Notes": "benchmark"}), None),
+        # Each iteration deletes a different booking (the database is a throwaway copy)
+        "delete_row[Travel]": (lambda travel_id: delete_row("Travel", "travel_id", travel_id),
+                               lambda iteration: travel_ids[iteration % len(travel_ids)]),
+        # get_all_travels() was replaced by the keyset-paged listing
+        "fetch_travel_page[first]": (lambda: fetch_travel_page(page_size=50), None),
+        "fetch_travel_page[vendor,pickup_time]": (
+            lambda: fetch_travel_page({"vendor_id": vendor_id}, sort_by="pickup_time", page_size=50), None),
+        "count_travels[estimate]": (lambda: count_travels(exact=False), None),
+        "count_travels[vendor]": (lambda: count_travels({"vendor_id": vendor_id}), None),
+        "read_snapshot[page+count]": (listing_snapshot, None),
+        "fetch_pickups[day]": (lambda: fetch_pickups(*dispatch_window), None),
+        "fetch_pickups[day,location]": (lambda: fetch_pickups(*dispatch_window, pickup_id), None),
+        "run_report[vendor]": (lambda: run_report("vendor"), None),  # From Travel_Summary
+        "run_report[vendor,month filter]": (lambda: run_report("vendor", close_month), None),
+        "run_report[representative]": (lambda: run_report("representative"), None),
+        "run_report[product,by month]": (lambda: run_report("product", by_month=True), None),
+        "booking_as_of": (lambda travel_id: booking_as_of(travel_id, busiest_day),
+                          lambda iteration: travel_ids[iteration % len(travel_ids)]),
+        "book_totals_as_of": (lambda: book_totals_as_of(close_month["date_from"]), None),
+        "get_all_customers": (get_all_customers, None),
+        "get_lookup_options[cold]": (cold_lookups, None),
+        "get_lookup_options[warm]": (get_lookup_options, None),
+        "search_customers[prefix]": (lambda: search_customers("kim"), None),
+        "search_customers[hangul]": (lambda: search_customers("동규"), None),
+    }
+    results = {}
+    for name, (function, setup) in benchmarks.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = _time(function, repeat, setup)
+    return results
+
+
+def worker_main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", nargs="*")
+    args = parser.parse_args(argv)
+
+    import logging
+    # Bare-mode Streamlit warns on every cache and session_state access
+    logging.disable(logging.WARNING)
+    json.dump(run_benchmarks(args.repeat, args.only), sys.stdout)
+
+
+# --- Runner ---
+
+def database_for(size, seed):
+    """Path of a generated database with `size` bookings, building it on first use."""
+    from utils.generate_data import generate
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"travel_{size}_seed{seed}.database")
+    if not os.path.exists(path):
+        print(f"Generating {size:,} bookings into {path} ...", file=sys.stderr)
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, size, seed=seed)
+        os.replace(partial, path)
+    return path
+
+
+def run_size(size, seed, repeat, only):
+    source = database_for(size, seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        copy = os.path.join(workdir, "travel.database")
+        shutil.copyfile(source, copy)
+        env = dict(os.environ, TRAVEL_DATABASE=copy,
+                   TRAVEL_SLOW_QUERY_LOG=os.path.join(workdir, "slow_queries.log"))
+        command = [sys.executable, "-m", "benchmarks.run", "--worker", "--repeat", str(repeat)]
+        if only:
+            command += ["--only", *only]
+        output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            raise RuntimeError(f"Benchmark worker failed for size {size}:\n{output.stderr}")
+        return json.loads(output.stdout)
+
+
+def compare(results, baseline, metric, threshold):
+    """Lists (size, benchmark, baseline, current) for every regression past threshold."""
+    regressions = []
+    for size, benchmarks in results["results"].items():
+        for name, stats in benchmarks.items():
+            before = baseline.get("results", {}).get(size, {}).get(name, {}).get(metric)
+            if before and stats[metric] > before * (1 + threshold):
+                regressions.append((size, name, before, stats[metric]))
+    return regressions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        return worker_main(argv[1:])
+
+    parser = argparse.ArgumentParser(description="Run the database and page loader benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Bookings per database")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per benchmark")
+    parser.add_argument("--only", nargs="+", help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--metric", choices=METRICS, default="median_ms")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        results["results"][str(size)] = run_size(size, args.seed, args.repeat, args.only)
+
+    for size, benchmarks in results["results"].items():
+        print(f"\n{int(size):,} bookings")
+        for name, stats in benchmarks.items():
+            print(f"  {name:<40} {stats['median_ms']:>10.3f} ms median  {stats['p95_ms']:>10.3f} ms p95")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.metric, args.threshold)
+        for size, name, before, after in regressions:
+            print(f"REGRESSION {name} at {int(size):,} bookings: {args.metric} {before:.3f} -> {after:.3f}")
+        if regressions:
+            sys.exit(1)
+        print(f"\nNo {args.metric} regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Cold-start profile: import time per module and time to first paint per page.
+
+    python -m benchmarks.startup                         # every page
+    python -m benchmarks.startup --pages Home.py pages/21_Travel.py --top 5
+    python -m benchmarks.startup --output startup.json
+
+Each page runs once in a fresh `python -X importtime` process against a
+throwaway copy of a generated database, so nothing is imported or cached
+beforehand. "First paint" is the first full script run through AppTest
+(Streamlit itself is imported before the clock starts); "rerun" is the
+second run in the same process. The import list shows the top-level
+modules the page pulled in during its first run.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.run import ROOT, database_for
+
+DEFAULT_SIZE = 1000
+DEFAULT_TOP = 8
+MARKER = "--- page run ---"
+
+
+# --- Worker ---
+
+def worker_main(page):
+    import logging
+    from streamlit.testing.v1 import AppTest
+    logging.disable(logging.WARNING)
+
+    sys.stderr.flush()
+    os.write(2, f"{MARKER}\n".encode())
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120)
+    started = time.perf_counter()
+    at.run()
+    first_paint = time.perf_counter() - started
+    started = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - started
+    sys.stderr.flush()
+    os.write(2, f"{MARKER}\n".encode())
+
+    json.dump({
+        "first_paint_ms": round(first_paint * 1000, 1),
+        "rerun_ms": round(rerun * 1000, 1),
+        "pandas_loaded": "pandas" in sys.modules,
+        "errors": [str(e.value) for e in at.exception] + [str(e.value) for e in at.error],
+    }, sys.stdout)
+
+
+# --- Runner ---
+
+def parse_importtime(stderr):
+    """[(module, cumulative_ms)] for the top-level imports made between the two markers."""
+    sections = stderr.split(f"{MARKER}\n")
+    lines = sections[1].splitlines() if len(sections) > 2 else []
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Nested imports are indented under the module that pulled them in
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return imports
+
+
+def profile_page(page, database):
+    command = [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--worker", page]
+    env = dict(os.environ, TRAVEL_DATABASE=database,
+               TRAVEL_SLOW_QUERY_LOG=os.path.join(os.path.dirname(database), "slow_queries.log"))
+    output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"Startup worker failed for {page}:\n{output.stderr[-4000:]}")
+    result = json.loads(output.stdout)
+    imports = parse_importtime(output.stderr)
+    result["import_ms"] = round(sum(ms for _, ms in imports), 1)
+    result["imports"] = sorted(imports, key=lambda item: -item[1])
+    return result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        return worker_main(argv[1])
+
+    parser = argparse.ArgumentParser(description="Profile import time and first paint of every page.")
+    parser.add_argument("--pages", nargs="+", help="Page files relative to the repository (default: all)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Bookings in the generated database")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Imports listed per page")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    pages = args.pages or ["Home.py"] + sorted(os.path.relpath(path, ROOT)
+                                               for path in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    source = database_for(args.size, 0)
+    results = {}
+    for page in pages:
+        # A fresh copy per page, so the first page does not pay for everyone's WAL setup
+        with tempfile.TemporaryDirectory() as workdir:
+            database = os.path.join(workdir, "travel.database")
+            shutil.copyfile(source, database)
+            results[page] = profile_page(page, database)
+
+        result = results[page]
+        print(f"\n{page}: first paint {result['first_paint_ms']:.1f} ms, rerun {result['rerun_ms']:.1f} ms, "
+              f"imports {result['import_ms']:.1f} ms, pandas {'loaded' if result['pandas_loaded'] else 'not loaded'}")
+        for name, ms in result["imports"][:args.top]:
+            print(f"  {name:<40} {ms:>8.1f} ms")
+        for error in result["errors"]:
+            print(f"  ERROR {error}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,6 @@
-rm travel.database
-sqlite3 travel.database < travel.schema
+# Creates travel.database from travel.schema (with seed rows) if it does not exist,
+# otherwise upgrades it in place with any pending migrations.
+if [ ! -f travel.database ]; then
+    sqlite3 travel.database < travel.schema
+fi
+python -m utils.migrations
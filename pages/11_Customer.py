@@ -1,67 +1,54 @@
 import streamlit as st
 import sqlite3
-import pandas as pd
 import datetime
-from utils.database import get_db_connection
+from utils.database import fetch_arrow
+from utils.export import export_panel
+from utils.writer import execute_write
+from utils.search import search_customers
+from utils.debug import query_debug_panel
 from utils.style import load_css
 
-# --- Lookup Data Fetching ---
-def get_customer_names_for_lookup():
-    """Fetches list of customer names (First Name + Last Name) for dropdowns."""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT first_name, last_name FROM Customer WHERE status=1 ORDER BY first_name, last_name")
-            # Create "First Name Last Name" string for dropdown display and storage in Travel table
-            names = [f"{row['first_name']} {row['last_name']}" for row in cursor.fetchall()]
-            return ["Select..."] + names
-    except Exception:
-        return ["Select..."]
-
-
 # --- Customer Table CRUD ---
 
 def add_customer(data):
     """Inserts a new customer into the Customer table."""
     try:
-        with get_db_connection() as conn:
-            query = """
-            INSERT INTO Customer (
-                first_name, middle_name, last_name, hangul_name, sex, 
-                date_of_birth, credit_card, credit_card_date, is_representative
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            conn.execute(query, (
-                data['first_name'], data['middle_name'], data['last_name'], 
-                data['hangul_name'], data['sex'], data['date_of_birth'], 
-                data['credit_card'], data['credit_card_date'], data['is_representative']
-            ))
-            conn.commit()
-            st.success(f"Customer **{data['first_name']} {data['last_name']}** registered successfully!")
+        query = """
+        INSERT INTO Customer (
+            first_name, middle_name, last_name, hangul_name, sex, 
+            date_of_birth, credit_card, credit_card_date, is_representative
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        execute_write(query, (
+            data['first_name'], data['middle_name'], data['last_name'], 
+            data['hangul_name'], data['sex'], data['date_of_birth'], 
+            data['credit_card'], data['credit_card_date'], data['is_representative']
+        ))
+        # Shown after the rerun that clears the form
+        st.session_state["customer_added"] = f"Customer **{data['first_name']} {data['last_name']}** registered successfully!"
+        return True
     except Exception as e:
         st.error(f"Failed to add customer. Error: {e}")
+    return False
 
 def get_all_customers():
-    """Fetches all customer records for display."""
+    """Fetches all customer records for display, as an Arrow table (None on error)."""
     try:
-        with get_db_connection() as conn:
-            # Select all columns
-            cursor = conn.execute(f"SELECT * FROM Customer WHERE status = 1 ORDER BY customer_id")
-            df = pd.DataFrame(cursor.fetchall(), columns=[col[0] for col in cursor.description])
-            
-            if not df.empty:
-                # Rename columns for user interface
-                df = df.rename(columns={
-                    'first_name': 'First Name', 'middle_name': 'Middle Name', 'last_name': 'Last Name',
-                    'hangul_name': 'Hangul Name', 'sex':'Gender',
-                    'date_of_birth': 'Date of Birth', 'credit_card': 'Credit Card', 
-                    'credit_card_date': 'CC Exp Date'
-                })              
-            return df
+        # Columnar fetch: st.dataframe shows the table without a pandas copy
+        table = fetch_arrow("SELECT * FROM Customer WHERE status = 1 ORDER BY customer_id")
+        # Rename columns for user interface
+        return table.rename_columns({
+            'first_name': 'First Name', 'middle_name': 'Middle Name', 'last_name': 'Last Name',
+            'hangul_name': 'Hangul Name', 'sex':'Gender',
+            'date_of_birth': 'Date of Birth', 'credit_card': 'Credit Card', 
+            'credit_card_date': 'CC Exp Date'
+        })
     except sqlite3.OperationalError:
-        return pd.DataFrame()
+        return None
     except Exception as e:
         st.error(f"Error fetching customer data: {e}")
-        return pd.DataFrame()
+        return None
+
 
 # --- Streamlit UI Components ---
 
@@ -79,6 +66,8 @@ st.header("👤 Customer Management", divider='blue')
 
 # --- 1. Add New Customer Form ---
 with st.expander("➕ Register New Customer", expanded=True):
+    if "customer_added" in st.session_state:
+        st.success(st.session_state.pop("customer_added"))
     with st.form(key='add_customer_form'):
         
         # --- Customer Details ---
@@ -95,7 +84,7 @@ with st.expander("➕ Register New Customer", expanded=True):
             sex = st.selectbox("Gender *", options=["Select...", "Male", "Female", "Other"])
         with col6:
             # Use a date input and store as ISO string
-            dob = st.date_input("Date of Birth *", min_value=pd.to_datetime('1900-01-01').date())
+            dob = st.date_input("Date of Birth *", min_value=datetime.date(1900, 1, 1))
 
         st.markdown("---")
         # st.subheader("Payment Information ")
@@ -126,21 +115,29 @@ with st.expander("➕ Register New Customer", expanded=True):
                     'credit_card_date': credit_card_date.strip() or None,
                     'is_representative': 1 if representitive else 0
                 }
-                add_customer(customer_data)
-                st.rerun()
+                if add_customer(customer_data):
+                    st.rerun()
 
 st.subheader("Registered Customers")
 
-# --- 2. View All Customers ---
-df = get_all_customers()
-
-if df.empty:
-    st.info("No customers registered yet.")
+# --- 2. View All Customers (or search results) ---
+search_text = st.text_input("🔎 Search", placeholder="Name, hangul name or part of it", key="customer_search")
+if search_text.strip():
+    try:
+        df = search_customers(search_text)
+    except Exception as e:
+        st.error(f"Error searching customers: {e}")
+        df = None
 else:
-    # Reset the index to start from 1
-    df.index = df.index + 1
-    # Display customers in a static dataframe
-    st.dataframe(df, width='stretch')
+    df = get_all_customers()
 
+if df is None or len(df) == 0:
+    st.info("No customers match the search." if search_text.strip() else "No customers registered yet.")
+else:
+    # Display customers in a static dataframe (customer_id identifies the row)
+    st.dataframe(df, width='stretch', hide_index=True)
 
+    with st.expander("⬇️ Export", expanded=False):
+        export_panel("Customer", key="customer_export")
 
+query_debug_panel()
@@ -1,6 +1,8 @@
 import streamlit as st
 import sqlite3
-from utils.database import update_row, delete_row, get_table_data
+from utils.database import delete_row, get_table_data
+from utils.editor import has_editor_changes, save_editor_changes, reset_editor, show_save_result
+from utils.debug import query_debug_panel
 from utils.style import load_css
 
 # Set page config
@@ -9,14 +11,16 @@ load_css()
 
 st.header("🛠️ Update Customer", divider='blue')
 
+frames = {}  # Loaded frames, for the memory figures in the debug panel
 try:
     df = get_table_data("Customer")
+    frames["Customer"] = df
     
     if df.empty:
         st.warning("No customer data available.")
     else:
-        # Reset the index to start from 1 for display
-        display_df = df.copy()
+        # Reset the index to start from 1 for display (in place: a copy would double the frame)
+        display_df = df
         display_df.index = display_df.index + 1
         
         # st.subheader("Customer Data Editor")
@@ -54,53 +58,33 @@ try:
             )
         }
         
-        # Use data_editor for inline editing
-        edited_df = st.data_editor(
+        # Outcome of the last save, kept across the rerun that resets the editor
+        show_save_result(st.session_state.pop("customer_save_result", None))
+
+        # Use data_editor for inline editing; the versioned key lets a save or discard start fresh
+        editor_key = f"customer_editor_{st.session_state.get('customer_editor_version', 0)}"
+        st.data_editor(
             display_df,
             column_config=column_config,
             width='stretch',
             num_rows="dynamic",  # Allow adding/deleting rows
-            key="customer_editor",
+            key=editor_key,
             hide_index=False
         )
         
-        # Detect changes
-        if not df.equals(edited_df.reset_index(drop=True)):
+        # Detect changes from the editor's own edited/added/deleted delta
+        if has_editor_changes(editor_key):
             col1, col2, col3 = st.columns([1, 1, 4])
             
             with col1:
                 if st.button("💾 Save Changes", type="primary"):
-                    try:
-                        # Find modified rows
-                        modified_rows = []
-                        for idx in edited_df.index:
-                            original_idx = idx - 1  # Adjust for display index offset
-                            if original_idx < len(df):
-                                original_row = df.iloc[original_idx]
-                                edited_row = edited_df.iloc[idx - 1]
-                                
-                                # Check if row was modified
-                                if not original_row.equals(edited_row):
-                                    modified_rows.append((original_idx, edited_row))
-                        
-                        # Update modified rows
-                        success_count = 0
-                        for orig_idx, row in modified_rows:
-                            row_dict = row.to_dict()
-                            update_row("Customer", "customer_id", row_dict)
-                            success_count += 1
-                        
-                        if success_count > 0:
-                            st.success(f"✅ {success_count} row(s) updated successfully!")
-                            st.rerun()
-                        else:
-                            st.info("No changes detected.")
-                    
-                    except Exception as e:
-                        st.error(f"Error saving changes: {e}")
+                    st.session_state.customer_save_result = save_editor_changes("Customer", "customer_id", display_df, editor_key)
+                    reset_editor("customer_editor_version")
+                    st.rerun()
             
             with col2:
                 if st.button("🔄 Discard Changes"):
+                    reset_editor("customer_editor_version")
                     st.rerun()
         
         # Separate section for deletion
@@ -148,3 +132,5 @@ except sqlite3.OperationalError:
     st.warning("Customer table does not exist yet.")
 except Exception as e:
     st.error(f"Error fetching data from Customer table: {e}")
+
+query_debug_panel(frames)
@@ -1,90 +1,43 @@
 import streamlit as st
 import sqlite3
-import pandas as pd
 import datetime
-from utils.database import get_db_connection
+from utils.database import read_snapshot
+from utils.writer import execute_write
+from utils.lookups import get_lookup_options, lookup_selectbox
+from utils.importer import import_bookings, IMPORT_COLUMNS
+from utils.export import export_panel
+from utils.search import customer_picker
+from utils.travels import fetch_travel_page, count_travels, SORTABLE_COLUMNS
+from utils.debug import query_debug_panel
 from utils.style import load_css
 
-# --- Lookup Data Helpers ---
-
-def get_lookup_data(table_name):
-    """Fetches list of active items from a generic table for dropdowns."""
-    column_name = table_name
-    try:
-        with get_db_connection() as conn:
-            # Only fetch active items (status = 1)
-            cursor = conn.execute(f"SELECT {column_name} FROM {table_name} WHERE status = 1 ORDER BY {column_name} ")
-            # Prepend a default selection option
-            return ["Select..."] + [row[0] for row in cursor.fetchall()]
-    except Exception:
-        return ["Select..."]
-
-def get_customer_names():
-    """Fetches list of customer names (First Name + Last Name) for dropdowns."""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT first_name, last_name FROM Customer WHERE status=1 ORDER BY first_name, last_name")
-            # Access by index instead of by name
-            names = [f"{row[0]} {row[1]}" for row in cursor.fetchall()]
-            return ["Select..."] + names
-    except Exception:
-        return ["Select..."]
-
-def get_representitive_name():
-    """Fetches list of customer names (First Name + Last Name) for dropdowns."""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT first_name, last_name FROM Customer WHERE status=1 and is_representative = 1 ORDER BY first_name, last_name")
-            # Create "First Name Last Name" string for dropdown display and storage in Travel table
-            names = [f"{row[0]} {row[1]}" for row in cursor.fetchall()]
-            return ["Select..."] + names
-    except Exception:
-        return ["Select..."]
-
 # --- Travel Table CRUD ---
 
 def add_travel_entry(data):
     """Inserts a new travel entry."""
     try:
-        with get_db_connection() as conn:
-            query = """
-            INSERT INTO Travel (
-                Representative, Customer, Product, Vendor, Flight, Pickup, pickup_time, 
-                confirmation_code, airfair_IB, airfair_OB, time_IB, time_OB, 
-                deposite, payment, event_expense, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            conn.execute(query, (
-                data['Representative'], data['Customer'], data['Product'], data['Vendor'], data['Flight'], data['Pickup'],
-                data['pickup_time'], data['confirmation_code'], data['airfair_IB'], data['airfair_OB'],
-                data['time_IB'], data['time_OB'], data['deposite'], data['payment'], 
-                data['event_expense'], data['notes']
-            ))
-            conn.commit()
-            st.success(f"New travel entry confirmed with code: **{data['confirmation_code']}**")
+        query = """
+        INSERT INTO Travel (
+            representative_id, customer_id, product_id, vendor_id, client_id, flight_id, pickup_id, pickup_time, 
+            confirmation_code, airfair_IB, airfair_OB, time_IB, time_OB, 
+            deposite, payment, event_expense, notes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        execute_write(query, (
+            data['representative_id'], data['customer_id'], data['product_id'], data['vendor_id'],
+            data['client_id'], data['flight_id'], data['pickup_id'],
+            data['pickup_time'], data['confirmation_code'], data['airfair_IB'], data['airfair_OB'],
+            data['time_IB'], data['time_OB'], data['deposite'], data['payment'], 
+            data['event_expense'], data['notes']
+        ))
+        # Shown after the rerun that clears the form
+        st.session_state["travel_added"] = f"New travel entry confirmed with code: **{data['confirmation_code']}**"
+        return True
     except sqlite3.IntegrityError:
         st.error(f"Error: Confirmation Code '{data['confirmation_code']}' already exists.")
     except Exception as e:
         st.error(f"Failed to add travel entry. Error: {e}")
-
-def get_all_travels():
-    """Fetches all travel records."""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("SELECT * FROM Travel ORDER BY travel_id DESC")
-            df = pd.DataFrame(cursor.fetchall(), columns=[col[0] for col in cursor.description])
-            
-            if not df.empty:
-                # Drop system ID column
-                df = df.drop(columns=['travel_id'])
-            
-            return df
-    except sqlite3.OperationalError:
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error fetching travel data: {e}")
-        return pd.DataFrame()
-
+    return False
 
 st.set_page_config(
     page_title="Travel Data Manager",
@@ -96,31 +49,36 @@ load_css()
 
 st.header("🧳 Travel Management ", divider='green')
 
-# Fetch lookup data
-representitive_options = get_representitive_name()
-product_options = get_lookup_data("Product")
-vendor_options = get_lookup_data("Vendor")
-client_options = get_lookup_data("Client")
-customer_options = get_customer_names()
-flight_options = get_lookup_data("Flight")
-pickup_options = get_lookup_data("Pickup")
+# Fetch lookup data (cached, one query for all dropdowns); each is an {id: name} mapping
+lookup_options = get_lookup_options()
+product_options = lookup_options["Product"]
+vendor_options = lookup_options["Vendor"]
+client_options = lookup_options["Client"]
+flight_options = lookup_options["Flight"]
+pickup_options = lookup_options["Pickup"]
 
 # --- 1. Add New Travel Entry Form ---
 with st.expander("➕ Add New Travel Entry", expanded=True):
+    if "travel_added" in st.session_state:
+        st.success(st.session_state.pop("travel_added"))
+    # Customers are searched as you type, which needs reruns, so these sit outside the form
+    col0, col1 = st.columns(2)
+    with col0:
+        selected_representitive = customer_picker("Representitive *", key="new_travel_representative",
+                                                  representatives_only=True)
+    with col1:
+        selected_customer = customer_picker("Customer *", key="new_travel_customer")
+
     with st.form(key='add_travel_form'):
         
         # st.subheader("Booking Details")
-        col0, col1, col2, col3, col4 = st.columns(5)
-        with col0:
-            selected_representitive = st.selectbox("Representitive *", options=representitive_options)
-        with col1:
-            selected_customer = st.selectbox("Customer *", options=customer_options)               
+        col2, col3, col4 = st.columns(3)
         with col2:
-            selected_product = st.selectbox("Product", options=product_options)
+            selected_product = lookup_selectbox("Product", product_options)
         with col3:
-            selected_client = st.selectbox("Client", options=client_options)
+            selected_client = lookup_selectbox("Client", client_options)
         with col4:
-            selected_vendor = st.selectbox("Vendor", options=vendor_options)
+            selected_vendor = lookup_selectbox("Vendor", vendor_options)
 
         st.markdown("---")
         # st.subheader("Flight & Pickup Details")
@@ -132,7 +90,7 @@ with st.expander("➕ Add New Travel Entry", expanded=True):
         with col_confirmation:
             confirmation_code = st.text_input("Confirmation Code", max_chars=10)
         with col_flight:
-            selected_flight = st.selectbox("Flight Name", options=flight_options)          
+            selected_flight = lookup_selectbox("Flight Name", flight_options)          
         with col_ib_date:
             ib_date = st.date_input("Inbound Date", value=None)
         with col_ib_time:
@@ -147,7 +105,7 @@ with st.expander("➕ Add New Travel Entry", expanded=True):
         st.caption("Pickup Details ")
         col_pu_select, col_pu_date, col_pu_time, col_notes = st.columns(4)
         with col_pu_select:
-            selected_pickup = st.selectbox("Pickup Location", options=pickup_options)
+            selected_pickup = lookup_selectbox("Pickup Location", pickup_options)
         with col_pu_date:
             pickup_date = st.date_input("Pickup Date", value=None)
         with col_pu_time:
@@ -178,7 +136,7 @@ with st.expander("➕ Add New Travel Entry", expanded=True):
         
         if submit_button:
             # Validation
-            if selected_customer is None or selected_customer == "Select...":
+            if selected_customer is None:
                 st.error("Please fill out a Customer.")
             else:
                 # Format optional datetime fields to ISO 8601
@@ -195,13 +153,13 @@ with st.expander("➕ Add New Travel Entry", expanded=True):
                     pickup_time_str = datetime.datetime.combine(pickup_date, pickup_time).isoformat(' ', 'seconds')
 
                 travel_data = {
-                    'Representative': selected_representitive, # Full Name string
-                    'Customer': selected_customer, # Full Name string
-                    'Product': selected_product if selected_product != "Select..." else None,
-                    'Vendor': selected_vendor if selected_vendor != "Select..." else None,
-                    'Client': selected_client if selected_client != "Select..." else None,
-                    'Flight': selected_flight if selected_flight != "Select..." else None,
-                    'Pickup': selected_pickup if selected_pickup != "Select..." else None,
+                    'representative_id': selected_representitive, # customer_id of the representative
+                    'customer_id': selected_customer,
+                    'product_id': selected_product,
+                    'vendor_id': selected_vendor,
+                    'client_id': selected_client,
+                    'flight_id': selected_flight,
+                    'pickup_id': selected_pickup,
                     'pickup_time': pickup_time_str,
                     'confirmation_code': confirmation_code.strip(),
                     'airfair_IB': airfair_IB.strip() or None,
@@ -213,18 +171,118 @@ with st.expander("➕ Add New Travel Entry", expanded=True):
                     'event_expense': event_expense,
                     'notes': notes.strip() or None,
                 }
-                add_travel_entry(travel_data)
-                st.rerun()
+                if add_travel_entry(travel_data):
+                    st.rerun()
+
+# --- 2. Bulk Import from a Booking Sheet ---
+with st.expander("📥 Bulk Import (CSV / Excel)", expanded=False):
+    st.caption("Header row must use the Travel column names: " + ", ".join(IMPORT_COLUMNS))
+    uploaded_file = st.file_uploader("Booking Sheet", type=["csv", "xlsx"], key="import_file")
+    col_dry_run, col_chunk = st.columns(2)
+    with col_dry_run:
+        dry_run = st.checkbox("Dry run (validate only, nothing is saved)", value=True)
+    with col_chunk:
+        chunk_size = st.number_input("Rows per batch", min_value=500, max_value=50000, value=5000, step=500)
+
+    if uploaded_file is not None and st.button("Validate" if dry_run else "Import Bookings", type="primary"):
+        progress = st.empty()
+        try:
+            report = import_bookings(
+                uploaded_file, uploaded_file.name, chunk_size=int(chunk_size), dry_run=dry_run,
+                on_progress=lambda r: progress.caption(f"Processed {r['rows_read']:,} rows..."),
+            )
+        except Exception as e:
+            st.error(f"Failed to import booking sheet. Error: {e}")
+        else:
+            col_read, col_valid, col_saved, col_errors = st.columns(4)
+            col_read.metric("Rows Read", f"{report['rows_read']:,}")
+            col_valid.metric("Valid Rows", f"{report['rows_valid']:,}")
+            col_saved.metric("Rows Imported", f"{report['rows_inserted']:,}")
+            col_errors.metric("Errors", f"{report['error_count']:,}")
+            if report['error_count']:
+                st.dataframe(report['errors'], width='stretch', hide_index=True)
+                st.download_button(
+                    "Download Error Report", report['errors'].to_csv(index=False),
+                    file_name="import_errors.csv", mime="text/csv"
+                )
+            elif not dry_run:
+                st.success(f"Imported {report['rows_inserted']:,} travel entries.")
 
 st.subheader("All Travel Entries")
 
-# --- 2. View All Travel Entries ---
-df = get_all_travels()
-# Reset the index to start from 1
-df.index = df.index + 1
+# --- 3. View Travel Entries (filtered and paged in SQL) ---
+with st.expander("🔎 Filter & Sort", expanded=False):
+    col_search, col_from, col_to, col_vendor, col_product = st.columns(5)
+    with col_search:
+        filter_search = st.text_input("Search Code / Notes", key="filter_search")
+    with col_from:
+        filter_date_from = st.date_input("Pickup From", value=None, key="filter_date_from")
+    with col_to:
+        filter_date_to = st.date_input("Pickup To", value=None, key="filter_date_to")
+    with col_vendor:
+        filter_vendor = lookup_selectbox("Vendor", vendor_options, key="filter_vendor")
+    with col_product:
+        filter_product = lookup_selectbox("Product", product_options, key="filter_product")
+
+    col_customer, col_code, col_sort, col_order, col_size = st.columns(5)
+    with col_customer:
+        filter_customer = customer_picker("Customer", key="filter_customer")
+    with col_code:
+        filter_code = st.text_input("Confirmation Code", key="filter_code")
+    with col_sort:
+        sort_by = st.selectbox("Sort By", options=SORTABLE_COLUMNS, key="travel_sort_by")
+    with col_order:
+        sort_order = st.selectbox("Order", options=["Descending", "Ascending"], key="travel_sort_order")
+    with col_size:
+        page_size = st.selectbox("Rows per Page", options=[25, 50, 100, 200], index=1, key="travel_page_size")
+
+filters = {
+    'date_from': filter_date_from,
+    'date_to': filter_date_to,
+    'vendor_id': filter_vendor,
+    'product_id': filter_product,
+    'customer_id': filter_customer,
+    'confirmation_code': filter_code.strip() or None,
+    'search': filter_search.strip() or None,
+}
+descending = sort_order == "Descending"
+
+# Start again from the first page whenever the filters or sort change
+listing_key = (tuple(filters.items()), sort_by, descending, page_size)
+if st.session_state.get("travel_listing_key") != listing_key:
+    st.session_state.travel_listing_key = listing_key
+    st.session_state.travel_cursors = [None]  # Cursor that opened each visited page
+
+cursors = st.session_state.travel_cursors
+has_filters = any(value is not None for value in filters.values())
+# Page and count from one snapshot, so the row numbers agree with the total
+with read_snapshot():
+    df, next_cursor = fetch_travel_page(filters, sort_by, descending, page_size, cursors[-1])
+    total = count_travels(filters, exact=has_filters)
 
 if df.empty:
-    st.info("No travel entries registered yet.")
+    st.info("No travel entries registered yet." if not has_filters else "No travel entries match the filters.")
 else:
-    # Display travel entries
-    st.dataframe(df, width='stretch')
\ No newline at end of file
+    # Number rows by their position in the full result
+    first_row = (len(cursors) - 1) * page_size + 1
+    df = df.drop(columns=[col for col in df.columns if col.endswith('_id')])
+    df.index = range(first_row, first_row + len(df))
+    st.dataframe(df, width='stretch')
+
+    col_prev, col_next, col_info = st.columns([1, 1, 4])
+    with col_prev:
+        if st.button("◀ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_next:
+        if st.button("Next ▶", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col_info:
+        st.caption(f"Rows {first_row}–{first_row + len(df) - 1} of {'' if has_filters else 'about '}{total}")
+
+    # Export every row matching the filters, streamed from the database
+    with st.expander("⬇️ Export", expanded=False):
+        export_panel("Travel", filters, key="travel_export")
+
+query_debug_panel()
@@ -1,7 +1,11 @@
 import streamlit as st
 import sqlite3
-import pandas as pd
-from utils.database import update_row, delete_row, get_table_data  
+from utils.database import delete_row, read_snapshot
+from utils.editor import has_editor_changes, save_editor_changes, reset_editor, show_save_result
+from utils.summary import get_summary_totals, get_summary_breakdown
+from utils.lookups import get_lookup_options, LOOKUP_TABLES
+from utils.travels import load_travel_view
+from utils.debug import query_debug_panel
 from utils.style import load_css
 
 # Set page config
@@ -10,14 +14,23 @@ load_css()
 
 st.header("🛠️ Update Travel", divider='green')
 
+frames = {}  # Loaded frames, for the memory figures in the debug panel
 try:
-    df = get_table_data("Travel")
+    # Rows, totals and breakdowns from one snapshot, so they always agree
+    with read_snapshot():
+        lookup_options = get_lookup_options()
+        # Typed and categorical (see TRAVEL_VIEW_TYPES); every lookup name is a category
+        # so the editor's selectboxes can pick names no booking uses yet
+        df = load_travel_view({table: list(lookup_options[table].values()) for table in LOOKUP_TABLES})
+        frames["Travel_View"] = df
+        totals = get_summary_totals()
+        breakdowns = {scope: get_summary_breakdown(scope) for scope in ("vendor", "product", "month")}
     
     if df.empty:
         st.warning("No travel data available.")
     else:
-        # Reset the index to start from 1 for display
-        display_df = df.copy()
+        # Reset the index to start from 1 for display (in place: a copy would double the frame)
+        display_df = df
         display_df.index = display_df.index + 1
         
         st.subheader("Travel Data Editor")
@@ -30,26 +43,56 @@ try:
                 disabled=True,  # Primary key shouldn't be edited
                 help="Unique travel identifier"
             ),
-            "Product": st.column_config.TextColumn(
+            "Representative": st.column_config.TextColumn(
+                "Representative",
+                disabled=True,  # Change it through Representative ID
+                help="Representative name"
+            ),
+            "Customer": st.column_config.TextColumn(
+                "Customer",
+                disabled=True,  # Change it through Customer ID
+                help="Customer name"
+            ),
+            "representative_id": st.column_config.NumberColumn(
+                "Representative ID",
+                step=1,
+                help="Customer ID of the representative"
+            ),
+            "customer_id": st.column_config.NumberColumn(
+                "Customer ID",
+                step=1,
+                help="Customer ID (see Customer page)"
+            ),
+            "Client": st.column_config.SelectboxColumn(
+                "Client",
+                options=list(lookup_options["Client"].values()),
+                help="Client name"
+            ),
+            "client_id": None,  # Edited through the Client column
+            "Product": st.column_config.SelectboxColumn(
                 "Product",
+                options=list(lookup_options["Product"].values()),
                 help="Travel product name"
             ),
-            "Vendor": st.column_config.TextColumn(
+            "product_id": None,  # Edited through the Product column
+            "Vendor": st.column_config.SelectboxColumn(
                 "Vendor",
+                options=list(lookup_options["Vendor"].values()),
                 help="Vendor name"
             ),
-            "Customer": st.column_config.TextColumn(
-                "Customer",
-                help="Customer name"
-            ),
-            "Flight": st.column_config.TextColumn(
+            "vendor_id": None,  # Edited through the Vendor column
+            "Flight": st.column_config.SelectboxColumn(
                 "Flight",
+                options=list(lookup_options["Flight"].values()),
                 help="Flight information"
             ),
-            "Pickup": st.column_config.TextColumn(
+            "flight_id": None,  # Edited through the Flight column
+            "Pickup": st.column_config.SelectboxColumn(
                 "Pickup",
+                options=list(lookup_options["Pickup"].values()),
                 help="Pickup location"
             ),
+            "pickup_id": None,  # Edited through the Pickup column
             "pickup_time": st.column_config.DatetimeColumn(
                 "Pickup Time",
                 help="Format: YYYY-MM-DD HH:MM:SS",
@@ -106,53 +149,41 @@ try:
             )
         }
         
-        # Use data_editor for inline editing
-        edited_df = st.data_editor(
+        # Outcome of the last save, kept across the rerun that resets the editor
+        show_save_result(st.session_state.pop("travel_save_result", None))
+
+        # Names picked in the editor are saved as the matching ids
+        resolvers = {
+            table: (f"{table.lower()}_id", {name: row_id for row_id, name in lookup_options[table].items()})
+            for table in LOOKUP_TABLES
+        }
+
+        # Use data_editor for inline editing; the versioned key lets a save or discard start fresh
+        editor_key = f"travel_editor_{st.session_state.get('travel_editor_version', 0)}"
+        st.data_editor(
             display_df,
             column_config=column_config,
             width='stretch',
             num_rows="dynamic",  # Allow adding/deleting rows
-            key="travel_editor",
+            key=editor_key,
             hide_index=False
         )
         
-        # Detect changes
-        if not df.equals(edited_df.reset_index(drop=True)):
+        # Detect changes from the editor's own edited/added/deleted delta
+        if has_editor_changes(editor_key):
             col1, col2, col3 = st.columns([1, 1, 4])
             
             with col1:
                 if st.button("💾 Save Changes", type="primary"):
-                    try:
-                        # Find modified rows
-                        modified_rows = []
-                        for idx in edited_df.index:
-                            original_idx = idx - 1  # Adjust for display index offset
-                            if original_idx < len(df):
-                                original_row = df.iloc[original_idx]
-                                edited_row = edited_df.iloc[idx - 1]
-                                
-                                # Check if row was modified
-                                if not original_row.equals(edited_row):
-                                    modified_rows.append((original_idx, edited_row))
-                        
-                        # Update modified rows
-                        success_count = 0
-                        for orig_idx, row in modified_rows:
-                            row_dict = row.to_dict()
-                            update_row("Travel", "travel_id", row_dict)
-                            success_count += 1
-                        
-                        if success_count > 0:
-                            st.success(f"✅ {success_count} row(s) updated successfully!")
-                            st.rerun()
-                        else:
-                            st.info("No changes detected.")
-                    
-                    except Exception as e:
-                        st.error(f"Error saving changes: {e}")
+                    st.session_state.travel_save_result = save_editor_changes("Travel", "travel_id", display_df, editor_key,
+                                                 datetime_columns=["pickup_time", "time_IB", "time_OB"],
+                                                 resolvers=resolvers)
+                    reset_editor("travel_editor_version")
+                    st.rerun()
             
             with col2:
                 if st.button("🔄 Discard Changes"):
+                    reset_editor("travel_editor_version")
                     st.rerun()
         
         # Separate section for deletion
@@ -181,33 +212,36 @@ try:
                 except Exception as e:
                     st.error(f"Error deleting travel record: {e}")
         
-        # Display summary statistics
+        # Display summary statistics (maintained by triggers in Travel_Summary)
         st.divider()
         st.subheader("Summary Statistics")
         col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
         
         with col1:
-            st.metric("Total Travel Records", len(df))
+            st.metric("Total Travel Records", totals['record_count'])
         with col2:
-            total_deposits = df['deposite'].sum()
-            st.metric("Total Deposits", f"${total_deposits:,.0f}")
+            st.metric("Total Deposits", f"${totals['deposite']:,.0f}")
         with col3:
-            total_payments = df['payment'].sum()
-            st.metric("Total Payments", f"${total_payments:,.0f}")
+            st.metric("Total Payments", f"${totals['payment']:,.0f}")
         with col4:
-            total_expenses = df['event_expense'].sum()
-            st.metric("Total Event Expenses", f"${total_expenses:,.0f}")
+            st.metric("Total Event Expenses", f"${totals['event_expense']:,.0f}")
         with col5:
-            total_airfare_ib = df['airfair_IB'].sum()
-            st.metric("Total Inbound Airfare", f"${total_airfare_ib:,.0f}")
+            st.metric("Total Inbound Airfare", f"${totals['airfair_IB']:,.0f}")
         with col6:
-            total_airfare_ob = df['airfair_OB'].sum()
-            st.metric("Total Outbound Airfare", f"${total_airfare_ob:,.0f}")
+            st.metric("Total Outbound Airfare", f"${totals['airfair_OB']:,.0f}")
         with col7:
-            total_airfare = total_airfare_ib + total_airfare_ob
+            total_airfare = totals['airfair_IB'] + totals['airfair_OB']
             st.metric("Total Airfare", f"${total_airfare:,.0f}")
 
+        with st.expander("📊 Totals by Vendor, Product and Month", expanded=False):
+            tab_vendor, tab_product, tab_month = st.tabs(["Vendor", "Product", "Month"])
+            for tab, scope in ((tab_vendor, "vendor"), (tab_product, "product"), (tab_month, "month")):
+                with tab:
+                    st.dataframe(breakdowns[scope], width='stretch', hide_index=True)
+
 except sqlite3.OperationalError:
     st.warning("Travel table does not exist yet.")
 except Exception as e:
     st.error(f"Error fetching data from Travel table: {e}")
+
+query_debug_panel(frames)
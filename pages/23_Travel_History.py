@@ -0,0 +1,102 @@
+import streamlit as st
+import datetime
+from utils.database import read_snapshot
+from utils.export import table_to_csv
+from utils.history import booking_as_of, booking_timeline, find_booking, get_book_as_of
+from utils.retention import ARCHIVE_AFTER_DAYS, FULL_DETAIL_DAYS
+from utils.summary import get_summary_totals
+from utils.debug import query_debug_panel
+from utils.style import load_css
+
+st.set_page_config(
+    page_title="Travel History",
+    page_icon="📜",
+    layout="wide"
+)
+
+load_css()
+
+st.header("📜 Travel History", divider='green')
+
+# --- As Of ---
+today = datetime.date.today()
+col_date, col_time = st.columns(2)
+with col_date:
+    as_of_date = st.date_input("As Of Date", value=today.replace(day=1) - datetime.timedelta(days=1),
+                               key="history_as_of_date", help="Defaults to the end of last month")
+with col_time:
+    as_of_time = st.time_input("As Of Time (UTC)", value=datetime.time(23, 59), step=60,
+                               key="history_as_of_time", help="History is recorded in UTC")
+# Through the end of the chosen minute (history timestamps have seconds)
+as_of = datetime.datetime.combine(as_of_date, as_of_time) + datetime.timedelta(seconds=59)
+
+age_days = (datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - as_of).days
+if age_days > ARCHIVE_AFTER_DAYS:
+    st.warning(f"History older than {ARCHIVE_AFTER_DAYS} days is moved to the archive database by the "
+               "retention job, so bookings changed since then may show later values or be missing.")
+elif age_days > FULL_DETAIL_DAYS:
+    st.caption(f"History older than {FULL_DETAIL_DAYS} days keeps one version per booking per day.")
+
+# --- Whole Book ---
+st.subheader(f"Book as of {as_of:%Y-%m-%d %H:%M:%S} UTC")
+try:
+    # One snapshot, so the deltas compare the same moment's data
+    with read_snapshot():
+        book, totals = get_book_as_of(as_of)
+        current = get_summary_totals()
+except Exception as e:
+    st.error(f"Error reading Travel_History: {e}")
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Bookings", f"{totals['record_count']:,}",
+                delta=f"{current['record_count'] - totals['record_count']:+,} since", delta_color="off")
+    col2.metric("Deposits", f"${totals['deposite']:,.0f}",
+                delta=f"{current['deposite'] - totals['deposite']:+,.0f} since", delta_color="off")
+    col3.metric("Payments", f"${totals['payment']:,.0f}",
+                delta=f"{current['payment'] - totals['payment']:+,.0f} since", delta_color="off")
+    col4.metric("Event Expenses", f"${totals['event_expense']:,.0f}",
+                delta=f"{current['event_expense'] - totals['event_expense']:+,.0f} since", delta_color="off")
+
+    with st.expander(f"📋 Bookings as of {as_of:%Y-%m-%d} ({book.num_rows:,})", expanded=False):
+        st.dataframe(book, hide_index=True, width='stretch', column_config={
+            "as_of": st.column_config.TextColumn("Version Recorded"),
+        })
+        # Written only when the button is clicked, not on every rerun
+        st.download_button("⬇️ Download (CSV)", lambda: table_to_csv(book),
+                           file_name=f"book_as_of_{as_of:%Y%m%d_%H%M%S}.csv", mime="text/csv")
+
+# --- Booking Timeline ---
+st.subheader("Booking Timeline")
+col_code, col_id = st.columns(2)
+with col_code:
+    code = st.text_input("Confirmation Code", key="history_code").strip()
+with col_id:
+    travel_id = st.number_input("or Travel ID", min_value=0, value=0, step=1, key="history_travel_id")
+
+if code:
+    travel_id = find_booking(code)
+    if travel_id is None:
+        st.info(f"No booking has confirmation code '{code}'.")
+if travel_id:
+    try:
+        version = booking_as_of(travel_id, as_of)
+        timeline = booking_timeline(travel_id)
+    except Exception as e:
+        st.error(f"Error reading history for Travel ID {travel_id}: {e}")
+    else:
+        if timeline.empty:
+            st.info(f"No history recorded for Travel ID {travel_id}.")
+        else:
+            if version is None:
+                st.caption(f"Travel ID {travel_id} did not exist at {as_of:%Y-%m-%d %H:%M:%S} UTC.")
+            else:
+                st.caption(f"Travel ID {travel_id} at {as_of:%Y-%m-%d %H:%M:%S} UTC: "
+                           f"deposit ${version['deposite'] or 0}, payment ${version['payment'] or 0}, "
+                           f"event expense ${version['event_expense'] or 0} "
+                           f"(recorded {version['as_of']}).")
+            st.dataframe(timeline, hide_index=True, width='stretch', column_config={
+                "timestamp": st.column_config.TextColumn("Recorded (UTC)"),
+                "changed": st.column_config.TextColumn("Changed"),
+            })
+
+query_debug_panel()
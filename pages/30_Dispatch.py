@@ -0,0 +1,73 @@
+import streamlit as st
+import datetime
+from utils.dispatch import REFRESH_SECONDS, day_window, get_pickups, group_parties
+from utils.lookups import get_lookup_options, lookup_selectbox
+from utils.debug import query_debug_panel
+from utils.style import load_css
+
+st.set_page_config(
+    page_title="Pickup Dispatch",
+    page_icon="🚐",
+    layout="wide"
+)
+
+load_css()
+
+st.header("🚐 Pickup Dispatch Board", divider='green')
+
+# --- Filters ---
+pickup_options = get_lookup_options()["Pickup"]
+col1, col2, col3, col4, col5 = st.columns([2, 2, 1, 1, 1])
+with col1:
+    day = st.date_input("Pickup Date", value=datetime.date.today(), key="dispatch_day")
+with col2:
+    pickup_id = lookup_selectbox("Pickup Location", pickup_options, key="dispatch_pickup",
+                                 help="Leave on Select... to see every location")
+with col3:
+    start_time = st.time_input("From", value=datetime.time(0, 0), step=1800, key="dispatch_from")
+with col4:
+    end_time = st.time_input("Until", value=None, step=1800, key="dispatch_until",
+                             help="Empty means until midnight")
+with col5:
+    auto_refresh = st.toggle("Auto-refresh", value=True, key="dispatch_refresh",
+                             help=f"Checks for new bookings every {REFRESH_SECONDS} s")
+
+
+# --- Board ---
+# Only this part reruns on the timer; each run is one PRAGMA data_version unless bookings changed
+@st.fragment(run_every=REFRESH_SECONDS if auto_refresh else None)
+def dispatch_board(day, pickup_id, start_time, end_time):
+    start, end = day_window(day, start_time, end_time)
+    try:
+        df = get_pickups(start, end, pickup_id)
+    except Exception as e:
+        st.error(f"Error fetching pickups: {e}")
+        return
+
+    if df.empty:
+        st.info("No pickups in this window.")
+        return
+
+    parties = list(group_parties(df))
+    st.caption(f"{len(df)} bookings in {len(parties)} parties · updated {datetime.datetime.now():%H:%M:%S}")
+
+    current_location = object()
+    for location, first_pickup, party in parties:
+        if location != current_location:
+            current_location = location
+            st.subheader(f"📍 {location}")
+        lead = party["Representative"].dropna().iloc[0] if party["Representative"].notna().any() else party["Customer"].iloc[0]
+        flights = ", ".join(sorted(set(party["Flight"].dropna())))
+        title = f"🕒 {first_pickup[11:16]} · {lead} · {len(party)} pax" + (f" · ✈️ {flights}" if flights else "")
+        with st.expander(title, expanded=True):
+            st.dataframe(
+                party[["pickup_time", "Customer", "Flight", "time_IB", "confirmation_code", "Notes"]].rename(columns={
+                    "pickup_time": "Pickup Time", "time_IB": "Arrival", "confirmation_code": "Confirmation Code",
+                }),
+                hide_index=True, width='stretch',
+            )
+
+
+dispatch_board(day, pickup_id, start_time, end_time)
+
+query_debug_panel()
@@ -0,0 +1,122 @@
+import streamlit as st
+from utils.lookups import get_lookup_options, lookup_selectbox
+from utils.reports import DRILL_LIMIT, REPORTS, get_report, pivot_by_month, report_rows
+from utils.summary import SUMMARY_COLUMNS
+from utils.debug import query_debug_panel
+from utils.style import load_css
+
+st.set_page_config(
+    page_title="Financial Reports",
+    page_icon="📊",
+    layout="wide"
+)
+
+load_css()
+
+st.header("📊 Financial Reports", divider='green')
+
+COLUMN_LABELS = {
+    "bookings": "Bookings", "deposite": "Deposits", "payment": "Payments", "event_expense": "Event Expenses",
+    "airfair_IB": "Inbound Airfare", "airfair_OB": "Outbound Airfare",
+}
+
+# --- Filters ---
+lookup_options = get_lookup_options()
+col1, col2, col3, col4, col5, col6 = st.columns(6)
+with col1:
+    report = st.selectbox("Report By", options=list(REPORTS), format_func=lambda r: REPORTS[r][0],
+                          key="report_by")
+with col2:
+    date_from = st.date_input("Pickup From", value=None, key="report_date_from")
+with col3:
+    date_to = st.date_input("Pickup To", value=None, key="report_date_to")
+with col4:
+    vendor_id = lookup_selectbox("Vendor", lookup_options["Vendor"], key="report_vendor")
+with col5:
+    product_id = lookup_selectbox("Product", lookup_options["Product"], key="report_product")
+with col6:
+    client_id = lookup_selectbox("Client", lookup_options["Client"], key="report_client")
+
+filters = {
+    'date_from': date_from,
+    'date_to': date_to,
+    'vendor_id': vendor_id,
+    'product_id': product_id,
+    'client_id': client_id,
+}
+heading = REPORTS[report][0]
+
+col_split, col_value = st.columns([1, 2])
+with col_split:
+    by_month = st.toggle("Split by Month", value=False, key="report_by_month", disabled=report == "month",
+                         help="Pivot every group across pickup months") and report != "month"
+with col_value:
+    pivot_value = st.selectbox("Pivot Column", options=["bookings"] + SUMMARY_COLUMNS, index=2,
+                               format_func=COLUMN_LABELS.get, key="report_pivot_value", disabled=not by_month)
+
+
+def show_totals(df):
+    totals = df[["bookings"] + SUMMARY_COLUMNS].sum()
+    metric_cols = st.columns(7)
+    metric_cols[0].metric("Bookings", f"{totals['bookings']:,.0f}")
+    metric_cols[1].metric("Deposits", f"${totals['deposite']:,.0f}")
+    metric_cols[2].metric("Payments", f"${totals['payment']:,.0f}")
+    metric_cols[3].metric("Event Expenses", f"${totals['event_expense']:,.0f}")
+    metric_cols[4].metric("Inbound Airfare", f"${totals['airfair_IB']:,.0f}")
+    metric_cols[5].metric("Outbound Airfare", f"${totals['airfair_OB']:,.0f}")
+    metric_cols[6].metric("Total Airfare", f"${totals['airfair_IB'] + totals['airfair_OB']:,.0f}")
+
+
+def show_pivot(df):
+    table = pivot_by_month(df, report, pivot_value)
+    st.subheader(f"{COLUMN_LABELS[pivot_value]} by {heading} and Month")
+    st.dataframe(table, width='stretch')
+    st.download_button("⬇️ Download Pivot (CSV)", table.to_csv(),
+                       file_name=f"{pivot_value}_by_{report}_and_month.csv", mime="text/csv")
+
+
+def show_report(df):
+    """The report table; selecting a group lists the bookings behind it."""
+    display = df.drop(columns=["key"]).assign(airfare=df["airfair_IB"] + df["airfair_OB"]).rename(
+        columns=dict(COLUMN_LABELS, airfare="Total Airfare"))
+    st.subheader(f"Totals by {heading}")
+    # Keyed by report and filters so a selection never points into a different result; spelled
+    # out rather than hash()ed, which is salted per process and would change on every restart
+    filter_key = "_".join(f"{name}={value}" for name, value in sorted(filters.items()))
+    event = st.dataframe(display, hide_index=True, width='stretch', on_select="rerun",
+                         selection_mode="single-row", key=f"report_table_{report}_{filter_key}")
+    st.download_button("⬇️ Download Report (CSV)", display.to_csv(index=False),
+                       file_name=f"report_by_{report}.csv", mime="text/csv")
+
+    if not event.selection.rows:
+        st.caption(f"Select a {heading.lower()} to see its bookings.")
+        return
+    group = df.iloc[event.selection.rows[0]]
+    st.subheader(f"Bookings for {group[heading]}")
+    try:
+        rows = report_rows(report, group["key"], filters)
+    except Exception as e:
+        st.error(f"Error fetching bookings: {e}")
+        return
+    if group["bookings"] > len(rows):
+        st.caption(f"Showing the first {DRILL_LIMIT:,} of {group['bookings']:,} bookings by pickup time; "
+                   "use the Travel page export for all of them.")
+    st.dataframe(rows, hide_index=True, width='stretch')
+
+
+# --- Report ---
+try:
+    df = get_report(report, filters, by_month)
+except Exception as e:
+    st.error(f"Error running the {heading} report: {e}")
+else:
+    if df.empty:
+        st.info("No bookings match these filters.")
+    else:
+        show_totals(df)
+        if by_month:
+            show_pivot(df)
+        else:
+            show_report(df)
+
+query_debug_panel()
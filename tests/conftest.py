@@ -0,0 +1,47 @@
+import logging
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Read when utils.database is imported; keep the tests away from the app's database and logs
+_scratch = tempfile.mkdtemp(prefix="travel_tests_")
+os.environ.setdefault("TRAVEL_DATABASE", os.path.join(_scratch, "unused.database"))
+os.environ.setdefault("TRAVEL_SLOW_QUERY_LOG", os.path.join(_scratch, "slow_queries.log"))
+
+# Bookings in each test database; small enough to build in well under a second
+BOOKINGS = 60
+
+
+@pytest.fixture(autouse=True)
+def _quiet_streamlit():
+    # Outside `streamlit run` every cache and session_state access warns about bare mode
+    from streamlit.logger import set_log_level
+    set_log_level(logging.ERROR)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Path of a fresh generated database built from travel.schema, which the app's pools and writer use."""
+    import streamlit as st
+    import utils.database
+    import utils.export
+    import utils.writer
+    from utils.generate_data import generate
+
+    path = str(tmp_path / "travel.database")
+    generate(path, BOOKINGS, seed=1)
+    for module in (utils.database, utils.writer, utils.export):
+        monkeypatch.setattr(module, "DB_PATH", path)
+    # Pools, the writer and cached reads are process-wide; start each test with new ones
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    st.session_state.clear()
+    yield path
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    st.session_state.clear()
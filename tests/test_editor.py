@@ -0,0 +1,69 @@
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import streamlit as st
+
+from utils.editor import save_editor_changes
+
+EDITOR_KEY = "travel_editor"
+
+
+def _query(path, sql, params=()):
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def _editor_frame(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return pd.read_sql_query(
+            "SELECT travel_id, vendor_id, Notes FROM Travel ORDER BY travel_id LIMIT 6", conn)
+
+
+def test_mixed_batch_keeps_good_rows_when_one_fails(database):
+    df = _editor_frame(database)
+    ids = df["travel_id"].tolist()
+    st.session_state[EDITOR_KEY] = {
+        # Two Notes edits share one executemany; the vendor edits share another, which fails
+        # on the unknown vendor and is retried row by row
+        "edited_rows": {0: {"Notes": "first"}, 1: {"vendor_id": 2}, 2: {"vendor_id": 999}, 3: {"Notes": "fourth"}},
+        "added_rows": [{"vendor_id": 1, "Notes": "added"}, {"vendor_id": 999, "Notes": "bad vendor"}, {}],
+        "deleted_rows": [5],
+    }
+
+    result = save_editor_changes("Travel", "travel_id", df, EDITOR_KEY)
+
+    assert (result["updated"], result["inserted"], result["deleted"]) == (3, 1, 1)
+    assert [error["row"] for error in result["errors"]] == [f"ID {ids[2]}", "New row 2"]
+    assert all("FOREIGN KEY" in error["error"] for error in result["errors"])
+
+    rows = dict(((travel_id, (vendor_id, notes)) for travel_id, vendor_id, notes
+                 in _query(database, "SELECT travel_id, vendor_id, Notes FROM Travel")))
+    assert rows[ids[0]][1] == "first"
+    assert rows[ids[1]][0] == 2
+    assert rows[ids[2]][0] == df.at[2, "vendor_id"]
+    assert rows[ids[3]][1] == "fourth"
+    assert ids[5] not in rows
+    assert _query(database, "SELECT vendor_id FROM Travel WHERE Notes = 'added'") == [(1,)]
+    assert _query(database, "SELECT COUNT(*) FROM Travel WHERE Notes = 'bad vendor'") == [(0,)]
+
+
+def test_unknown_name_is_reported_and_not_written(database):
+    df = _editor_frame(database).assign(Vendor="BADA")
+    vendors = dict(_query(database, "SELECT Vendor, vendor_id FROM Vendor"))
+    resolvers = {"Vendor": ("vendor_id", vendors)}
+    st.session_state[EDITOR_KEY] = {
+        "edited_rows": {0: {"Vendor": "NO SUCH VENDOR"}, 1: {"Vendor": "ALO", "Notes": "moved"}},
+        "added_rows": [],
+        "deleted_rows": [],
+    }
+
+    result = save_editor_changes("Travel", "travel_id", df, EDITOR_KEY, resolvers=resolvers)
+
+    first, second = df["travel_id"].iloc[0], df["travel_id"].iloc[1]
+    assert result["updated"] == 1
+    assert result["errors"] == [{"row": f"ID {first}", "error": "Unknown Vendor 'NO SUCH VENDOR'"}]
+    assert _query(database, "SELECT vendor_id, Notes FROM Travel WHERE travel_id = ?", (int(second),)) == \
+        [(vendors["ALO"], "moved")]
+    assert _query(database, "SELECT vendor_id FROM Travel WHERE travel_id = ?", (int(first),)) == \
+        [(int(df["vendor_id"].iloc[0]),)]
@@ -0,0 +1,61 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils.history import book_as_of, book_totals_as_of, booking_as_of, booking_timeline
+
+# travel_id, timestamp, payment, deleted (in insert order, so later rows get higher rowids)
+HISTORY = [
+    (1, "2030-01-01 10:00:00", 100, 0),
+    (2, "2030-01-01 10:00:00", 500, 0),
+    # Two versions of booking 1 within the same second: the later rowid is the one in effect
+    (1, "2030-01-01 12:00:00", 200, 0),
+    (1, "2030-01-01 12:00:00", 250, 0),
+    (2, "2030-01-01 12:00:00", 600, 0),
+    # Booking 1 deleted: the tombstone keeps its last values
+    (1, "2030-01-01 14:00:00", 250, 1),
+]
+
+
+@pytest.fixture
+def history(database):
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("DELETE FROM Travel_History")
+        conn.executemany("INSERT INTO Travel_History (travel_id, confirmation_code, payment, timestamp, deleted) "
+                         "VALUES (?, 'HIST' || ?, ?, ?, ?)",
+                         [(travel_id, travel_id, payment, timestamp, deleted)
+                          for travel_id, timestamp, payment, deleted in HISTORY])
+        conn.commit()
+    return database
+
+
+@pytest.mark.parametrize("as_of, payment", [
+    ("2030-01-01 09:59:59", None),  # Not created yet
+    ("2030-01-01 11:00:00", 100),
+    ("2030-01-01 12:00:00", 250),
+    ("2030-01-01 13:59:59", 250),
+    ("2030-01-01 14:00:00", None),  # Deleted
+])
+def test_booking_as_of_breaks_ties_by_rowid_and_honours_tombstones(history, as_of, payment):
+    version = booking_as_of(1, as_of)
+
+    assert (version and version["payment"]) == payment
+
+
+def test_book_as_of_leaves_out_deleted_bookings(history):
+    before = book_as_of("2030-01-01 12:00:00")
+    after = book_as_of("2030-01-01 14:00:00")
+
+    assert before.column("travel_id").to_pylist() == [1, 2]
+    assert before.column("payment").to_pylist() == [250, 600]
+    assert after.column("travel_id").to_pylist() == [2]
+    assert book_totals_as_of("2030-01-01 14:00:00") == {
+        "record_count": 1, "deposite": 0, "payment": 600, "event_expense": 0}
+
+
+def test_timeline_orders_same_second_versions_and_marks_the_delete(history):
+    timeline = booking_timeline(1)
+
+    assert timeline["payment"].tolist() == [100, 200, 250, 250]
+    assert timeline["changed"].tolist() == ["created", "payment", "payment", "deleted"]
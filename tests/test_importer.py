@@ -0,0 +1,75 @@
+import csv
+import io
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils.importer import import_bookings
+
+HEADER = ["Customer", "Representative", "Vendor", "Product", "Flight", "Pickup", "pickup_time",
+          "confirmation_code", "payment"]
+
+
+@pytest.fixture
+def sheet_values(database):
+    """Names the sheet can use: a customer and a representative no one else shares, and one of each lookup."""
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("INSERT INTO Customer (first_name, last_name, hangul_name, is_representative) "
+                     "VALUES ('IMPORT', 'TESTER', '테스터', 0), ('GROUP', 'LEADER', '리더', 1)")
+        conn.commit()
+        lookups = {table: conn.execute(f"SELECT {table} FROM {table} WHERE status = 1 LIMIT 1").fetchone()[0]
+                   for table in ("Vendor", "Product", "Flight", "Pickup")}
+    return lookups
+
+
+def _sheet(values, rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(HEADER)
+    for customer, representative, vendor, pickup, code, payment in rows:
+        writer.writerow([customer, representative, vendor or values["Vendor"], values["Product"], values["Flight"],
+                         values["Pickup"], pickup, code, payment])
+    return io.BytesIO(out.getvalue().encode())
+
+
+def _codes(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return {row[0] for row in conn.execute("SELECT confirmation_code FROM Travel WHERE confirmation_code LIKE 'IMP%'")}
+
+
+ROWS = [
+    # customer, representative, vendor, pickup_time, code, payment
+    ("import  tester", "GROUP LEADER", None, "2025-03-01 09:00", "IMP001", "$1,200"),
+    ("IMPORT TESTER", "", "NO SUCH VENDOR", "2025-03-01 09:00", "IMP002", "0"),   # line 3
+    ("테스터", "", None, "2025-03-02 10:30", "IMP003", "500"),
+    ("IMPORT TESTER", "", None, "not a date", "IMP004", "lots"),                  # line 5, two errors
+    ("", "", None, "2025-03-03 08:00", "IMP005", "0"),                            # line 6
+    ("IMPORT TESTER", "", None, "2025-03-04", "IMP006", "75"),
+]
+
+
+def test_invalid_rows_are_reported_and_the_rest_inserted(database, sheet_values):
+    # Two rows per chunk, so rows are numbered and written across several writer jobs
+    report = import_bookings(_sheet(sheet_values, ROWS), "bookings.csv", chunk_size=2)
+
+    assert report["rows_read"] == 6
+    assert (report["rows_valid"], report["rows_inserted"]) == (3, 3)
+    errors = report["errors"]
+    assert report["error_count"] == len(errors) == 4
+    assert sorted(zip(errors["row"], errors["column"])) == [
+        (3, "Vendor"), (5, "payment"), (5, "pickup_time"), (6, "Customer")]
+    assert _codes(database) == {"IMP001", "IMP003", "IMP006"}
+
+    with closing(sqlite3.connect(database)) as conn:
+        payment, pickup_time, has_representative = conn.execute(
+            "SELECT payment, pickup_time, representative_id IS NOT NULL FROM Travel "
+            "WHERE confirmation_code = 'IMP001'").fetchone()
+    assert (payment, pickup_time, has_representative) == (1200, "2025-03-01 09:00:00", 1)
+
+
+def test_dry_run_validates_without_writing(database, sheet_values):
+    report = import_bookings(_sheet(sheet_values, ROWS), "bookings.csv", chunk_size=2, dry_run=True)
+
+    assert (report["rows_valid"], report["rows_inserted"], report["error_count"]) == (3, 0, 4)
+    assert _codes(database) == set()
@@ -0,0 +1,82 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils import migrations
+from utils.migrations import LATEST_VERSION, get_version, upgrade
+
+BASELINE_SCHEMA = os.path.join(os.path.dirname(__file__), "baseline.schema")
+
+
+def _schema(conn):
+    return conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+
+
+@pytest.fixture
+def baseline(tmp_path, monkeypatch):
+    """A version 0 database with bookings that still reference customers and lookups by name."""
+    monkeypatch.setattr(migrations, "INDEX_PAUSE", 0)
+    with closing(sqlite3.connect(tmp_path / "baseline.database")) as conn:
+        with open(BASELINE_SCHEMA, encoding="utf-8") as f:
+            conn.executescript(f.read())
+        conn.executemany(
+            "INSERT INTO Travel (Customer, Representative, Client, Product, Vendor, Flight, Pickup, "
+            "confirmation_code, payment, Notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                ("DONG GYU LEE", "YOUNG SOOK SONG", "I4U", "KOA - 알로하와이", "ALO", "WN3093", "HRW", "MIG001", 900, None),
+                # A customer no one is called and a vendor missing from Vendor
+                ("NOBODY KNOWN", "Select...", None, None, "GONE VENDOR", None, None, "MIG002", 0, "vip"),
+            ])
+        conn.commit()
+        yield conn
+
+
+def test_upgrade_from_baseline_maps_names_to_ids(baseline):
+    assert get_version(baseline) == 0
+
+    assert upgrade(baseline) == list(range(1, LATEST_VERSION + 1))
+
+    assert get_version(baseline) == LATEST_VERSION
+    assert baseline.execute("PRAGMA foreign_key_check").fetchall() == []
+    rows = {row[0]: row[1:] for row in baseline.execute(
+        "SELECT confirmation_code, customer_id, representative_id, client_id, product_id, vendor_id, flight_id, "
+        "pickup_id, Notes FROM Travel")}
+    assert rows["MIG001"] == (2, 1, 1, 1, 2, 2, 2, None)
+    assert rows["MIG002"] == (None, None, None, None, 3, None, None, "vip [Customer: NOBODY KNOWN]")
+    assert baseline.execute("SELECT Vendor, status FROM Vendor WHERE vendor_id = 3").fetchone() == ("GONE VENDOR", 0)
+    assert baseline.execute(
+        "SELECT Customer, Representative, Vendor, Pickup FROM Travel_View WHERE confirmation_code = 'MIG001'"
+    ).fetchone() == ("DONG GYU LEE", "YOUNG SOOK SONG", "ALO", "HRW")
+
+
+def test_second_upgrade_does_nothing(baseline):
+    upgrade(baseline)
+    schema, changes = _schema(baseline), baseline.total_changes
+
+    assert upgrade(baseline) == []
+    assert (_schema(baseline), baseline.total_changes) == (schema, changes)
+
+
+def _create_then_raise(conn, run_script):
+    run_script(conn, "CREATE TABLE Doomed (id INTEGER);")
+    raise RuntimeError("step failed")
+
+
+@pytest.mark.parametrize("step, error", [
+    (_create_then_raise, RuntimeError),
+    # Runs, but leaves a booking pointing at a vendor that does not exist
+    ("CREATE TABLE Doomed (id INTEGER); INSERT INTO Travel (vendor_id) VALUES (999);", sqlite3.IntegrityError),
+])
+def test_failing_step_rolls_back_without_bumping_the_version(baseline, monkeypatch, step, error):
+    upgrade(baseline)
+    bookings = baseline.execute("SELECT COUNT(*) FROM Travel").fetchone()[0]
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(LATEST_VERSION + 1, "Fails", step)])
+
+    with pytest.raises(error):
+        upgrade(baseline, target=LATEST_VERSION + 1)
+
+    assert get_version(baseline) == LATEST_VERSION
+    assert baseline.execute("SELECT name FROM sqlite_master WHERE name = 'Doomed'").fetchone() is None
+    assert baseline.execute("SELECT COUNT(*) FROM Travel").fetchone()[0] == bookings
+    assert baseline.execute("PRAGMA foreign_keys").fetchone()[0] == 1
@@ -0,0 +1,70 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils.retention import ARCHIVE_SCHEMA, archive_history, compact_history
+
+# travel_id, days ago, time of day, payment
+HISTORY = [
+    # Booking 1: three edits on one old day, one on the next, two on a recent day
+    (1, 400, "09:00:00", 100), (1, 400, "12:00:00", 110), (1, 400, "18:00:00", 120),
+    (1, 399, "10:00:00", 130),
+    (1, 10, "09:00:00", 140), (1, 10, "11:00:00", 150),
+    # Booking 2: a single row, older than the archive cutoff
+    (2, 1000, "08:00:00", 200),
+    # Booking 3: two old days and a recent one
+    (3, 1000, "08:00:00", 300), (3, 800, "08:00:00", 310), (3, 5, "08:00:00", 320),
+]
+
+
+@pytest.fixture
+def history(database):
+    """An autocommit connection, as run_retention opens, over a known Travel_History."""
+    with closing(sqlite3.connect(database, isolation_level=None)) as conn:
+        conn.execute("DELETE FROM Travel_History")
+        conn.executemany(
+            "INSERT INTO Travel_History (travel_id, payment, timestamp) "
+            "VALUES (?, ?, datetime(date('now', ?), ?))",
+            [(travel_id, payment, f"-{days} days", time) for travel_id, days, time, payment in HISTORY])
+        yield conn
+
+
+def _payments(conn, table="main.Travel_History"):
+    return sorted(conn.execute(f"SELECT travel_id, payment FROM {table}").fetchall())
+
+
+def test_compaction_keeps_the_last_row_per_booking_per_day(history):
+    assert compact_history(history, days=90, batch_size=1, pause=0) == 2
+
+    assert _payments(history) == [(1, 120), (1, 130), (1, 140), (1, 150), (2, 200), (3, 300), (3, 310), (3, 320)]
+    assert compact_history(history, days=90, batch_size=1, pause=0) == 0
+
+
+def test_archive_never_moves_a_bookings_newest_row(history, tmp_path):
+    archive = str(tmp_path / "archive.database")
+
+    assert archive_history(history, days=730, archive_path=archive, batch_size=1, pause=0) == 2
+
+    # Booking 2's only row is older than the cutoff but is its newest, so it stays
+    assert _payments(history) == [(1, 100), (1, 110), (1, 120), (1, 130), (1, 140), (1, 150), (2, 200), (3, 320)]
+    with closing(sqlite3.connect(archive)) as conn:
+        assert _payments(conn, "Travel_History") == [(3, 300), (3, 310)]
+
+
+def test_rerunning_an_interrupted_archive_copies_each_row_once(history, tmp_path):
+    archive = str(tmp_path / "archive.database")
+    # A run that copied a batch to the archive, then stopped before deleting it from the live table
+    history.execute("ATTACH DATABASE ? AS archive", (archive,))
+    history.executescript(ARCHIVE_SCHEMA)
+    history.execute("INSERT INTO archive.Travel_History (history_id, travel_id, payment, timestamp) "
+                    "SELECT rowid, travel_id, payment, timestamp FROM main.Travel_History "
+                    "WHERE travel_id = 3 AND payment = 300")
+    history.execute("DETACH DATABASE archive")
+
+    assert archive_history(history, days=730, archive_path=archive, batch_size=1, pause=0) == 2
+    assert archive_history(history, days=730, archive_path=archive, batch_size=1, pause=0) == 0
+
+    with closing(sqlite3.connect(archive)) as conn:
+        assert _payments(conn, "Travel_History") == [(3, 300), (3, 310)]
+    assert _payments(history) == [(1, 100), (1, 110), (1, 120), (1, 130), (1, 140), (1, 150), (2, 200), (3, 320)]
@@ -0,0 +1,26 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils import search
+from utils.search import search_customers
+
+
+@pytest.fixture
+def customers(database, monkeypatch):
+    """Customers sharing a surname, where the ones asked for come last in rowid order."""
+    monkeypatch.setattr(search, "SEARCH_CANDIDATES", 2)
+    with closing(sqlite3.connect(database)) as conn:
+        conn.executemany("INSERT INTO Customer (first_name, last_name, is_representative, status) VALUES (?, ?, ?, ?)", [
+            ("GONE", "ZYXWV", 0, 0), ("LEFT", "ZYXWV", 0, 0), ("PLAIN", "ZYXWV", 0, 1), ("LEADER", "ZYXWV", 1, 1),
+        ])
+        conn.commit()
+    return database
+
+
+def test_filters_apply_before_the_candidate_limit(customers):
+    assert sorted(search_customers("zyx")["first_name"]) == ["LEADER", "PLAIN"]
+    assert search_customers("zyx", representatives_only=True)["first_name"].tolist() == ["LEADER"]
+    # Unfiltered, only the first SEARCH_CANDIDATES matches are ranked
+    assert len(search_customers("zyx", active_only=False)) == 2
@@ -0,0 +1,38 @@
+import sqlite3
+from contextlib import closing
+
+from utils.summary import SUMMARY_COLUMNS, get_summary_totals, rebuild_travel_summary
+
+COLUMNS = ["scope", "key", "record_count"] + SUMMARY_COLUMNS
+
+
+def _groups(conn):
+    return conn.execute(f"SELECT {', '.join(COLUMNS)} FROM Travel_Summary ORDER BY scope, key").fetchall()
+
+
+def test_triggers_keep_the_summary_equal_to_a_rebuild(database):
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("INSERT INTO Travel (vendor_id, product_id, pickup_time, deposite, payment, airfair_IB) "
+                     "VALUES (1, 1, '2031-01-05 08:00:00', 100, 250, 40)")
+        conn.execute("INSERT INTO Travel (payment) VALUES (75)")  # Every group key NULL
+        conn.execute("UPDATE Travel SET payment = payment + 10 WHERE travel_id % 3 = 0")
+        # Moves rows between vendor, product and month groups
+        conn.execute("UPDATE Travel SET vendor_id = 2, product_id = NULL, pickup_time = '2031-02-01 10:00:00' "
+                     "WHERE travel_id % 7 = 0")
+        conn.execute("UPDATE Travel SET pickup_time = '2031-03-01 09:00:00' WHERE travel_id % 4 = 1")
+        conn.execute("UPDATE Travel SET deposite = NULL, event_expense = 5 WHERE travel_id % 5 = 0")
+        conn.execute("UPDATE Travel SET Notes = 'summary unchanged' WHERE travel_id % 2 = 0")
+        conn.execute("DELETE FROM Travel WHERE travel_id % 11 = 0")
+        conn.commit()
+
+        maintained = _groups(conn)
+        totals = get_summary_totals()
+        rebuild_travel_summary(conn)
+        rebuilt = _groups(conn)
+        conn.rollback()
+
+    # Triggers leave emptied groups behind at zero; a rebuild only has groups with rows
+    emptied = [row for row in maintained if row[2] == 0]
+    assert all(value == 0 for row in emptied for value in row[2:])
+    assert [row for row in maintained if row[2] != 0] == rebuilt
+    assert totals == dict(zip(COLUMNS[2:], next(row[2:] for row in rebuilt if row[0] == "all")))
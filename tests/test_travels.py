@@ -0,0 +1,63 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from utils.travels import fetch_travel_page
+
+PAGE_SIZE = 7
+
+
+@pytest.fixture
+def bookings(database):
+    """The database with NULL and repeated sort values: some bookings lose their pickup time or code."""
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("UPDATE Travel SET pickup_time = NULL WHERE travel_id % 4 = 0")
+        conn.execute("UPDATE Travel SET pickup_time = '2025-05-01 09:00:00' WHERE travel_id % 4 = 1")
+        conn.execute("UPDATE Travel SET confirmation_code = NULL WHERE travel_id % 5 = 0")
+        conn.commit()
+        rows = conn.execute("SELECT travel_id, pickup_time, confirmation_code FROM Travel_View").fetchall()
+    return database, rows
+
+
+def _expected(rows, column, descending):
+    """travel_ids in SQLite's order: NULLs first ascending (last descending), ties by travel_id."""
+    index = {"pickup_time": 1, "confirmation_code": 2}[column]
+    ordered = sorted(rows, key=lambda row: (row[index] is not None, row[index] or "", row[0]))
+    return [row[0] for row in (reversed(ordered) if descending else ordered)]
+
+
+def _walk(column, descending):
+    """Pages forward to the end, keeping the cursor stack the listing page keeps."""
+    cursors, pages = [None], []
+    while True:
+        df, next_cursor = fetch_travel_page(sort_by=column, descending=descending,
+                                            page_size=PAGE_SIZE, cursor=cursors[-1])
+        pages.append(df["travel_id"].tolist())
+        if next_cursor is None:
+            return cursors, pages
+        cursors.append(next_cursor)
+
+
+@pytest.mark.parametrize("column", ["pickup_time", "confirmation_code"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_row_once_across_null_sort_values(bookings, column, descending):
+    _, rows = bookings
+    assert any(row[1] is None for row in rows) and any(row[2] is None for row in rows)
+
+    _, pages = _walk(column, descending)
+
+    assert all(len(page) == PAGE_SIZE for page in pages[:-1])
+    assert [travel_id for page in pages for travel_id in page] == _expected(rows, column, descending)
+
+
+@pytest.mark.parametrize("column", ["pickup_time", "confirmation_code"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_paging_back_returns_the_same_pages(bookings, column, descending):
+    cursors, pages = _walk(column, descending)
+
+    # "◀ Previous" pops the cursor stack and reads the page at the cursor now on top
+    while len(cursors) > 1:
+        cursors.pop()
+        df, _ = fetch_travel_page(sort_by=column, descending=descending, page_size=PAGE_SIZE, cursor=cursors[-1])
+        assert df["travel_id"].tolist() == pages[len(cursors) - 1]
@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import pytest
+
+from utils.writer import Writer, run_write, submit_write
+
+TIMEOUT = 10
+
+
+def _insert_note(conn, note):
+    return conn.execute("INSERT INTO Travel (Notes) VALUES (?)", (note,)).lastrowid
+
+
+def _insert_then_fail(conn, note):
+    _insert_note(conn, note)
+    raise ValueError("rejected")
+
+
+def _notes(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return {row[0] for row in conn.execute("SELECT Notes FROM Travel WHERE Notes LIKE 'writer %'")}
+
+
+def test_queued_jobs_share_one_transaction_and_fail_alone(database):
+    writer = Writer(database)
+    started, release = threading.Event(), threading.Event()
+
+    def hold(conn):
+        started.set()
+        release.wait(TIMEOUT)
+
+    # Keep the writer busy so the next two jobs are queued together
+    held = writer.submit(hold)
+    assert started.wait(TIMEOUT)
+    good = writer.submit(_insert_note, "writer good")
+    bad = writer.submit(_insert_then_fail, "writer bad")
+    release.set()
+
+    assert isinstance(good.result(TIMEOUT), int)
+    with pytest.raises(ValueError, match="rejected"):
+        bad.result(TIMEOUT)
+    held.result(TIMEOUT)
+
+    assert _notes(database) == {"writer good"}
+    metrics = writer.metrics()
+    assert (metrics["transactions"], metrics["max_batch"]) == (2, 2)
+    assert (metrics["jobs"], metrics["failed_jobs"]) == (3, 1)
+
+
+def test_future_resolves_after_commit(database):
+    writer = Writer(database)
+    seen = []
+
+    def check_visible(future):
+        # Runs once the result is set; by then another connection must already see the row
+        with closing(sqlite3.connect(database)) as conn:
+            seen.append(conn.execute("SELECT COUNT(*) FROM Travel WHERE travel_id = ?",
+                                     (future.result(),)).fetchone()[0])
+
+    future = writer.submit(_insert_note, "writer committed")
+    future.add_done_callback(check_visible)
+    future.result(TIMEOUT)
+    writer.submit(lambda conn: None).result(TIMEOUT)  # The callback has run once the next job is done
+
+    assert seen == [1]
+
+
+def test_concurrent_submit_write_calls_both_commit(database):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        ids = list(pool.map(lambda note: run_write(_insert_note, note), ["writer one", "writer two"]))
+
+    assert len(set(ids)) == 2
+    assert _notes(database) == {"writer one", "writer two"}
+
+
+def test_timed_out_write_is_cancelled_only_while_queued(database):
+    release = threading.Event()
+
+    # The writer starts this one, so it can no longer be withdrawn
+    with pytest.raises(TimeoutError, match="may yet be applied"):
+        run_write(lambda conn: release.wait(TIMEOUT), timeout=0.05)
+    # Queued behind it, so it is cancelled and never runs
+    with pytest.raises(TimeoutError, match="nothing was written"):
+        run_write(_insert_note, "writer cancelled", timeout=0.05)
+    release.set()
+    submit_write(lambda conn: None).result(TIMEOUT)
+
+    assert _notes(database) == set()
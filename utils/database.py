@@ -1,43 +1,551 @@
+import collections
+import logging
+import logging.handlers
+import os
+import queue
 import sqlite3
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
 import streamlit as st
-import pandas as pd
+from utils.frames import compact_frame
 
-# Connect with type detection enabled
-def get_db_connection():
-    conn = sqlite3.connect('travel.database', detect_types=sqlite3.PARSE_DECLTYPES)
-    conn.execute('PRAGMA journal_mode=WAL;')
+# Database file, overridable so tools can point the app at another copy
+DB_PATH = os.environ.get("TRAVEL_DATABASE", "travel.database")
+
+# Upper bound on open connections shared by every Streamlit session
+POOL_SIZE = int(os.environ.get("TRAVEL_DB_POOL_SIZE", "8"))
+
+# Upper bound on open read-only connections (listings, reports, exports)
+READ_POOL_SIZE = int(os.environ.get("TRAVEL_DB_READ_POOL_SIZE", str(POOL_SIZE)))
+
+# How long a session waits for a free connection before giving up (seconds)
+POOL_TIMEOUT = 10
+
+# How long a connection waits for another writer's lock before "database is locked" (milliseconds)
+BUSY_TIMEOUT_MS = int(os.environ.get("TRAVEL_BUSY_TIMEOUT_MS", "5000"))
+
+# Applied once when a connection is opened, not on every checkout
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA foreign_keys=ON;",
+)
+
+# Applied to read-only connections; query_only also refuses writes through ATTACH or temp tables
+READ_ONLY_PRAGMAS = (
+    "PRAGMA query_only=ON;",
+)
+
+# Statements slower than this (milliseconds, execute plus fetch) go to the slow-query log
+SLOW_QUERY_MS = float(os.environ.get("TRAVEL_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.environ.get("TRAVEL_SLOW_QUERY_LOG", os.path.join("logs", "slow_queries.log"))
+SLOW_QUERY_LOG_BYTES = 1_000_000
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Statements remembered per script thread for the debug panel
+QUERY_LOG_SIZE = 1000
+
+# Rows fetched at a time when an instrumented cursor is iterated
+ITERATION_BATCH = 256
+
+# Rows turned into Arrow arrays at a time by the columnar reader; only this many
+# row tuples exist at once, however large the result
+ARROW_BATCH_ROWS = 16384
+
+# Column types of get_table_data() frames (see utils/frames.py). Customer text is
+# edited freely in the Customer editor, so only its integer columns are narrowed.
+TABLE_FRAME_TYPES = {
+    "Customer": {"integer": ["customer_id", "is_representative", "status"]},
+}
+
+
+# --- Query Instrumentation ---
+
+_query_log = threading.local()
+_slow_logger = None
+_slow_logger_lock = threading.Lock()
+
+
+def get_query_log():
+    """Statements run by the current script thread since the last reset, oldest first.
+
+    Each entry is a dict with sql, params (shape only, never the values),
+    rows, ms and start (perf_counter seconds).
+    """
+    if not hasattr(_query_log, "entries"):
+        _query_log.entries = collections.deque(maxlen=QUERY_LOG_SIZE)
+    return _query_log.entries
+
+
+def reset_query_log():
+    get_query_log().clear()
+
+
+def _params_shape(parameters, many=False):
+    """Describes parameters without their values, which may be personal data."""
+    if many:
+        try:
+            rows = len(parameters)
+        except TypeError:
+            return "iterator"
+        width = len(parameters[0]) if rows else 0
+        return f"{rows} x {width}"
+    return f"{len(parameters)} params" if parameters else "no params"
+
+
+def _get_slow_logger():
+    global _slow_logger
+    with _slow_logger_lock:
+        if _slow_logger is None:
+            logger = logging.getLogger("travel.slow_queries")
+            logger.propagate = False
+            if not logger.handlers:
+                os.makedirs(os.path.dirname(SLOW_QUERY_LOG) or ".", exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    SLOW_QUERY_LOG, maxBytes=SLOW_QUERY_LOG_BYTES,
+                    backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+                logger.setLevel(logging.WARNING)
+            _slow_logger = logger
+        return _slow_logger
+
+
+def _explain(conn, sql, parameters):
+    try:
+        # A plain cursor, so the plan lookup is neither timed nor recorded
+        plan = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        return "\n".join(f"  {row[-1]}" for row in plan) or "  (no plan)"
+    except sqlite3.Error as e:
+        return f"  (no plan: {e})"
+
+
+def _log_slow_query(conn, entry, parameters):
+    if parameters is None:
+        plan_text = "  (not explained)"
+    else:
+        plan_text = _explain(conn, entry["sql"], parameters)
+    try:
+        _get_slow_logger().warning(
+            "%.1f ms, %s rows, %s\n%s\n%s", entry["ms"], entry["rows"], entry["params"],
+            entry["sql"].strip(), plan_text,
+        )
+    except OSError:
+        pass  # An unwritable log must not break the page
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement and counts the rows it returns or changes."""
+
+    _entry = None
+    _parameters = ()
+
+    def _begin(self, sql, shape):
+        self._finish()
+        entry = {"sql": sql, "params": shape, "rows": 0, "ms": 0.0, "start": time.perf_counter()}
+        get_query_log().append(entry)
+        self._entry = entry
+        return entry
+
+    def _finish(self):
+        """Called once the statement is done; writes it to the slow log if needed."""
+        entry = self._entry
+        if entry is None:
+            return
+        self._entry = None
+        if entry["ms"] >= SLOW_QUERY_MS:
+            _log_slow_query(self.connection, entry, self._parameters)
+
+    def execute(self, sql, parameters=()):
+        entry = self._begin(sql, _params_shape(parameters))
+        self._parameters = parameters
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            entry["ms"] += (time.perf_counter() - entry["start"]) * 1000
+            if self.rowcount > 0:
+                entry["rows"] = self.rowcount
+            if self.description is None:
+                self._finish()
+
+    def executemany(self, sql, seq_of_parameters):
+        entry = self._begin(sql, _params_shape(seq_of_parameters, many=True))
+        self._parameters = None  # No single parameter set to explain
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            entry["ms"] += (time.perf_counter() - entry["start"]) * 1000
+            entry["rows"] = max(self.rowcount, 0)
+            self._finish()
+
+    def executescript(self, sql_script):
+        entry = self._begin(sql_script, "script")
+        self._parameters = None
+        try:
+            return super().executescript(sql_script)
+        finally:
+            entry["ms"] += (time.perf_counter() - entry["start"]) * 1000
+            self._finish()
+
+    def _fetched(self, started, rows, done):
+        entry = self._entry
+        if entry is not None:
+            entry["ms"] += (time.perf_counter() - started) * 1000
+            entry["rows"] += rows
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __iter__(self):
+        # Rows are counted per batch; a Python-level __next__ would cost about 1 us a row
+        while True:
+            rows = self.fetchmany(ITERATION_BATCH)
+            yield from rows
+            if len(rows) < ITERATION_BATCH:
+                return
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # conn.execute(...).fetchone() never exhausts its cursor; this is when it is done
+        self._finish()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the ones conn.execute() creates, are instrumented."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # sqlite3's shortcut methods bypass cursor(), so route them through it
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+# --- Connection Pool ---
+
+def connect_read_only(path, **kwargs):
+    """Opens path as a mode=ro URI with query_only set; it can never take the write lock."""
+    uri = f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000, **kwargs)
+    for pragma in READ_ONLY_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared across Streamlit sessions."""
+
+    def __init__(self, path, size=POOL_SIZE, timeout=POOL_TIMEOUT, read_only=False):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.read_only = read_only
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Connections move between script threads, so disable the same-thread check
+        if self.read_only:
+            return connect_read_only(self.path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                                     factory=InstrumentedConnection)
+        conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                               timeout=BUSY_TIMEOUT_MS / 1000, factory=InstrumentedConnection)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            # Plain cursor: pool housekeeping stays out of the query log
+            sqlite3.Cursor(conn).execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def acquire(self):
+        """Checks out a healthy connection, opening a new one while under the size limit."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._opened < self.size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    try:
+                        return self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"No database connection available after {self.timeout}s (pool size {self.size})"
+                    )
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        """Returns a connection to the pool, dropping it if it is no longer usable."""
+        if self._is_healthy(conn):
+            self._idle.put_nowait(conn)
+        else:
+            self._discard(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+@st.cache_resource
+def get_pool():
+    """Process-wide connection pool, created once and shared by all sessions."""
+    pool = ConnectionPool(DB_PATH)
+    # Cheap user_version check; only an outdated database does any schema work
+    from utils.migrations import upgrade
+    conn = pool.acquire()
+    try:
+        upgrade(conn)
+    finally:
+        pool.release(conn)
+    return pool
+
+
+@contextmanager
+def get_db_connection():
+    """Borrows a pooled connection; commits on success, rolls back on error."""
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+
+# --- Read Path ---
+
+_snapshot = threading.local()
+
+
+@st.cache_resource
+def get_read_pool():
+    """Process-wide pool of read-only connections, opened after the schema is up to date."""
+    get_pool()  # Runs pending migrations first; read-only connections cannot
+    return ConnectionPool(DB_PATH, size=READ_POOL_SIZE, read_only=True)
+
+
+@contextmanager
+def get_read_connection():
+    """Borrows a read-only connection, or the current read_snapshot()'s connection.
+
+    Use for every query that only reads; writes go through utils.writer.
+    """
+    conn = getattr(_snapshot, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+    pool = get_read_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def read_snapshot():
+    """Runs the reads inside the block in one read transaction.
+
+    Every get_read_connection() in the block (on this thread) gets the same
+    connection, so a render that issues several queries sees a single WAL
+    snapshot: counts, pages and totals all agree even while others commit.
+    Writers are never blocked; keep the block short so checkpoints are not
+    held back. Nested snapshots join the outer one.
+    """
+    if getattr(_snapshot, "conn", None) is not None:
+        yield _snapshot.conn
+        return
+    pool = get_read_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("BEGIN")
+        # The snapshot is taken at the first read, so take it now
+        sqlite3.Cursor(conn).execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+        _snapshot.conn = conn
+        yield conn
+    finally:
+        _snapshot.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        pool.release(conn)
+
+
+# --- Columnar Reads ---
+
+def _arrow_column(values):
+    """One batch of a column as an Arrow array, typed from its values."""
+    import pyarrow as pa
+
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # SQLite does not enforce declared types, e.g. airfare typed as text in an INTEGER column
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+
+
+def _common_type(types):
+    import pyarrow as pa
+
+    types = {t for t in types if not pa.types.is_null(t)}
+    if len(types) <= 1:
+        return types.pop() if types else pa.null()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def iter_record_batches(query, params=(), batch_rows=ARROW_BATCH_ROWS):
+    """Yields a query's result as Arrow record batches of up to batch_rows rows.
+
+    Rows are fetched batch_rows at a time and turned into one typed array per
+    column (int64, double, string or binary), so the row tuples of a large
+    result never exist all at once. Each batch is typed from its own values:
+    a column that is NULL throughout a batch is null-typed there, and one that
+    mixes numbers and text is string. fetch_arrow() reconciles the batches.
+    An empty result yields one empty batch, so the column names are kept.
+    The read connection is held until the generator is exhausted or closed.
+    """
+    import pyarrow as pa
+
+    with get_read_connection() as conn:
+        cursor = conn.execute(query, params)
+        names = [col[0] for col in cursor.description]
+        rows = cursor.fetchmany(batch_rows)
+        if not rows:
+            yield pa.RecordBatch.from_arrays([pa.array([], pa.null()) for _ in names], names=names)
+        while rows:
+            yield pa.RecordBatch.from_arrays([_arrow_column(values) for values in zip(*rows)], names=names)
+            rows = cursor.fetchmany(batch_rows)
+
+
+def fetch_arrow(query, params=(), batch_rows=ARROW_BATCH_ROWS):
+    """A query's result as a pyarrow Table, built batch by batch.
+
+    st.dataframe() shows the table as is, without a pandas round trip;
+    numeric columns convert to NumPy with column.to_numpy(). A column whose
+    batches disagree on the type is widened: integers and doubles to double,
+    anything else mixed to string.
+    """
+    import pyarrow as pa
+
+    batches = list(iter_record_batches(query, params, batch_rows))
+    schema = pa.schema([
+        (name, _common_type(batch.schema.field(i).type for batch in batches))
+        for i, name in enumerate(batches[0].schema.names)
+    ])
+    return pa.Table.from_batches([batch if batch.schema == schema else batch.cast(schema)
+                                  for batch in batches], schema=schema)
+
+
+# --- Change Detection ---
+
+@st.cache_resource
+def _get_version_connection():
+    """Dedicated read-only connection used only to watch PRAGMA data_version."""
+    get_pool()  # Creates and migrates the file first; read-only connections cannot
+    conn = connect_read_only(DB_PATH, check_same_thread=False)
+    return conn, threading.Lock()
+
+def data_version():
+    """Returns a counter that changes whenever any connection or process commits.
+
+    The watcher connection never writes, so every commit, including those made
+    through the pool, counts as an outside change from its point of view.
+    """
+    conn, lock = _get_version_connection()
+    with lock:
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
 def get_table_data(table_name):
+    import pandas as pd
+
     try:
-        with get_db_connection() as conn:
+        with get_read_connection() as conn:
             if table_name in ["Travel", "Customer"]:
                 df = pd.read_sql_query(f"SELECT * FROM {table_name} ORDER BY {table_name}_id ", conn)
             else:
                 df = pd.read_sql_query(f"SELECT * FROM {table_name} ", conn)
                 # Reset the index to start from 1
                 df.index = df.index + 1
-            return df
+        return compact_frame(df, **TABLE_FRAME_TYPES.get(table_name, {}))
     except Exception as e:
         st.error(f"Error fetching data from Table {table_name}: {e}")
         return pd.DataFrame()  # Return empty DataFrame on error
 
 def update_row(table_name, row_id_col, row_data):
+    from utils.writer import execute_write
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            set_clause = ', '.join([f"{col} = ?" for col in row_data.keys() if col != row_id_col])
-            values = [row_data[col] for col in row_data.keys() if col != row_id_col]
-            values.append(row_data[row_id_col])
-            cursor.execute(f"UPDATE {table_name} SET {set_clause} WHERE {row_id_col} = ?", values)
-            conn.commit()
+        set_clause = ', '.join([f"{col} = ?" for col in row_data.keys() if col != row_id_col])
+        values = [row_data[col] for col in row_data.keys() if col != row_id_col]
+        values.append(row_data[row_id_col])
+        execute_write(f"UPDATE {table_name} SET {set_clause} WHERE {row_id_col} = ?", values)
     except Exception as e:
         st.error(f"Error updating row in Table {table_name}: {e}")
 
 def delete_row(table_name, row_id_col, row_id):
+    from utils.writer import execute_write
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {table_name} WHERE {row_id_col} = ?", (row_id,))
+        execute_write(f"DELETE FROM {table_name} WHERE {row_id_col} = ?", (row_id,))
     except Exception as e:
-        st.error(f"Error deleting row in Table {table_name}: {e}")
\ No newline at end of file
+        st.error(f"Error deleting row in Table {table_name}: {e}")
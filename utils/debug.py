@@ -0,0 +1,65 @@
+import streamlit as st
+from utils.database import get_query_log, reset_query_log, SLOW_QUERY_MS
+from utils.writer import writer_metrics
+
+
+def debug_enabled():
+    """The debug panel is opt-in per browser tab: add ?debug=1 to the page URL."""
+    return st.query_params.get("debug") == "1"
+
+
+def query_debug_panel(frames=None):
+    """Sidebar list of the statements this rerun ran, with totals. Call at the end of a page.
+
+    frames ({label: DataFrame}) adds the memory each frame takes, before and
+    after compact_frame() where it was used. Always starts the next rerun with
+    an empty log, whether or not the panel is shown.
+    """
+    entries = list(get_query_log())
+    reset_query_log()
+    if not debug_enabled():
+        return
+
+    total_ms = sum(entry["ms"] for entry in entries)
+    total_rows = sum(entry["rows"] for entry in entries)
+    slow = sum(entry["ms"] >= SLOW_QUERY_MS for entry in entries)
+    with st.sidebar.expander(f"🐞 Queries: {len(entries)} · {total_ms:.1f} ms", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Statements", len(entries))
+        col2.metric("Rows", total_rows)
+        col3.metric("Slow", slow, help=f"At least {SLOW_QUERY_MS:g} ms; written to the slow-query log")
+        if entries:
+            import pandas as pd
+            df = pd.DataFrame({
+                "ms": [round(entry["ms"], 2) for entry in entries],
+                "rows": [entry["rows"] for entry in entries],
+                "params": [entry["params"] for entry in entries],
+                "sql": [" ".join(entry["sql"].split()) for entry in entries],
+            })
+            df.index = df.index + 1
+            st.dataframe(df, width='stretch')
+
+    writer = writer_metrics()
+    with st.sidebar.expander(f"✍️ Writer: {writer['queue_depth']} queued", expanded=False):
+        transactions = writer["transactions"] or 1
+        st.caption(
+            f"{writer['jobs']} jobs in {writer['transactions']} transactions "
+            f"(avg {writer['jobs'] / transactions:.1f}, max {writer['max_batch']} per commit), "
+            f"{writer['failed_jobs']} failed jobs, {writer['failed_transactions']} failed transactions"
+        )
+        st.caption(
+            f"Lock wait avg {writer['lock_wait_ms'] / transactions:.1f} ms, max {writer['max_lock_wait_ms']:.1f} ms · "
+            f"queue wait max {writer['max_queue_wait_ms']:.1f} ms · "
+            f"transaction avg {writer['transaction_ms'] / transactions:.1f} ms"
+        )
+
+    if frames:
+        with st.sidebar.expander("🧮 Frame memory", expanded=False):
+            for label, df in frames.items():
+                memory = df.attrs.get("memory")
+                if memory:
+                    st.caption(f"{label}: {len(df):,} rows, {memory['after'] / 1e6:.1f} MB "
+                               f"(loaded as {memory['before'] / 1e6:.1f} MB, "
+                               f"{memory['before'] / max(memory['after'], 1):.1f}x smaller)")
+                else:
+                    st.caption(f"{label}: {len(df):,} rows, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
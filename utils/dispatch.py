@@ -0,0 +1,82 @@
+import datetime
+import streamlit as st
+from utils.database import get_read_connection, data_version
+
+# Seconds between checks for new bookings while auto-refresh is on
+REFRESH_SECONDS = 15
+
+# Heading for bookings that have no pickup location yet
+NO_PICKUP_LOCATION = "No pickup location"
+
+# Migration 3: bookings for one pickup location in a time window are one index range.
+# pickup_id leads because drivers ask per location; a window over all locations still
+# uses idx_travel_pickup_time. Also covers pickup_id lookups, so the single-column index goes.
+DISPATCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_travel_pickup_dispatch ON Travel(pickup_id, pickup_time)",
+    "DROP INDEX IF EXISTS idx_travel_pickup",
+]
+
+DISPATCH_QUERY = """
+SELECT
+    v.pickup_time, v.Pickup, v.pickup_id,
+    COALESCE(v.representative_id, v.customer_id) AS party_id,
+    v.Representative, v.Customer, v.Flight, v.time_IB, v.confirmation_code, v.Notes, v.travel_id
+FROM Travel_View v
+WHERE v.pickup_time >= ? AND v.pickup_time < ?{location}
+ORDER BY v.Pickup, v.pickup_time, party_id, v.travel_id
+"""
+
+
+def _window_bounds(start, end):
+    # pickup_time is stored as 'YYYY-MM-DD HH:MM:SS', so string comparison is time order
+    return start.isoformat(" ", "seconds"), end.isoformat(" ", "seconds")
+
+
+def fetch_pickups(start, end, pickup_id=None):
+    """Bookings picked up in [start, end) (datetimes), optionally at one Pickup location.
+
+    Ordered by location, time and party; party_id is the representative, or
+    the customer for a booking without one.
+    """
+    import pandas as pd
+
+    params = list(_window_bounds(start, end))
+    location = ""
+    if pickup_id is not None:
+        location = " AND v.pickup_id = ?"
+        params.append(pickup_id)
+    with get_read_connection() as conn:
+        return pd.read_sql_query(DISPATCH_QUERY.format(location=location), conn, params=params)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_pickups(start, end, pickup_id, version):
+    return fetch_pickups(start, end, pickup_id)
+
+
+def get_pickups(start, end, pickup_id=None):
+    """fetch_pickups(), re-queried only when the database has changed (PRAGMA data_version)."""
+    return _cached_pickups(start, end, pickup_id, data_version())
+
+
+def group_parties(df):
+    """Yields (pickup location, first pickup time, party rows) in pickup order.
+
+    A party is the bookings sharing a representative (or a lone customer)
+    at one location on one day. Bookings without a pickup location are
+    grouped under NO_PICKUP_LOCATION.
+    """
+    if df.empty:
+        return
+    # A label rather than NaN, which would never equal the previous party's location
+    df = df.assign(day=df["pickup_time"].str[:10], Pickup=df["Pickup"].fillna(NO_PICKUP_LOCATION))
+    for (location, _, _), party in df.groupby(["Pickup", "day", "party_id"], sort=False, dropna=False):
+        yield location, party["pickup_time"].min(), party.drop(columns=["day"])
+
+
+def day_window(day, start_time=datetime.time.min, end_time=None):
+    """(start, end) datetimes for a day; end_time None means until midnight."""
+    start = datetime.datetime.combine(day, start_time)
+    end = (datetime.datetime.combine(day, end_time) if end_time
+           else datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time.min))
+    return start, end
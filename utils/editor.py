@@ -0,0 +1,173 @@
+import datetime
+import sqlite3
+import streamlit as st
+from utils.writer import run_write
+
+
+# --- Editor State ---
+
+def get_editor_changes(editor_key):
+    """Returns the delta st.data_editor keeps in session state for editor_key."""
+    state = st.session_state.get(editor_key) or {}
+    return {
+        'edited_rows': state.get('edited_rows', {}),
+        'added_rows': state.get('added_rows', []),
+        'deleted_rows': state.get('deleted_rows', []),
+    }
+
+
+def has_editor_changes(editor_key):
+    return any(get_editor_changes(editor_key).values())
+
+
+def _to_db_value(value, is_datetime=False):
+    """Converts editor/pandas values into something sqlite3 can bind."""
+    import pandas as pd
+
+    if value is None or (not isinstance(value, (str, bytes)) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat(' ', 'seconds') if isinstance(value, datetime.datetime) else value.isoformat()
+    if is_datetime and isinstance(value, str) and 'T' in value:
+        # The editor returns ISO strings ('2025-01-31T09:30:00.000'); store 'YYYY-MM-DD HH:MM:SS'
+        return value.replace('T', ' ')[:19]
+    if hasattr(value, 'item') and not isinstance(value, str):
+        return value.item()  # numpy scalars
+    return value
+
+
+# --- Save Engine ---
+
+def _run_batch(conn, sql, batch, errors):
+    """Runs one executemany; on failure, retries row by row to find the bad rows.
+
+    batch is a list of (row_label, params). Returns the number of rows applied.
+    """
+    if not batch:
+        return 0
+    conn.execute("SAVEPOINT editor_batch")
+    try:
+        conn.executemany(sql, [params for _, params in batch])
+        conn.execute("RELEASE editor_batch")
+        return len(batch)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO editor_batch")
+        conn.execute("RELEASE editor_batch")
+
+    applied = 0
+    for label, params in batch:
+        try:
+            conn.execute(sql, params)
+            applied += 1
+        except sqlite3.Error as e:
+            errors.append({'row': label, 'error': str(e)})
+    return applied
+
+
+def _resolve_values(values, resolvers, label, errors):
+    """Replaces name columns with their id columns using resolvers.
+
+    resolvers maps a displayed column to (id column, {name: id}). Returns the
+    resolved dict, or None (with an error recorded) if a name is unknown.
+    """
+    resolved = {}
+    for col, val in values.items():
+        if col not in resolvers:
+            resolved[col] = val
+            continue
+        id_col, ids = resolvers[col]
+        if val is not None and val not in ids:
+            errors.append({'row': label, 'error': f"Unknown {col} '{val}'"})
+            return None
+        resolved[id_col] = ids.get(val)
+    return resolved
+
+
+def save_editor_changes(table_name, row_id_col, df, editor_key, datetime_columns=(), resolvers=None):
+    """Applies a data_editor's edited/added/deleted delta in a single transaction.
+
+    df must be the frame that was passed to st.data_editor; the delta refers to
+    its rows by position. Updates touch only the edited columns, and rows with
+    the same shape are written together with executemany. When the editor
+    shows names for id columns, resolvers ({column: (id column, {name: id})})
+    turns them back into ids. Returns a dict with 'updated', 'inserted',
+    'deleted' counts and 'errors', a list of {'row': ..., 'error': ...} for
+    rows that could not be saved.
+    """
+    changes = get_editor_changes(editor_key)
+    resolvers = resolvers or {}
+    errors = []
+    result = {'updated': 0, 'inserted': 0, 'deleted': 0, 'errors': errors}
+
+    # Group updates by the set of columns they change so each group is one executemany
+    updates = {}
+    for position, edits in changes['edited_rows'].items():
+        position = int(position)
+        row_id = _to_db_value(df.iloc[position][row_id_col])
+        values = {
+            col: _to_db_value(val, col in datetime_columns)
+            for col, val in edits.items() if col != row_id_col and col in df.columns
+        }
+        values = _resolve_values(values, resolvers, f"ID {row_id}", errors)
+        if not values:
+            continue
+        columns = tuple(sorted(values))
+        updates.setdefault(columns, []).append((f"ID {row_id}", [values[col] for col in columns] + [row_id]))
+
+    inserts = {}
+    for number, row in enumerate(changes['added_rows'], start=1):
+        values = {
+            col: _to_db_value(val, col in datetime_columns)
+            for col, val in row.items() if col != row_id_col and col in df.columns
+        }
+        values = {col: val for col, val in values.items() if val is not None}
+        if not values:
+            continue  # Blank row left behind in the editor
+        values = _resolve_values(values, resolvers, f"New row {number}", errors)
+        if values is None:
+            continue
+        columns = tuple(sorted(values))
+        inserts.setdefault(columns, []).append((f"New row {number}", [values[col] for col in columns]))
+
+    deletes = []
+    for position in changes['deleted_rows']:
+        row_id = _to_db_value(df.iloc[int(position)][row_id_col])
+        deletes.append((f"ID {row_id}", [row_id]))
+
+    def apply(conn):
+        counts = {'updated': 0, 'inserted': 0, 'deleted': 0}
+        for columns, batch in updates.items():
+            set_clause = ', '.join(f"{col} = ?" for col in columns)
+            sql = f"UPDATE {table_name} SET {set_clause} WHERE {row_id_col} = ?"
+            counts['updated'] += _run_batch(conn, sql, batch, errors)
+        for columns, batch in inserts.items():
+            placeholders = ', '.join('?' for _ in columns)
+            sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            counts['inserted'] += _run_batch(conn, sql, batch, errors)
+        sql = f"DELETE FROM {table_name} WHERE {row_id_col} = ?"
+        counts['deleted'] += _run_batch(conn, sql, deletes, errors)
+        return counts
+
+    try:
+        result.update(run_write(apply))
+    except Exception as e:
+        errors.append({'row': None, 'error': str(e)})
+    return result
+
+
+def reset_editor(version_key):
+    """Starts a fresh data_editor by bumping the version used in its widget key."""
+    st.session_state[version_key] = st.session_state.get(version_key, 0) + 1
+
+
+def show_save_result(result):
+    """Reports the outcome of save_editor_changes()."""
+    if not result:
+        return
+    for failure in result['errors']:
+        st.error(f"{failure['row'] or 'Save'}: {failure['error']}")
+    if result['updated'] or result['inserted'] or result['deleted']:
+        st.success(
+            f"✅ {result['updated']} updated, {result['inserted']} added, "
+            f"{result['deleted']} deleted."
+        )
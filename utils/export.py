@@ -0,0 +1,225 @@
+import argparse
+import csv
+import os
+import sqlite3
+import tempfile
+import weakref
+from contextlib import closing
+import streamlit as st
+from utils.database import DB_PATH, connect_read_only
+from utils.travels import build_travel_filters
+
+# Rows pulled from the cursor per fetchmany(); memory stays proportional to this
+EXPORT_CHUNK_SIZE = 10000
+
+EXPORT_TABLES = {
+    # table: (table or view read from, default condition, order)
+    "Travel": ("Travel_View", None, "travel_id"),  # names resolved alongside the ids
+    "Customer": ("Customer", "status = 1", "customer_id"),
+}
+
+
+# --- Query ---
+
+def _export_query(table_name, filters):
+    if table_name not in EXPORT_TABLES:
+        raise ValueError(f"Cannot export table {table_name!r}")
+    source, condition, order = EXPORT_TABLES[table_name]
+    where, params = build_travel_filters(filters) if table_name == "Travel" else ("", [])
+    if condition:
+        where = f"{where} AND {condition}" if where else f" WHERE {condition}"
+    return f"SELECT * FROM {source}{where} ORDER BY {order}", params
+
+
+def iter_export_chunks(table_name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, db_path=None):
+    """Yields (columns, rows) with at most chunk_size rows at a time.
+
+    Uses its own read-only connection rather than a pooled one, so a long
+    export does not tie up a pool slot; under WAL it does not block other
+    readers or writers. db_path defaults to the app's database.
+    """
+    query, params = _export_query(table_name, filters)
+    with closing(connect_read_only(db_path or DB_PATH)) as conn:
+        cursor = conn.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield columns, rows
+
+
+# --- Writers ---
+
+def export_csv(out, table_name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, db_path=None):
+    """Streams a table to a text file object as CSV. Returns the row count."""
+    writer = csv.writer(out)
+    count = 0
+    header_written = False
+    for columns, rows in iter_export_chunks(table_name, filters, chunk_size, db_path):
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        count += len(rows)
+    if not header_written:
+        # Empty result: still write the header so the file is well formed
+        query, params = _export_query(table_name, filters)
+        with closing(connect_read_only(db_path or DB_PATH)) as conn:
+            cursor = conn.execute(f"{query} LIMIT 0", params)
+            writer.writerow([col[0] for col in cursor.description])
+    return count
+
+
+def _parquet_schema(table_name, filters, db_path=None):
+    """Arrow schema from the declared column types.
+
+    SQLite does not enforce declared types, so an INTEGER column holding any
+    non-integer value (e.g. airfare typed as text) is exported as string.
+    """
+    import pyarrow as pa
+
+    query, params = _export_query(table_name, filters)
+    with closing(connect_read_only(db_path or DB_PATH)) as conn:
+        info = conn.execute(f"PRAGMA table_info({EXPORT_TABLES[table_name][0]})").fetchall()
+        integer_columns = [name for _, name, decl, *_ in info if "INT" in (decl or "").upper()]
+        mixed = set()
+        if integer_columns:
+            checks = ", ".join(f"MAX(typeof({col}) NOT IN ('integer', 'null'))" for col in integer_columns)
+            flags = conn.execute(f"SELECT {checks} FROM ({query})", params).fetchone()
+            mixed = {col for col, flag in zip(integer_columns, flags) if flag}
+    return pa.schema([
+        (name, pa.int64() if name in integer_columns and name not in mixed else pa.string())
+        for _, name, *_ in info
+    ])
+
+
+def export_parquet(path, table_name, filters=None, chunk_size=EXPORT_CHUNK_SIZE, db_path=None):
+    """Streams a table to a Parquet file, one row group per chunk. Returns the row count."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(table_name, filters, db_path)
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for columns, rows in iter_export_chunks(table_name, filters, chunk_size, db_path):
+            arrays = []
+            for field, values in zip(schema, zip(*rows)):
+                if pa.types.is_string(field.type):
+                    values = [None if value is None else str(value) for value in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+def table_to_csv(table):
+    """CSV bytes of an Arrow table, e.g. a fetch_arrow() result for st.download_button."""
+    import io
+    import pyarrow.csv
+
+    out = io.BytesIO()
+    pyarrow.csv.write_csv(table, out)
+    return out.getvalue()
+
+
+def export_table(path, table_name, fmt="csv", filters=None, chunk_size=EXPORT_CHUNK_SIZE, db_path=None):
+    """Writes table_name to path as 'csv' or 'parquet'. Returns the row count."""
+    if fmt == "parquet":
+        return export_parquet(path, table_name, filters, chunk_size, db_path)
+    with open(path, "w", newline="", encoding="utf-8-sig") as out:
+        return export_csv(out, table_name, filters, chunk_size, db_path)
+
+
+def export_to_tempfile(table_name, fmt="csv", filters=None):
+    """Exports into a new temporary file for st.download_button. Returns (path, row count)."""
+    handle, path = tempfile.mkstemp(prefix=f"{table_name.lower()}_", suffix=f".{fmt}")
+    os.close(handle)
+    try:
+        return path, export_table(path, table_name, fmt, filters)
+    except BaseException:
+        os.remove(path)
+        raise
+
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class PreparedExport:
+    """A session's prepared export file, deleted once nothing refers to it any more.
+
+    That is when the session prepares another export, changes the filters or
+    format, or ends (its session state is dropped), and at the latest when
+    the server exits.
+    """
+
+    def __init__(self, table_name, fmt, filters):
+        self.path, self.count = export_to_tempfile(table_name, fmt, filters)
+        self.signature = (table_name, fmt, repr(filters))
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def export_panel(table_name, filters=None, key="export"):
+    """Export controls: prepare the file on the server, then offer it for download.
+
+    The file is read only when the download is clicked, not on every rerun.
+    """
+    col_format, col_prepare, col_download = st.columns([2, 1, 1])
+    with col_format:
+        fmt = st.radio("Format", ["csv", "parquet"], horizontal=True, key=f"{key}_format",
+                       format_func=lambda x: "CSV" if x == "csv" else "Parquet")
+    prepared = st.session_state.get(f"{key}_file")
+    if prepared is not None and prepared.signature != (table_name, fmt, repr(filters)):
+        # Prepared for other filters or another format: no longer what the page shows
+        del st.session_state[f"{key}_file"]
+        prepared = None
+    with col_prepare:
+        if st.button("Prepare Export", key=f"{key}_prepare"):
+            st.session_state.pop(f"{key}_file", None)
+            prepared = None
+            try:
+                prepared = st.session_state[f"{key}_file"] = PreparedExport(table_name, fmt, filters)
+            except Exception as e:
+                st.error(f"Failed to export {table_name}. Error: {e}")
+    if prepared is not None and os.path.exists(prepared.path):
+        with col_download:
+            st.download_button(f"⬇️ Download ({prepared.count:,} rows)", prepared.read,
+                               file_name=os.path.basename(prepared.path), key=f"{key}_download")
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Travel or Customer rows to CSV or Parquet.")
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("output", help="File to write")
+    parser.add_argument("--database", default=DB_PATH)
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Defaults to the output file extension")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument("--date-from", help="Travel: pickup date on or after (YYYY-MM-DD)")
+    parser.add_argument("--date-to", help="Travel: pickup date on or before (YYYY-MM-DD)")
+    parser.add_argument("--vendor-id", type=int)
+    parser.add_argument("--product-id", type=int)
+    parser.add_argument("--customer-id", type=int)
+    parser.add_argument("--confirmation-code", help="Confirmation code prefix")
+    parser.add_argument("--search", help="Travel: words to match in confirmation codes and Notes")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    filters = {
+        "date_from": args.date_from, "date_to": args.date_to, "vendor_id": args.vendor_id,
+        "product_id": args.product_id, "customer_id": args.customer_id,
+        "confirmation_code": args.confirmation_code, "search": args.search,
+    }
+    count = export_table(args.output, args.table, fmt, filters, args.chunk_size, args.database)
+    print(f"Exported {count} {args.table} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
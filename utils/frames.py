@@ -0,0 +1,69 @@
+# A text column becomes categorical only with at most this many distinct values per row;
+# above that the codes plus the categories take about as much memory as the strings
+CATEGORY_MAX_RATIO = 0.5
+
+INT32_RANGE = (-2**31, 2**31 - 1)
+
+
+def frame_memory(df):
+    """Bytes used by a DataFrame, including the strings it holds."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _present(series):
+    return series.notna() & (series != "")
+
+
+def _to_integer(series):
+    import pandas as pd
+
+    numbers = pd.to_numeric(series, errors="coerce")
+    if (numbers.isna() & _present(series)).any() or (numbers.dropna() % 1 != 0).any():
+        return series  # Holds text or fractions (e.g. airfare typed as text); left as loaded
+    low, high = INT32_RANGE
+    return numbers.astype("Int32" if numbers.dropna().between(low, high).all() else "Int64")
+
+
+def _to_datetime(series):
+    import pandas as pd
+
+    values = pd.to_datetime(series.where(_present(series)), format="ISO8601", errors="coerce")
+    if (values.isna() & _present(series)).any():
+        return series  # Some value is not a date; keep the text rather than lose it
+    return values
+
+
+def _to_category(series, categories=None):
+    values = series.astype("category")
+    if categories is None:
+        return values if len(values.cat.categories) <= CATEGORY_MAX_RATIO * len(series) else series
+    # Known choices first, then anything the data holds that they do not (e.g. inactive names)
+    return values.cat.set_categories(list(dict.fromkeys([*categories, *values.cat.categories])))
+
+
+def compact_frame(df, categorical=(), integer=(), datetime=(), categories=None):
+    """Converts a loaded frame to compact column types, in place, and returns it.
+
+    categorical columns become pandas categoricals (one code per row plus
+    each distinct string once); categories maps a column to the values it
+    may take, e.g. every lookup name an editor selectbox offers. integer
+    columns become nullable Int32 (Int64 if a value needs it) and datetime
+    columns real datetimes. A column is left as loaded when converting it
+    would lose a value. df.attrs["memory"] holds the bytes before and after.
+
+    Only make columns categorical that are never edited as free text:
+    st.data_editor cannot store a value that is not one of the categories.
+    """
+    before = frame_memory(df)
+    categories = categories or {}
+    for column in categorical:
+        if column in df.columns:
+            df[column] = _to_category(df[column], categories.get(column))
+    for column in integer:
+        if column in df.columns:
+            df[column] = _to_integer(df[column])
+    for column in datetime:
+        if column in df.columns:
+            df[column] = _to_datetime(df[column])
+    df.attrs["memory"] = {"before": before, "after": frame_memory(df)}
+    return df
@@ -0,0 +1,285 @@
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import time
+from contextlib import closing
+from utils.summary import rebuild_travel_summary
+from utils.search import rebuild_search_index
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "travel.schema")
+
+# Rows per executemany; one transaction per table keeps the load fast
+BATCH_SIZE = 50000
+
+# --- Vocabulary ---
+
+# (hangul, romanized) pairs; names are built from these so both spellings agree
+FAMILY_NAMES = [
+    ("김", "KIM"), ("이", "LEE"), ("박", "PARK"), ("최", "CHOI"), ("정", "JUNG"), ("강", "KANG"),
+    ("조", "CHO"), ("윤", "YOON"), ("장", "JANG"), ("임", "LIM"), ("한", "HAN"), ("오", "OH"),
+    ("서", "SEO"), ("신", "SHIN"), ("권", "KWON"), ("황", "HWANG"), ("안", "AHN"), ("송", "SONG"),
+]
+GIVEN_SYLLABLES = [
+    ("민", "MIN"), ("서", "SEO"), ("준", "JUN"), ("지", "JI"), ("현", "HYUN"), ("우", "WOO"),
+    ("도", "DO"), ("하", "HA"), ("은", "EUN"), ("수", "SOO"), ("영", "YOUNG"), ("동", "DONG"),
+    ("규", "GYU"), ("숙", "SOOK"), ("석", "SEOK"), ("진", "JIN"), ("혜", "HYE"), ("성", "SUNG"),
+    ("호", "HO"), ("연", "YEON"), ("경", "KYUNG"), ("희", "HEE"), ("재", "JAE"), ("윤", "YUN"),
+]
+ENGLISH_NAMES = ["DAVID", "GRACE", "JOHN", "SARAH", "PAUL", "JENNY", "DANIEL", "ESTHER", "PETER", "HANNAH"]
+
+PRODUCTS = [
+    "KOA - 알로하와이", "오아후 - VIP 단독행사", "마우이 - 골프 3박", "빅아일랜드 - 화산투어", "카우아이 - 허니문",
+    "오아후 - 가족여행 5박", "와이키키 - 자유일정", "오아후 - 교회 단체", "마우이 - 할레아칼라 일출", "호놀룰루 - 출장",
+]
+VENDORS = ["BADA", "ALO", "HANA TOURS", "MODE TOUR", "ISLAND WAY", "PACIFIC LINK", "ROBERTS", "VIP TRANS"]
+CLIENTS = ["I4U", "KALTOUR", "HANATOUR", "YELLOW BALLOON", "WEB DIRECT", "CHURCH GROUP"]
+AIRLINES = ["HA", "KE", "OZ", "WN", "UA", "DL", "AA", "AS", "JL"]
+PICKUPS = [
+    "HGI", "HRW", "HNL AIRPORT", "HILTON HAWAIIAN VILLAGE", "SHERATON WAIKIKI", "ALA MOANA HOTEL",
+    "HYATT REGENCY", "MOANA SURFRIDER", "OGG AIRPORT", "KOA AIRPORT", "LIH AIRPORT", "TRUMP WAIKIKI",
+]
+NOTES = [
+    "휠체어 필요", "유아 카시트 요청", "공항 픽업 지연 가능", "late arrival", "VIP meet & greet",
+    "짐 많음 - 밴 요청", "honeymoon package", "group leader", "채식 식사", "return flight changed",
+]
+CARD_PREFIXES = ["JB", "SH", "KB", "HD", "WR", "NH"]
+
+# How far bookings reach back from (and ahead of) the end date
+HISTORY_YEARS = 3
+FUTURE_DAYS = 180
+
+
+# --- Row Builders ---
+
+_BASE36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_BASE36_PAIRS = [a + b for a in _BASE36 for b in _BASE36]
+
+
+def _confirmation_code(travel_id):
+    """Unique 7-character code: a fixed permutation of the id in base 36."""
+    value = (travel_id * 1_000_003 + 7_654_321) % 36 ** 7
+    first, rest = divmod(value, 1296 ** 3)
+    second, rest = divmod(rest, 1296 ** 2)
+    third, fourth = divmod(rest, 1296)
+    return _BASE36[first] + _BASE36_PAIRS[second] + _BASE36_PAIRS[third] + _BASE36_PAIRS[fourth]
+
+
+class _Clock:
+    """Formats minute offsets from a start date as 'YYYY-MM-DD HH:MM:SS' without datetime objects."""
+
+    def __init__(self, start, days):
+        self.start = start
+        self.days = [(start + datetime.timedelta(days=day)).isoformat() + " " for day in range(days + 1)]
+        self.times = [f"{minute // 60:02d}:{minute % 60:02d}:00" for minute in range(24 * 60)]
+
+    def format(self, minute):
+        day, minute = divmod(minute, 24 * 60)
+        return self.days[day] + self.times[minute]
+
+
+def _customer_rows(rng, count):
+    today = datetime.date(2025, 1, 1)
+    for _ in range(count):
+        family_hangul, family = rng.choice(FAMILY_NAMES)
+        syllables = rng.sample(GIVEN_SYLLABLES, 2)
+        given = " ".join(roman for _, roman in syllables)
+        hangul = family_hangul + "".join(hangul for hangul, _ in syllables)
+        middle = rng.choice(ENGLISH_NAMES) if rng.random() < 0.15 else ""
+        birth = today - datetime.timedelta(days=rng.randint(18 * 365, 85 * 365))
+        card = f"{rng.choice(CARD_PREFIXES)} {rng.randint(0, 9999):04d}" if rng.random() < 0.7 else None
+        card_date = f"{rng.randint(2025, 2030)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}" if card else None
+        yield (
+            given, middle, family, hangul, rng.choice(("Male", "Female")), birth.isoformat(),
+            card, card_date, 1 if rng.random() < 0.02 else 0, 1 if rng.random() < 0.97 else 0,
+        )
+
+
+def _travel_rows(rng, first_id, count, customers, representatives, lookup_counts, clock, end_minute):
+    """Yields (travel row, history rows) for count bookings starting at first_id.
+
+    Times are minutes from clock.start; rng.random() scaled by hand is used
+    instead of randint/randrange, which are several times slower.
+    """
+    random = rng.random
+    # Leave room for booking up to 121 days ahead and for the return flight
+    pickup_days = len(clock.days) - 121 - 12
+    for travel_id in range(first_id, first_id + count):
+        # Pickups fall on 10-minute marks between 05:00 and 23:50
+        pickup = (121 + int(random() * pickup_days)) * 1440 + 300 + int(random() * 114) * 10
+        arrival = pickup - 30 - int(random() * 18) * 5
+        departure = pickup + (2 + int(random() * 9)) * 1440 + int(random() * 721) - 360
+        airfare_ib = 250 + int(random() * 155) * 10
+        airfare_ob = 250 + int(random() * 155) * 10 if random() < 0.9 else 0
+        total = 500 + int(random() * 150) * 50
+        deposit = int(random() * (total // 100 + 1)) * 50
+        remaining = (total - deposit) // 50
+        payment = remaining * 50 if pickup < end_minute else int(random() * (remaining + 1)) * 50
+        expense = int(random() * 150) * 10 if random() < 0.4 else 0
+        code = _confirmation_code(travel_id)
+        notes = NOTES[int(random() * len(NOTES))] if random() < 0.2 else None
+
+        travel = (
+            travel_id,
+            representatives[int(random() * len(representatives))] if representatives and random() < 0.6 else None,
+            1 + int(random() * lookup_counts["Client"]) if random() < 0.8 else None,
+            1 + int(random() * lookup_counts["Product"]),
+            1 + int(random() * lookup_counts["Vendor"]),
+            customers[int(random() * len(customers))],
+            1 + int(random() * lookup_counts["Flight"]),
+            1 + int(random() * lookup_counts["Pickup"]),
+            clock.format(pickup), code, airfare_ib, airfare_ob, clock.format(arrival), clock.format(departure),
+            deposit, payment, expense, notes,
+        )
+
+        # Booked 5-120 days ahead, then paid off in a few edits (what the history triggers would log).
+        # Every version falls before the pickup and the end date, and the last one is the Travel row.
+        last_minute = min(pickup, end_minute)
+        moment = min(pickup - (5 + int(random() * 116)) * 1440 - int(random() * 1440), last_minute)
+        history = [(travel_id, code, deposit, 0, 0, clock.format(moment))]
+        edits = min(int(rng.expovariate(0.5)), 8)
+        for edit in range(1, edits + 1):
+            moment = min(moment + 60 + int(random() * 240 * 60), last_minute)
+            history.append((travel_id, code, deposit, payment * edit // edits, expense if edit == edits else 0,
+                            clock.format(moment)))
+        if history[-1][3:5] != (payment, expense):
+            moment = min(moment + 60 + int(random() * 240 * 60), last_minute)
+            history.append((travel_id, code, deposit, payment, expense, clock.format(moment)))
+        yield travel, history
+
+
+# --- Generator ---
+
+def _schema_sql():
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        return f.read().split("------------------------------------------")[0]
+
+
+def _insert_batches(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def generate(path, bookings, customers=None, seed=0, end=None, on_progress=None):
+    """Builds a new database at path with realistic synthetic data.
+
+    The same seed and sizes always produce the same database. Triggers and
+    indexes are dropped during the bulk load and recreated afterwards, with
+    Travel_Summary and the search tables rebuilt in one pass each.
+    Returns a dict of row counts.
+    """
+    rng = random.Random(seed)
+    customers = customers or max(100, bookings // 5)
+    end = end or datetime.date(2025, 6, 30)
+    report = on_progress or (lambda message: None)
+
+    with closing(sqlite3.connect(path, isolation_level=None)) as conn:
+        conn.executescript(_schema_sql())
+        # Nothing is at stake until the file is complete
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+
+        deferred = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE type IN ('trigger', 'index') AND sql IS NOT NULL"
+        ).fetchall()
+        for kind, name, _ in deferred:
+            conn.execute(f"DROP {kind.upper()} {name}")
+
+        conn.execute("BEGIN")
+        lookup_counts = {}
+        flights = [f"{airline}{number}" for airline in AIRLINES for number in range(1, 10000, 37)]
+        for table, names in (("Product", PRODUCTS), ("Vendor", VENDORS), ("Client", CLIENTS),
+                             ("Flight", rng.sample(flights, 200)), ("Pickup", PICKUPS)):
+            conn.executemany(f"INSERT INTO {table} ({table}) VALUES (?)", [(name,) for name in names])
+            lookup_counts[table] = len(names)
+
+        _insert_batches(conn, (
+            "INSERT INTO Customer (first_name, middle_name, last_name, hangul_name, sex, date_of_birth, "
+            "credit_card, credit_card_date, is_representative, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        ), _customer_rows(rng, customers))
+        conn.execute("COMMIT")
+        report(f"{customers:,} customers")
+
+        customer_ids = [row[0] for row in conn.execute("SELECT customer_id FROM Customer WHERE status = 1")]
+        representative_ids = [row[0] for row in conn.execute(
+            "SELECT customer_id FROM Customer WHERE status = 1 AND is_representative = 1")]
+
+        travel_sql = (
+            "INSERT INTO Travel (travel_id, representative_id, client_id, product_id, vendor_id, customer_id, "
+            "flight_id, pickup_id, pickup_time, confirmation_code, airfair_IB, airfair_OB, time_IB, time_OB, "
+            "deposite, payment, event_expense, Notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        history_sql = (
+            "INSERT INTO Travel_History (travel_id, confirmation_code, deposite, payment, event_expense, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        history_count = 0
+        # Bookings reach HISTORY_YEARS back and FUTURE_DAYS ahead of end
+        clock = _Clock(end - datetime.timedelta(days=HISTORY_YEARS * 365), HISTORY_YEARS * 365 + FUTURE_DAYS)
+        end_minute = HISTORY_YEARS * 365 * 1440
+        for first_id in range(1, bookings + 1, BATCH_SIZE):
+            travel_batch, history_batch = [], []
+            count = min(BATCH_SIZE, bookings - first_id + 1)
+            for travel, history in _travel_rows(rng, first_id, count, customer_ids, representative_ids,
+                                                lookup_counts, clock, end_minute):
+                travel_batch.append(travel)
+                history_batch.extend(history)
+            conn.execute("BEGIN")
+            conn.executemany(travel_sql, travel_batch)
+            conn.executemany(history_sql, history_batch)
+            conn.execute("COMMIT")
+            history_count += len(history_batch)
+            report(f"{first_id + count - 1:,} / {bookings:,} bookings")
+
+        # Indexes and triggers back, then the derived tables in one pass each
+        conn.execute("BEGIN")
+        for _, _, sql in deferred:
+            conn.execute(sql)
+        report("indexes and triggers recreated")
+        rebuild_travel_summary(conn)
+        rebuild_search_index(conn, optimize=False)
+        conn.execute("COMMIT")
+        report("summary and search rebuilt")
+        # Sampled statistics are enough for the planner and take a fraction of the time
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    return {"customers": customers, "bookings": bookings, "history": history_count}
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic travel database for testing at scale.")
+    parser.add_argument("output", help="Database file to create")
+    parser.add_argument("--bookings", type=int, default=10000, help="Travel rows (1k to 10M)")
+    parser.add_argument("--customers", type=int, help="Customer rows (default: bookings / 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="Replace the output file if it exists")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        if not args.force:
+            parser.error(f"{args.output} exists; use --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.output + suffix):
+                os.remove(args.output + suffix)
+
+    started = time.perf_counter()
+    result = generate(args.output, args.bookings, args.customers, args.seed,
+                      on_progress=lambda message: print(f"[{time.perf_counter() - started:6.1f}s] {message}"))
+    print(f"Wrote {result['bookings']:,} bookings, {result['customers']:,} customers and "
+          f"{result['history']:,} history rows to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import streamlit as st
+from utils.database import get_read_connection, data_version, fetch_arrow
+
+# Columns Travel_History keeps a version of
+TRACKED_COLUMNS = ["confirmation_code", "deposite", "payment", "event_expense"]
+MONEY_COLUMNS = ["deposite", "payment", "event_expense"]
+
+# Migration 4: deleting a booking records a tombstone version, so "as of" a later time
+# no longer finds the booking (its last values stay in the row for the timeline)
+HISTORY_TOMBSTONES = """
+CREATE TRIGGER IF NOT EXISTS log_travel_delete
+AFTER DELETE ON Travel
+FOR EACH ROW
+BEGIN
+    INSERT INTO Travel_History (travel_id, confirmation_code, deposite, payment, event_expense, timestamp, deleted)
+    VALUES (OLD.travel_id, OLD.confirmation_code, OLD.deposite, OLD.payment, OLD.event_expense, CURRENT_TIMESTAMP, 1);
+END;
+"""
+
+# Migration 5: the latest version at or before a time is one backward step in this index.
+# Entries are ordered (travel_id, timestamp, rowid), so rowid breaks ties within a second.
+HISTORY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_travel_history_as_of ON Travel_History(travel_id, timestamp)",
+    "DROP INDEX IF EXISTS idx_travel_history",
+]
+
+# Migration 6: a version is recorded only when a tracked column actually changes. The
+# shipped trigger logged every UPDATE, e.g. each Notes or pickup edit saved from the editor.
+# Versions stay full rows (not just the changed fields) so an as-of lookup remains one seek.
+HISTORY_UPDATE_TRIGGER = f"""
+DROP TRIGGER IF EXISTS log_travel_update;
+
+CREATE TRIGGER log_travel_update
+AFTER UPDATE OF {', '.join(TRACKED_COLUMNS)} ON Travel
+FOR EACH ROW
+WHEN {' OR '.join(f'NEW.{col} IS NOT OLD.{col}' for col in TRACKED_COLUMNS)}
+BEGIN
+    INSERT INTO Travel_History (travel_id, confirmation_code, deposite, payment, event_expense, timestamp)
+    VALUES (NEW.travel_id, NEW.confirmation_code, NEW.deposite, NEW.payment, NEW.event_expense, CURRENT_TIMESTAMP);
+END;
+"""
+
+# rowid of a booking's version in effect at a time ({travel_id} is a column or ?)
+_VERSION_AT = """(
+    SELECT v.rowid FROM Travel_History v
+    WHERE v.travel_id = {travel_id} AND v.timestamp <= ?
+    ORDER BY v.timestamp DESC, v.rowid DESC LIMIT 1
+)"""
+
+VERSION_COLUMNS = "h.travel_id, h.confirmation_code, h.deposite, h.payment, h.event_expense, h.timestamp AS as_of"
+
+# Every booking's version in effect at a time, without the ones deleted by then.
+# DISTINCT walks the index once; each booking then costs one index seek.
+BOOK_AS_OF = f"""
+SELECT {VERSION_COLUMNS}
+FROM (SELECT DISTINCT travel_id FROM Travel_History) b
+JOIN Travel_History h ON h.rowid = {_VERSION_AT.format(travel_id="b.travel_id")}
+WHERE h.deleted = 0
+"""
+
+
+def add_history_tombstones(conn, run_script):
+    """Adds Travel_History.deleted and the delete trigger (migration 4)."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Travel_History)")]
+    if "deleted" not in columns:
+        conn.execute("ALTER TABLE Travel_History ADD COLUMN deleted INTEGER DEFAULT 0")
+    run_script(conn, HISTORY_TOMBSTONES)
+
+
+def _timestamp(as_of):
+    # Travel_History.timestamp is CURRENT_TIMESTAMP: UTC, 'YYYY-MM-DD HH:MM:SS'
+    return as_of.isoformat(" ", "seconds") if hasattr(as_of, "isoformat") else str(as_of)
+
+
+# --- As Of ---
+
+def booking_as_of(travel_id, as_of):
+    """A booking's tracked values as they stood at as_of (UTC), as a dict.
+
+    None if the booking did not exist yet or had been deleted by then.
+    """
+    query = (f"SELECT {VERSION_COLUMNS}, h.deleted FROM Travel_History h "
+             f"WHERE h.rowid = {_VERSION_AT.format(travel_id='?')}")
+    with get_read_connection() as conn:
+        cursor = conn.execute(query, (int(travel_id), _timestamp(as_of)))
+        row = cursor.fetchone()
+        columns = [col[0] for col in cursor.description]
+    if row is None or row[-1]:
+        return None
+    return dict(zip(columns[:-1], row[:-1]))
+
+
+def book_as_of(as_of):
+    """Every booking's tracked values as they stood at as_of (UTC), by travel_id, as an Arrow table.
+
+    as_of in the result is when each booking's version was recorded.
+    """
+    return fetch_arrow(f"{BOOK_AS_OF} ORDER BY h.travel_id", (_timestamp(as_of),))
+
+
+def book_totals_as_of(as_of):
+    """Booking count and money totals at as_of (UTC), summed in SQL."""
+    totals = ", ".join(f"SUM(CAST(IFNULL({col}, 0) AS INTEGER)) AS {col}" for col in MONEY_COLUMNS)
+    with get_read_connection() as conn:
+        cursor = conn.execute(f"SELECT COUNT(*) AS record_count, {totals} FROM ({BOOK_AS_OF})",
+                              (_timestamp(as_of),))
+        row = cursor.fetchone()
+        columns = [col[0] for col in cursor.description]
+    return {col: value or 0 for col, value in zip(columns, row)}
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_book(as_of, version):
+    return book_as_of(as_of), book_totals_as_of(as_of)
+
+
+def get_book_as_of(as_of):
+    """(book_as_of(), book_totals_as_of()), re-queried only when the database has changed."""
+    return _cached_book(_timestamp(as_of), data_version())
+
+
+# --- Timeline ---
+
+def booking_timeline(travel_id):
+    """Every recorded version of a booking, oldest first, with the columns each one changed."""
+    import pandas as pd
+
+    with get_read_connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT timestamp, {', '.join(TRACKED_COLUMNS)}, deleted FROM Travel_History "
+            "WHERE travel_id = ? ORDER BY timestamp, rowid",
+            conn, params=(int(travel_id),),
+        )
+    previous = df[TRACKED_COLUMNS].shift()
+    changed = (df[TRACKED_COLUMNS] != previous) & ~(df[TRACKED_COLUMNS].isna() & previous.isna())
+    df["changed"] = [
+        "deleted" if deleted else ("created" if position == 0 else ", ".join(changed.columns[row]))
+        for position, (deleted, row) in enumerate(zip(df["deleted"], changed.to_numpy()))
+    ]
+    return df.drop(columns=["deleted"])
+
+
+def find_booking(confirmation_code):
+    """travel_id of a confirmation code, including bookings deleted since; None if unknown."""
+    with get_read_connection() as conn:
+        row = conn.execute("SELECT travel_id FROM Travel WHERE confirmation_code = ?",
+                           (confirmation_code,)).fetchone()
+        if row is None:
+            # Deleted bookings only live on in the history (no index on the code there)
+            row = conn.execute("SELECT travel_id FROM Travel_History WHERE confirmation_code = ? "
+                               "ORDER BY timestamp DESC, rowid DESC LIMIT 1", (confirmation_code,)).fetchone()
+    return row[0] if row else None
@@ -0,0 +1,208 @@
+from utils.database import get_read_connection
+from utils.writer import submit_write, WRITE_TIMEOUT
+from utils.lookups import get_lookup_options, LOOKUP_TABLES
+
+# Columns accepted from a booking sheet (header names are matched case-insensitively)
+IMPORT_COLUMNS = [
+    "Representative", "Client", "Product", "Vendor", "Customer", "Flight", "Pickup",
+    "pickup_time", "confirmation_code", "airfair_IB", "airfair_OB", "time_IB", "time_OB",
+    "deposite", "payment", "event_expense", "Notes",
+]
+MONEY_COLUMNS = ["airfair_IB", "airfair_OB", "deposite", "payment", "event_expense"]
+DATETIME_COLUMNS = ["pickup_time", "time_IB", "time_OB"]
+
+# Sheet columns holding names, stored in Travel as ids
+ID_COLUMNS = {
+    "Representative": "representative_id", "Client": "client_id", "Product": "product_id",
+    "Vendor": "vendor_id", "Customer": "customer_id", "Flight": "flight_id", "Pickup": "pickup_id",
+}
+
+INSERT_QUERY = (
+    f"INSERT INTO Travel ({', '.join(ID_COLUMNS.get(col, col) for col in IMPORT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in IMPORT_COLUMNS)})"
+)
+
+# Keep the error report bounded even for a sheet that is wrong on every row
+MAX_REPORTED_ERRORS = 10000
+
+
+# --- Reading ---
+
+def read_booking_chunks(file, file_name, chunk_size=5000):
+    """Yields the sheet as DataFrames of at most chunk_size rows, all values as text."""
+    import pandas as pd
+
+    if file_name.lower().endswith((".xlsx", ".xlsm")):
+        # openpyxl's read-only mode streams rows instead of loading the workbook
+        from openpyxl import load_workbook
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(name).strip() if name is not None else "" for name in next(rows, [])]
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunk_size:
+                    yield pd.DataFrame(batch, columns=header, dtype=object)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header, dtype=object)
+        finally:
+            workbook.close()
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def _normalize_name(series):
+    """Upper-cases and collapses whitespace so 'Dong  gyu lee' matches 'DONG GYU LEE'."""
+    return series.str.upper().str.split().str.join(" ")
+
+
+def load_reference_data():
+    """Maps the valid lookup values and customer name variants to their ids for validation."""
+    import pandas as pd
+
+    options = get_lookup_options()
+    reference = {table: {name: row_id for row_id, name in options[table].items()} for table in LOOKUP_TABLES}
+
+    with get_read_connection() as conn:
+        customers = pd.read_sql_query(
+            "SELECT customer_id, first_name, middle_name, last_name, hangul_name, is_representative "
+            "FROM Customer WHERE status = 1", conn
+        )
+    customers = customers.fillna("")
+    canonical = customers["first_name"] + " " + customers["last_name"]
+    ids = customers["customer_id"]
+
+    # Every spelling an agent might type: "first last", "first middle last" and the hangul name
+    variants = pd.concat([
+        pd.DataFrame({"key": _normalize_name(canonical), "id": ids, "rep": customers["is_representative"]}),
+        pd.DataFrame({
+            "key": _normalize_name(customers["first_name"] + " " + customers["middle_name"] + " " + customers["last_name"]),
+            "id": ids, "rep": customers["is_representative"],
+        }),
+        pd.DataFrame({"key": _normalize_name(customers["hangul_name"]), "id": ids, "rep": customers["is_representative"]}),
+    ]).drop_duplicates()
+    variants = variants[variants["key"] != ""]
+
+    # A spelling shared by two different customers cannot be resolved
+    ambiguous = variants.groupby("key")["id"].nunique()
+    reference["ambiguous"] = set(ambiguous[ambiguous > 1].index)
+    variants = variants[~variants["key"].isin(reference["ambiguous"])]
+    reference["customers"] = variants.drop_duplicates("key").set_index("key")["id"]
+    reps = variants[variants["rep"] == 1]
+    reference["representatives"] = reps.drop_duplicates("key").set_index("key")["id"]
+    return reference
+
+
+# --- Validation ---
+
+def validate_chunk(chunk, reference, first_row_number):
+    """Checks one chunk with column-wise operations.
+
+    Returns (rows, errors): rows is a DataFrame of valid rows in IMPORT_COLUMNS
+    order ready for insert (names replaced by their ids), errors a DataFrame
+    with row, column, value, error.
+    """
+    import pandas as pd
+
+    header = {str(col).strip().lower(): col for col in chunk.columns}
+    data = pd.DataFrame(index=chunk.index)
+    for column in IMPORT_COLUMNS:
+        source = header.get(column.lower())
+        values = chunk[source] if source is not None else pd.Series(None, index=chunk.index, dtype=object)
+        values = values.astype("string").str.strip()
+        data[column] = values.mask(values == "")
+
+    row_numbers = pd.Series(range(first_row_number, first_row_number + len(chunk)), index=chunk.index)
+    problems = []
+
+    def flag(mask, column, message):
+        if mask.any():
+            problems.append(pd.DataFrame({
+                "row": row_numbers[mask], "column": column,
+                "value": data.loc[mask, column], "error": message,
+            }))
+
+    for table in LOOKUP_TABLES:
+        values = data[table]
+        resolved = values.map(reference[table]).astype("Int64")
+        flag(values.notna() & resolved.isna(), table, f"Unknown or inactive {table}")
+        data[table] = resolved
+
+    for column, names, required in (("Customer", reference["customers"], True),
+                                    ("Representative", reference["representatives"], False)):
+        keys = _normalize_name(data[column])
+        resolved = keys.map(names).astype("Int64")
+        if required:
+            flag(data[column].isna(), column, f"{column} is required")
+        flag(keys.isin(reference["ambiguous"]), column, f"{column} name matches more than one customer")
+        flag(data[column].notna() & resolved.isna() & ~keys.isin(reference["ambiguous"]), column, f"Unknown {column}")
+        data[column] = resolved
+
+    for column in MONEY_COLUMNS:
+        raw = data[column].str.replace(r"[$,]", "", regex=True)
+        amounts = pd.to_numeric(raw, errors="coerce")
+        flag(raw.notna() & amounts.isna(), column, "Not a number")
+        data[column] = amounts.fillna(0).round().astype("int64")
+
+    for column in DATETIME_COLUMNS:
+        parsed = pd.to_datetime(data[column], errors="coerce", format="mixed")
+        flag(data[column].notna() & parsed.isna(), column, "Not a date/time")
+        data[column] = parsed.dt.strftime("%Y-%m-%d %H:%M:%S").astype(object).where(parsed.notna(), None)
+
+    errors = pd.concat(problems, ignore_index=True) if problems else pd.DataFrame(columns=["row", "column", "value", "error"])
+    valid = ~row_numbers.isin(errors["row"])
+    rows = data[valid].astype(object).where(data[valid].notna(), None)
+    return rows, errors
+
+
+# --- Import ---
+
+def _insert_rows(conn, rows):
+    conn.executemany(INSERT_QUERY, rows)
+    return len(rows)
+
+
+def import_bookings(file, file_name, chunk_size=5000, dry_run=False, on_progress=None):
+    """Validates and inserts a booking sheet chunk by chunk.
+
+    Each chunk is inserted with executemany as its own writer job, so the
+    write lock is only held briefly. With dry_run=True nothing is written.
+    Returns a report dict: rows_read, rows_valid, rows_inserted, error_count
+    and errors (DataFrame, capped at MAX_REPORTED_ERRORS rows).
+    """
+    import pandas as pd
+
+    report = {"rows_read": 0, "rows_valid": 0, "rows_inserted": 0, "error_count": 0}
+    error_frames = []
+    reported = 0
+    reference = load_reference_data()
+
+    # Each chunk is written by the writer thread while the next one is read and validated
+    pending = None
+    # Data rows start at line 2, after the header
+    for chunk in read_booking_chunks(file, file_name, chunk_size):
+        rows, errors = validate_chunk(chunk, reference, report["rows_read"] + 2)
+        report["rows_read"] += len(chunk)
+        report["rows_valid"] += len(rows)
+        report["error_count"] += len(errors)
+        if reported < MAX_REPORTED_ERRORS and not errors.empty:
+            error_frames.append(errors.head(MAX_REPORTED_ERRORS - reported))
+            reported += len(error_frames[-1])
+
+        if pending is not None:
+            report["rows_inserted"] += pending.result(timeout=WRITE_TIMEOUT)
+            pending = None
+        if not dry_run and not rows.empty:
+            pending = submit_write(_insert_rows, list(rows.itertuples(index=False, name=None)))
+        if on_progress:
+            on_progress(report)
+    if pending is not None:
+        report["rows_inserted"] += pending.result(timeout=WRITE_TIMEOUT)
+        if on_progress:
+            on_progress(report)
+
+    report["errors"] = (pd.concat(error_frames, ignore_index=True) if error_frames
+                        else pd.DataFrame(columns=["row", "column", "value", "error"]))
+    return report
@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+import streamlit as st
+from utils.database import get_read_connection
+from utils.lookups import LOOKUP_TABLES, invalidate_lookups, lookup_versions
+from utils.writer import run_write
+
+STATUS_LABELS = {1: "Active", 0: "Inactive"}
+
+
+# --- Cached Table Read ---
+
+@st.cache_resource
+def _generations():
+    """Per-table write counters shared by every session; part of the cache key below."""
+    return {table: 0 for table in LOOKUP_TABLES}, threading.Lock()
+
+
+def _generation(table):
+    counters, lock = _generations()
+    with lock:
+        return counters[table]
+
+
+def invalidate_table(table):
+    """Marks one lookup table as changed; other tables keep their cached rows."""
+    counters, lock = _generations()
+    with lock:
+        counters[table] += 1
+    invalidate_lookups()
+
+
+@st.cache_data(max_entries=len(LOOKUP_TABLES) * 2, show_spinner=False)
+def _load_table(table, generation, version):
+    """Every row of a lookup table, ordered by name; cached until the table is written to."""
+    import pandas as pd
+
+    with get_read_connection() as conn:
+        return pd.read_sql_query(
+            f"SELECT {table.lower()}_id AS id, {table} AS name, Notes, status FROM {table} ORDER BY {table}, {table.lower()}_id",
+            conn,
+        )
+
+
+def table_version(table):
+    """Cache key of a lookup table's rows: this process's write counter and the table's Lookup_Version.
+
+    Writes made through this module bump the first; every write to the
+    table, including from other processes, the importer or migrations,
+    bumps the second.
+    """
+    return _generation(table), lookup_versions()[table]
+
+
+def get_table(table, version=None):
+    """The cached rows of table (id, name, Notes, status) that list, detail and display all share."""
+    return _load_table(table, *(version or table_version(table)))
+
+
+# --- Writes (each one transaction) ---
+
+def _write(table, statement, rows):
+    try:
+        run_write(lambda conn: conn.executemany(statement, rows))
+    finally:
+        invalidate_table(table)
+
+
+def add_entries(table, names, notes=None, status=1):
+    """Inserts one row per name; all or none are added."""
+    _write(table, f"INSERT INTO {table} ({table}, Notes, status) VALUES (?, ?, ?)",
+           [(name, notes, status) for name in names])
+
+
+def update_entry(table, row_id, name, notes, status):
+    _write(table, f"UPDATE {table} SET {table} = ?, Notes = ?, status = ? WHERE {table.lower()}_id = ?",
+           [(name, notes, status, row_id)])
+
+
+def set_status(table, row_ids, status):
+    _write(table, f"UPDATE {table} SET status = ? WHERE {table.lower()}_id = ?",
+           [(status, row_id) for row_id in row_ids])
+
+
+def delete_entries(table, row_ids):
+    """Deletes the rows; if any is still used by a booking, none are deleted."""
+    _write(table, f"DELETE FROM {table} WHERE {table.lower()}_id = ?", [(row_id,) for row_id in row_ids])
+
+
+def _delete_error(table, e):
+    if isinstance(e, sqlite3.IntegrityError):
+        return f"A {table} to delete is still used by bookings, so nothing was deleted. Mark it inactive instead."
+    return f"Database error during deletion: {e}"
+
+
+# --- Page ---
+
+def render_lookup_page(table):
+    """Add / Edit / Display tabs for one lookup table, served from a single cached read."""
+    import pandas as pd
+
+    key = table.lower()
+    try:
+        version = table_version(table)
+        df = get_table(table, version)
+    except Exception as e:
+        st.error(f"Database error when loading {table}s: {e}")
+        df = pd.DataFrame(columns=["id", "name", "Notes", "status"])
+
+    # Set before a rerun, which would otherwise discard the message
+    if f"{key}_message" in st.session_state:
+        st.success(st.session_state.pop(f"{key}_message"))
+
+    tab1, tab2, tab3 = st.tabs([f"➕ Add New {table}", f"✏️ Edit {table}", f"👀 Display {table}"])
+
+    # --- TAB 1: Add one, or many at once ---
+    with tab1:
+        with st.form(key=f"{key}_add_form"):
+            names = st.text_area(f"{table} Name", help="Enter one name per line to add several at once",
+                                 key=f"{key}_add_names")
+            notes = st.text_area("Notes", key=f"{key}_add_notes")
+            status = st.selectbox("Status", [1, 0], format_func=STATUS_LABELS.get)
+            submitted = st.form_submit_button(f"Add {table}")
+        if submitted:
+            new_names = [name.strip() for name in names.splitlines() if name.strip()]
+            if not new_names:
+                st.error(f"Please enter a {table} name.")
+            else:
+                try:
+                    add_entries(table, new_names, notes or None, status)
+                    st.session_state[f"{key}_message"] = f"Added {len(new_names)} {table}(s): {', '.join(new_names)}"
+                    # Clear inputs by resetting session state and rerunning
+                    for name in [f"{key}_add_names", f"{key}_add_notes"]:
+                        st.session_state.pop(name, None)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Database error: {e}")
+
+    # --- TAB 2: Edit the selected row ---
+    with tab2:
+        if df.empty:
+            st.info(f"No {table}s available to edit.")
+        else:
+            rows = df.set_index("id")
+            row_id = st.selectbox(f"Select {table} to Edit", rows.index,
+                                  format_func=lambda row_id: rows.at[row_id, "name"], key=f"{key}_select")
+            row = rows.loc[row_id]
+            # Widget keys include the id, so switching rows starts from that row's values
+            new_name = st.text_input(f"{table} Name", value=row["name"], key=f"{key}_edit_name_{row_id}")
+            new_notes = st.text_area("Notes", value="" if pd.isna(row["Notes"]) else row["Notes"], key=f"{key}_edit_notes_{row_id}")
+            new_status = st.selectbox("Status", [1, 0], index=0 if row["status"] == 1 else 1,
+                                      format_func=STATUS_LABELS.get, key=f"{key}_edit_status_{row_id}")
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                if st.button(f"Update {table}", key=f"{key}_update"):
+                    try:
+                        update_entry(table, int(row_id), new_name.strip(), new_notes or None, new_status)
+                        st.session_state[f"{key}_message"] = f"{table} '{new_name}' updated successfully!"
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Database error during update: {e}")
+            with col2:
+                if st.button(f"Delete {table}", key=f"{key}_delete"):
+                    try:
+                        delete_entries(table, [int(row_id)])
+                        st.session_state[f"{key}_message"] = f"{table} '{row['name']}' deleted successfully!"
+                        st.rerun()
+                    except Exception as e:
+                        st.error(_delete_error(table, e))
+
+    # --- TAB 3: Display, with bulk actions on the selected rows ---
+    with tab3:
+        st.header(f"All {table}s List")
+        if df.empty:
+            st.info(f"No {table}s found in the database.")
+            return
+
+        display = df.assign(status=df["status"].map(STATUS_LABELS)).rename(
+            columns={"id": "ID", "name": f"{table} Name"})
+        # Keyed by the table version so a selection never outlives the rows it pointed at
+        event = st.dataframe(display, hide_index=True, width='stretch',
+                             key=f"{key}_table_{'_'.join(map(str, version))}",
+                             on_select="rerun", selection_mode="multi-row")
+        selected = [int(df["id"].iloc[position]) for position in event.selection.rows]
+        st.caption(f"Total {table}s: **{len(df)}**" + (f" · selected: **{len(selected)}**" if selected else ""))
+
+        col1, col2, col3, col4 = st.columns(4)
+        actions = {
+            "activate": col1.button("Mark Active", key=f"{key}_bulk_active", disabled=not selected),
+            "deactivate": col2.button("Mark Inactive", key=f"{key}_bulk_inactive", disabled=not selected),
+            "delete": col3.button("Delete Selected", key=f"{key}_bulk_delete", disabled=not selected),
+        }
+        try:
+            if actions["activate"] or actions["deactivate"]:
+                set_status(table, selected, 1 if actions["activate"] else 0)
+                st.rerun()
+            if actions["delete"]:
+                delete_entries(table, selected)
+                st.rerun()
+        except Exception as e:
+            st.error(_delete_error(table, e) if actions["delete"] else f"Database error during update: {e}")
@@ -0,0 +1,74 @@
+import streamlit as st
+from utils.database import get_read_connection
+
+# Simple name tables that feed the Travel dropdowns
+LOOKUP_TABLES = ["Product", "Vendor", "Client", "Flight", "Pickup"]
+
+# Migration 7: a change counter per lookup table, bumped by triggers on every write from any
+# connection or process. Option caches are keyed on it rather than on PRAGMA data_version,
+# which changes on every commit (each booking save, import chunk or history write).
+LOOKUP_VERSION = "\n".join([
+    "CREATE TABLE IF NOT EXISTS Lookup_Version (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0) "
+    "WITHOUT ROWID;",
+    "INSERT OR IGNORE INTO Lookup_Version (table_name) VALUES " + ", ".join(f"('{table}')" for table in LOOKUP_TABLES) + ";",
+] + [
+    f"""
+CREATE TRIGGER IF NOT EXISTS {table.lower()}_version_{event.lower()}
+AFTER {event} ON {table}
+BEGIN
+    UPDATE Lookup_Version SET version = version + 1 WHERE table_name = '{table}';
+END;"""
+    for table in LOOKUP_TABLES for event in ("INSERT", "UPDATE", "DELETE")
+])
+
+# All active dropdown values in one round trip, tagged with the option list they belong to.
+# Customers are not listed here: they are picked through search (utils.search.customer_picker).
+LOOKUP_OPTIONS_QUERY = " UNION ALL ".join(
+    f"SELECT '{table}', {table.lower()}_id, {table} FROM {table} WHERE status = 1" for table in LOOKUP_TABLES
+) + " ORDER BY 1, 3, 2"
+
+
+def _empty_options():
+    return {name: {} for name in LOOKUP_TABLES}
+
+
+def lookup_versions():
+    """{table: change counter} for every lookup table, in one primary-key scan."""
+    with get_read_connection() as conn:
+        versions = dict(conn.execute("SELECT table_name, version FROM Lookup_Version"))
+    return {table: versions.get(table, 0) for table in LOOKUP_TABLES}
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_lookup_options(versions):
+    """Reads every option list; cached until one of the lookup tables changes."""
+    options = _empty_options()
+    with get_read_connection() as conn:
+        for name, row_id, value in conn.execute(LOOKUP_OPTIONS_QUERY):
+            options[name][row_id] = value
+    return options
+
+
+def get_lookup_options():
+    """Returns {"Product": {product_id: name, ...}, "Vendor": {...}, ...} for every lookup table.
+
+    Each mapping is ordered by name.
+    """
+    try:
+        return _load_lookup_options(tuple(lookup_versions().values()))
+    except Exception:
+        return _empty_options()
+
+
+def invalidate_lookups():
+    """Drops cached option lists; call after writing to a lookup table."""
+    _load_lookup_options.clear()
+
+
+def lookup_selectbox(label, options, **kwargs):
+    """Selectbox over an {id: name} mapping with a leading "Select..." entry; returns the id or None."""
+    return st.selectbox(
+        label, options=[None] + list(options),
+        format_func=lambda row_id: "Select..." if row_id is None else options.get(row_id, str(row_id)),
+        **kwargs
+    )
@@ -0,0 +1,170 @@
+from utils.summary import SUMMARY_SCHEMA, rebuild_travel_summary
+
+LOOKUP_TABLES = ["Product", "Vendor", "Client", "Flight", "Pickup"]
+
+def _lookup_table_sql(table):
+    """Rebuilds a name table with an explicit id; existing rowids become the ids."""
+    key = f"{table.lower()}_id"
+    return f"""
+CREATE TABLE {table}_new (
+    {key} INTEGER PRIMARY KEY,
+    {table} TEXT NOT NULL,
+    Notes TEXT,
+    status INTEGER DEFAULT 1
+);
+INSERT INTO {table}_new ({key}, {table}, Notes, status) SELECT rowid, {table}, Notes, status FROM {table};
+DROP TABLE {table};
+ALTER TABLE {table}_new RENAME TO {table};
+
+-- Names used by bookings but missing from {table} become inactive entries
+INSERT INTO {table} ({table}, status)
+SELECT DISTINCT {table}, 0 FROM Travel
+WHERE {table} IS NOT NULL AND {table} NOT IN (SELECT {table} FROM {table});
+"""
+
+
+def _lookup_id(table):
+    key = f"{table.lower()}_id"
+    return f"(SELECT {key} FROM {table} WHERE {table} = t.{table} ORDER BY status DESC, {key} LIMIT 1)"
+
+
+def _customer_id(column, prefer_representative=False):
+    order = "is_representative DESC, status DESC, customer_id" if prefer_representative else "status DESC, customer_id"
+    return f"(SELECT customer_id FROM migration_customer_names WHERE name = t.{column} ORDER BY {order} LIMIT 1)"
+
+
+MIGRATION_SQL = "\n".join(_lookup_table_sql(table) for table in LOOKUP_TABLES) + f"""
+-- Customers are matched on the same "first last" string the app used to store
+CREATE TEMP TABLE migration_customer_names AS
+SELECT IFNULL(first_name, '') || ' ' || IFNULL(last_name, '') AS name, customer_id, is_representative, status
+FROM Customer;
+CREATE INDEX temp.idx_migration_customer_names ON migration_customer_names(name);
+
+-- Keep AUTOINCREMENT from handing out ids of deleted bookings still in Travel_History
+CREATE TEMP TABLE migration_travel_seq AS SELECT seq FROM sqlite_sequence WHERE name = 'Travel';
+
+CREATE TABLE Travel_new (
+    travel_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    representative_id INTEGER REFERENCES Customer(customer_id),
+    client_id INTEGER REFERENCES Client(client_id),
+    product_id INTEGER REFERENCES Product(product_id),
+    vendor_id INTEGER REFERENCES Vendor(vendor_id),
+    customer_id INTEGER REFERENCES Customer(customer_id),
+    flight_id INTEGER REFERENCES Flight(flight_id),
+    pickup_id INTEGER REFERENCES Pickup(pickup_id),
+    pickup_time TEXT,
+    confirmation_code TEXT,
+    airfair_IB INTEGER DEFAULT 0,
+    airfair_OB INTEGER DEFAULT 0,
+    time_IB TEXT,
+    time_OB TEXT,
+    deposite INTEGER DEFAULT 0,
+    payment INTEGER DEFAULT 0,
+    event_expense INTEGER DEFAULT 0,
+    Notes TEXT
+);
+
+INSERT INTO Travel_new (
+    travel_id, representative_id, client_id, product_id, vendor_id, customer_id, flight_id, pickup_id,
+    pickup_time, confirmation_code, airfair_IB, airfair_OB, time_IB, time_OB,
+    deposite, payment, event_expense, Notes
+)
+SELECT
+    t.travel_id,
+    {_customer_id("Representative", prefer_representative=True)},
+    {_lookup_id("Client")},
+    {_lookup_id("Product")},
+    {_lookup_id("Vendor")},
+    {_customer_id("Customer")},
+    {_lookup_id("Flight")},
+    {_lookup_id("Pickup")},
+    t.pickup_time, t.confirmation_code, t.airfair_IB, t.airfair_OB, t.time_IB, t.time_OB,
+    t.deposite, t.payment, t.event_expense, t.Notes
+FROM Travel t;
+
+-- Customer names that match nobody are kept in Notes rather than dropped
+UPDATE Travel_new SET Notes = trim(IFNULL(Notes, '') || ' [Customer: ' ||
+    (SELECT Customer FROM Travel WHERE Travel.travel_id = Travel_new.travel_id) || ']')
+WHERE customer_id IS NULL
+  AND (SELECT Customer FROM Travel WHERE Travel.travel_id = Travel_new.travel_id) IS NOT NULL;
+UPDATE Travel_new SET Notes = trim(IFNULL(Notes, '') || ' [Representative: ' ||
+    (SELECT Representative FROM Travel WHERE Travel.travel_id = Travel_new.travel_id) || ']')
+WHERE representative_id IS NULL
+  AND (SELECT Representative FROM Travel WHERE Travel.travel_id = Travel_new.travel_id) NOT IN ('', 'Select...');
+
+DROP TABLE Travel;
+ALTER TABLE Travel_new RENAME TO Travel;
+UPDATE sqlite_sequence SET seq = MAX(seq, IFNULL((SELECT seq FROM migration_travel_seq), 0)) WHERE name = 'Travel';
+
+CREATE INDEX IF NOT EXISTS idx_travel_pickup_time ON Travel(pickup_time);
+CREATE INDEX IF NOT EXISTS idx_travel_confirmation_code ON Travel(confirmation_code);
+CREATE INDEX IF NOT EXISTS idx_travel_vendor ON Travel(vendor_id);
+CREATE INDEX IF NOT EXISTS idx_travel_product ON Travel(product_id);
+CREATE INDEX IF NOT EXISTS idx_travel_client ON Travel(client_id);
+CREATE INDEX IF NOT EXISTS idx_travel_customer ON Travel(customer_id);
+CREATE INDEX IF NOT EXISTS idx_travel_representative ON Travel(representative_id);
+CREATE INDEX IF NOT EXISTS idx_travel_flight ON Travel(flight_id);
+CREATE INDEX IF NOT EXISTS idx_travel_pickup ON Travel(pickup_id);
+
+CREATE VIEW IF NOT EXISTS Travel_View AS
+SELECT
+    t.travel_id,
+    CASE WHEN r.customer_id IS NOT NULL THEN IFNULL(r.first_name, '') || ' ' || IFNULL(r.last_name, '') END AS Representative,
+    cl.Client,
+    p.Product,
+    v.Vendor,
+    CASE WHEN c.customer_id IS NOT NULL THEN IFNULL(c.first_name, '') || ' ' || IFNULL(c.last_name, '') END AS Customer,
+    f.Flight,
+    pk.Pickup,
+    t.pickup_time, t.confirmation_code, t.airfair_IB, t.airfair_OB, t.time_IB, t.time_OB,
+    t.deposite, t.payment, t.event_expense, t.Notes,
+    t.representative_id, t.client_id, t.product_id, t.vendor_id, t.customer_id, t.flight_id, t.pickup_id
+FROM Travel t
+LEFT JOIN Customer r ON r.customer_id = t.representative_id
+LEFT JOIN Client cl ON cl.client_id = t.client_id
+LEFT JOIN Product p ON p.product_id = t.product_id
+LEFT JOIN Vendor v ON v.vendor_id = t.vendor_id
+LEFT JOIN Customer c ON c.customer_id = t.customer_id
+LEFT JOIN Flight f ON f.flight_id = t.flight_id
+LEFT JOIN Pickup pk ON pk.pickup_id = t.pickup_id;
+
+-- Dropping Travel dropped its triggers; recreate them on the new table
+CREATE TRIGGER IF NOT EXISTS log_travel_insert
+AFTER INSERT ON Travel
+FOR EACH ROW
+BEGIN
+    INSERT INTO Travel_History (travel_id, confirmation_code, deposite, payment, event_expense, timestamp)
+    VALUES (NEW.travel_id, NEW.confirmation_code, NEW.deposite, NEW.payment, NEW.event_expense, CURRENT_TIMESTAMP);
+END;
+
+CREATE TRIGGER IF NOT EXISTS log_travel_update
+AFTER UPDATE ON Travel
+FOR EACH ROW
+BEGIN
+    INSERT INTO Travel_History (travel_id, confirmation_code, deposite, payment, event_expense, timestamp)
+    VALUES (NEW.travel_id, NEW.confirmation_code, NEW.deposite, NEW.payment, NEW.event_expense, CURRENT_TIMESTAMP);
+END;
+
+DROP TABLE temp.migration_customer_names;
+DROP TABLE temp.migration_travel_seq;
+"""
+
+
+def is_migrated(conn):
+    """True when Travel already has integer keys (or there is no Travel table to convert)."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Travel)")]
+    return not columns or "customer_id" in columns
+
+
+def convert_to_integer_keys(conn, run_script):
+    """Converts Travel's text references to integer ids (migration 1).
+
+    Runs inside the migration runner's transaction, with foreign keys off.
+    Also creates Travel_Summary, whose triggers need the id columns.
+    """
+    if not is_migrated(conn):
+        run_script(conn, MIGRATION_SQL)
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Travel_Summary'").fetchone()
+    run_script(conn, SUMMARY_SCHEMA)
+    if not exists:
+        rebuild_travel_summary(conn)
@@ -0,0 +1,147 @@
+import argparse
+import sqlite3
+import time
+from contextlib import closing
+from utils.database import DB_PATH
+from utils.migrate_keys import convert_to_integer_keys
+from utils.search import create_search_index
+from utils.dispatch import DISPATCH_INDEXES
+from utils.history import HISTORY_INDEXES, HISTORY_UPDATE_TRIGGER, add_history_tombstones
+from utils.summary import SUMMARY_UPDATE_TRIGGER
+from utils.lookups import LOOKUP_VERSION
+
+# Pause between the statements of an index migration so other writers can get the lock
+INDEX_PAUSE = 0.05
+
+
+def run_script(conn, script):
+    """Runs a multi-statement SQL script inside the current transaction.
+
+    sqlite3's executescript() commits first, which would break the
+    one-transaction-per-migration rule, so statements are split here
+    (complete_statement keeps trigger bodies together).
+    """
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\r\n;"):
+                conn.execute(statement)
+            statement = ""
+
+
+# Ordered schema changes. A step is one of:
+#   str       SQL script, applied in one transaction
+#   callable  step(conn, run_script), applied in one transaction
+#   list      CREATE/DROP INDEX statements, each run in its own short transaction
+#             so readers and writers are only held up for one index at a time
+# Never edit a shipped migration; append a new one and bump travel.schema's user_version.
+MIGRATIONS = [
+    (1, "Integer keys for Travel references, Travel_Summary and listing indexes", convert_to_integer_keys),
+    (2, "FTS5 search over customer names, confirmation codes and Notes", create_search_index),
+    (3, "Travel(pickup_id, pickup_time) index for the dispatch board", DISPATCH_INDEXES),
+    (4, "Travel_History delete tombstones", add_history_tombstones),
+    (5, "Travel_History(travel_id, timestamp) index for as-of queries", HISTORY_INDEXES),
+    (6, "History and summary update triggers fire only on changed columns",
+     HISTORY_UPDATE_TRIGGER + SUMMARY_UPDATE_TRIGGER),
+    (7, "Per-table change counters for the lookup caches", LOOKUP_VERSION),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn):
+    version = get_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+
+def _apply(conn, version, step):
+    if isinstance(step, list):
+        for statement in step:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(statement)
+            conn.execute("COMMIT")
+            time.sleep(INDEX_PAUSE)
+        step = ""  # Only the version bump is left
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have applied it while we waited for the lock
+        if get_version(conn) >= version:
+            conn.execute("ROLLBACK")
+            return False
+        if callable(step):
+            step(conn, run_script)
+        else:
+            run_script(conn, step)
+        problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise sqlite3.IntegrityError(f"Foreign key check failed: {problems[:5]}")
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        conn.execute("COMMIT")
+        return True
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def upgrade(conn, target=None, on_migration=None):
+    """Applies pending migrations up to target (default: latest) in order.
+
+    Cheap when the database is current: one PRAGMA read. Returns the list of
+    versions applied. conn must not be inside a transaction.
+    """
+    target = LATEST_VERSION if target is None else target
+    if get_version(conn) >= target:
+        return []
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Travel'").fetchone():
+        raise RuntimeError("Database has no schema; create it from travel.schema with db.sh first.")
+
+    applied = []
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Transactions are managed explicitly below
+    # Foreign key enforcement cannot change inside a transaction; tables are rebuilt with it off
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        for version, description, step in MIGRATIONS:
+            if version > target:
+                break
+            if version <= get_version(conn):
+                continue
+            if on_migration:
+                on_migration(version, description)
+            if _apply(conn, version, step):
+                applied.append(version)
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.isolation_level = previous_isolation
+    return applied
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bring the database schema up to date.")
+    parser.add_argument("--database", default=DB_PATH)
+    parser.add_argument("--target", type=int, help="Stop at this version (default: latest)")
+    parser.add_argument("--status", action="store_true", help="Only show the current and pending versions")
+    args = parser.parse_args(argv)
+
+    with closing(sqlite3.connect(args.database, timeout=30)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        if args.status:
+            print(f"Schema version {get_version(conn)} (latest {LATEST_VERSION})")
+            for version, description, _ in pending_migrations(conn):
+                print(f"  pending {version}: {description}")
+            return
+        applied = upgrade(conn, args.target,
+                          on_migration=lambda version, description: print(f"Applying {version}: {description}"))
+        print(f"Schema version {get_version(conn)}" + ("" if applied else " (already up to date)"))
+
+
+if __name__ == "__main__":
+    main()
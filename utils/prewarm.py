@@ -0,0 +1,26 @@
+import importlib
+import threading
+import streamlit as st
+
+# Modules the data pages need but Home does not; loaded in the background after Home renders
+PREWARM_MODULES = ["pandas", "utils.lookup_page", "utils.travels", "utils.reports", "utils.editor", "utils.importer", "utils.export"]
+
+
+def _import_all():
+    for name in PREWARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # The page that needs the module reports the error
+
+
+@st.cache_resource
+def prewarm():
+    """Starts importing PREWARM_MODULES in a background thread, once per server process.
+
+    Home paints without pandas; this moves the ~0.5 s import out of the
+    first data page the user opens.
+    """
+    thread = threading.Thread(target=_import_all, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,119 @@
+import streamlit as st
+from utils.database import get_read_connection, data_version
+from utils.summary import SUMMARY_COLUMNS
+from utils.travels import build_travel_filters
+
+# report -> (heading, Travel expression grouped on, name lookup joined to the groups or None).
+# Names are joined after grouping, so a join costs one lookup per group rather than per booking.
+REPORTS = {
+    "vendor": ("Vendor", "vendor_id", ("Vendor", "vendor_id", "n.Vendor")),
+    "product": ("Product", "product_id", ("Product", "product_id", "n.Product")),
+    "client": ("Client", "client_id", ("Client", "client_id", "n.Client")),
+    "representative": ("Representative", "representative_id",
+                       ("Customer", "customer_id", "CASE WHEN n.customer_id IS NOT NULL THEN "
+                        "IFNULL(n.first_name, '') || ' ' || IFNULL(n.last_name, '') END")),
+    "month": ("Month", "substr(pickup_time, 1, 7)", None),  # YYYY-MM of the pickup
+}
+
+# Reports Travel_Summary already keeps running totals for (used when nothing is filtered)
+SUMMARY_REPORTS = {"vendor", "product", "month"}
+
+# Underlying bookings shown for one group
+DRILL_LIMIT = 500
+
+# Same CAST as the summary triggers, so airfare typed as text adds up the same way everywhere
+TOTALS = ", ".join(f"SUM(CAST(IFNULL({col}, 0) AS INTEGER)) AS {col}" for col in SUMMARY_COLUMNS)
+
+
+def _report_query(report, filters, by_month):
+    key = REPORTS[report][1]
+    where, params = build_travel_filters(filters)
+    groups = "key, month" if by_month else "key"
+    month = ", substr(pickup_time, 1, 7) AS month" if by_month else ""
+    inner = f"SELECT {key} AS key{month}, COUNT(*) AS bookings, {TOTALS} FROM Travel{where} GROUP BY {groups}"
+    return _with_names(report, inner, by_month), params
+
+
+def _summary_query(report):
+    # Travel_Summary keys are text with '' for "none"; turn them back into the Travel values
+    key = "NULLIF(s.key, '')" if report == "month" else "CAST(NULLIF(s.key, '') AS INTEGER)"
+    columns = ", ".join(f"s.{col}" for col in SUMMARY_COLUMNS)
+    inner = (f"SELECT {key} AS key, s.record_count AS bookings, {columns} FROM Travel_Summary s "
+             f"WHERE s.scope = '{report}' AND s.record_count > 0")
+    return _with_names(report, inner, False), []
+
+
+def _with_names(report, inner, by_month):
+    heading, _, names = REPORTS[report]
+    month = "g.month, " if by_month else ""
+    totals = ", ".join(f"g.{col}" for col in SUMMARY_COLUMNS)
+    if names is None:
+        return f"SELECT g.key, IFNULL(g.key, '(none)') AS {heading}, {month}g.bookings, {totals} FROM ({inner}) g ORDER BY 2, 1"
+    table, id_column, name = names
+    return (f"SELECT g.key, IFNULL({name}, IFNULL(g.key, '(none)')) AS {heading}, {month}g.bookings, {totals} FROM ({inner}) g "
+            f"LEFT JOIN {table} n ON n.{id_column} = g.key ORDER BY 2, 1")
+
+
+# --- Reports ---
+
+def run_report(report, filters=None, by_month=False):
+    """Bookings and money totals per group of a report, aggregated in SQL.
+
+    Returns one row per group: key (the id or month grouped on, None for
+    bookings without one), its name, bookings and each money column.
+    With by_month every group is split further by pickup month. Unfiltered
+    vendor, product and month reports are read from Travel_Summary.
+    """
+    import pandas as pd
+
+    if report not in REPORTS:
+        raise ValueError(f"Unknown report {report!r}")
+    if report in SUMMARY_REPORTS and not by_month and not build_travel_filters(filters)[0]:
+        query, params = _summary_query(report)
+    else:
+        query, params = _report_query(report, filters, by_month)
+    with get_read_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_report(report, filter_items, by_month, version):
+    return run_report(report, dict(filter_items), by_month)
+
+
+def get_report(report, filters=None, by_month=False):
+    """run_report(), re-queried only when the database has changed (PRAGMA data_version)."""
+    return _cached_report(report, tuple((filters or {}).items()), by_month, data_version())
+
+
+def pivot_by_month(df, report, value="payment"):
+    """A by_month report as a table of groups × months for one column, with row totals."""
+    heading = REPORTS[report][0]
+    table = df.pivot_table(index=heading, columns="month", values=value, aggfunc="sum", fill_value=0,
+                           dropna=False)
+    table["Total"] = table.sum(axis=1)
+    return table
+
+
+# --- Drill-down ---
+
+def _group_clause(report, key):
+    column = REPORTS[report][1]
+    if key is None or key != key:  # NaN: a missing key read back from a DataFrame
+        return f"{'pickup_time' if report == 'month' else column} IS NULL", []
+    if report == "month":
+        # A range on pickup_time rather than substr(), so the index is used
+        return "pickup_time >= ? AND pickup_time < date(?, '+1 month')", [f"{key}-01", f"{key}-01"]
+    return f"{column} = ?", [int(key)]
+
+
+def report_rows(report, key, filters=None, limit=DRILL_LIMIT):
+    """The Travel_View rows behind one group of a report (at most limit, by pickup time)."""
+    import pandas as pd
+
+    where, params = build_travel_filters(filters)
+    clause, clause_params = _group_clause(report, key)
+    where = f"{where} AND {clause}" if where else f" WHERE {clause}"
+    query = f"SELECT * FROM Travel_View{where} ORDER BY pickup_time, travel_id LIMIT ?"
+    with get_read_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params + clause_params + [limit])
@@ -0,0 +1,178 @@
+import argparse
+import sqlite3
+import time
+from contextlib import closing
+from utils.database import DB_PATH
+
+# History newer than this stays at full detail
+FULL_DETAIL_DAYS = 90
+
+# History older than this moves to the archive database
+ARCHIVE_AFTER_DAYS = 730
+
+ARCHIVE_PATH = "travel_archive.database"
+
+# Rows touched per transaction; keeps each write lock short
+BATCH_SIZE = 1000
+
+# Pause between batches so other writers can get the lock
+BATCH_PAUSE = 0.05
+
+HISTORY_COLUMNS = ["travel_id", "confirmation_code", "deposite", "payment", "event_expense", "timestamp", "deleted"]
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.Travel_History (
+    history_id INTEGER PRIMARY KEY,  -- rowid in the live table, makes re-runs idempotent
+    travel_id INTEGER,
+    confirmation_code TEXT,
+    deposite INTEGER,
+    payment INTEGER,
+    event_expense INTEGER,
+    timestamp DATETIME,
+    deleted INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS archive.idx_archive_history
+ON Travel_History(travel_id, timestamp);
+"""
+
+# Older rows superseded by a later row of the same booking on the same day
+COMPACT_CANDIDATES = """
+SELECT h.rowid FROM Travel_History h
+WHERE h.rowid > ? AND h.timestamp < ?
+  AND EXISTS (
+      SELECT 1 FROM Travel_History later
+      WHERE later.travel_id = h.travel_id
+        AND (later.timestamp, later.rowid) > (h.timestamp, h.rowid)
+        AND later.timestamp < date(h.timestamp, '+1 day')
+  )
+ORDER BY h.rowid
+LIMIT ?
+"""
+
+# Old rows that are not the newest row of their booking (that one always stays live)
+ARCHIVE_CANDIDATES = """
+SELECT h.rowid FROM Travel_History h
+WHERE h.rowid > ? AND h.timestamp < ?
+  AND EXISTS (
+      SELECT 1 FROM Travel_History later
+      WHERE later.travel_id = h.travel_id
+        AND (later.timestamp, later.rowid) > (h.timestamp, h.rowid)
+  )
+ORDER BY h.rowid
+LIMIT ?
+"""
+
+
+def _cutoff(conn, days):
+    return conn.execute("SELECT datetime('now', ?)", (f"-{days} days",)).fetchone()[0]
+
+
+def _batches(conn, query, cutoff, batch_size):
+    """Yields lists of rowids, resuming after the last rowid of the previous batch."""
+    after = 0
+    while True:
+        rowids = [row[0] for row in conn.execute(query, (after, cutoff, batch_size))]
+        if not rowids:
+            return
+        yield rowids
+        after = rowids[-1]
+
+
+def _in_clause(rowids):
+    return f"rowid IN ({', '.join('?' for _ in rowids)})"
+
+
+# --- Jobs ---
+
+def compact_history(conn, days=FULL_DETAIL_DAYS, batch_size=BATCH_SIZE, dry_run=False, pause=BATCH_PAUSE):
+    """Collapses history older than `days` to the last row per booking per day.
+
+    The last row of a day carries the net result of that day's changes.
+    Returns the number of rows removed (or that would be removed).
+    """
+    cutoff = _cutoff(conn, days)
+    removed = 0
+    for rowids in _batches(conn, COMPACT_CANDIDATES, cutoff, batch_size):
+        if not dry_run:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"DELETE FROM Travel_History WHERE {_in_clause(rowids)}", rowids)
+            conn.execute("COMMIT")
+            time.sleep(pause)
+        removed += len(rowids)
+    return removed
+
+
+def archive_history(conn, days=ARCHIVE_AFTER_DAYS, archive_path=ARCHIVE_PATH,
+                    batch_size=BATCH_SIZE, dry_run=False, pause=BATCH_PAUSE):
+    """Moves history older than `days` into the archive database.
+
+    The newest row of every booking stays in the live table. Each batch is
+    copied to the archive and committed there before it is deleted from the
+    live table (WAL commits are not atomic across attached files), so an
+    interrupted run leaves duplicates at worst, which the next run skips.
+    Returns the number of rows moved (or that would be moved).
+    """
+    cutoff = _cutoff(conn, days)
+    moved = 0
+    if not dry_run:
+        conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        conn.executescript(ARCHIVE_SCHEMA)
+        # Archives created before history kept delete tombstones lack the column
+        if "deleted" not in [row[1] for row in conn.execute("PRAGMA archive.table_info(Travel_History)")]:
+            conn.execute("ALTER TABLE archive.Travel_History ADD COLUMN deleted INTEGER DEFAULT 0")
+    try:
+        for rowids in _batches(conn, ARCHIVE_CANDIDATES, cutoff, batch_size):
+            if not dry_run:
+                conn.execute("BEGIN")
+                conn.execute(
+                    f"INSERT OR IGNORE INTO archive.Travel_History (history_id, {', '.join(HISTORY_COLUMNS)}) "
+                    f"SELECT rowid, {', '.join(HISTORY_COLUMNS)} FROM main.Travel_History WHERE {_in_clause(rowids)}",
+                    rowids,
+                )
+                conn.execute("COMMIT")
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(f"DELETE FROM main.Travel_History WHERE {_in_clause(rowids)}", rowids)
+                conn.execute("COMMIT")
+                time.sleep(pause)
+            moved += len(rowids)
+    finally:
+        if not dry_run:
+            conn.execute("DETACH DATABASE archive")
+    return moved
+
+
+def run_retention(db_path=DB_PATH, full_detail_days=FULL_DETAIL_DAYS, archive_after_days=ARCHIVE_AFTER_DAYS,
+                  archive_path=ARCHIVE_PATH, batch_size=BATCH_SIZE, dry_run=False):
+    """Compacts, then archives Travel_History. Returns a dict of row counts."""
+    if archive_after_days <= full_detail_days:
+        raise ValueError("archive_after_days must be greater than full_detail_days")
+    # Autocommit mode: the jobs manage their own short transactions
+    with closing(sqlite3.connect(db_path, timeout=30, isolation_level=None)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        compacted = compact_history(conn, full_detail_days, batch_size, dry_run)
+        archived = archive_history(conn, archive_after_days, archive_path, batch_size, dry_run)
+    return {"archived": archived, "compacted": compacted}
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact and archive Travel_History.")
+    parser.add_argument("--database", default=DB_PATH)
+    parser.add_argument("--full-detail-days", type=int, default=FULL_DETAIL_DAYS,
+                        help="Keep every history row newer than this many days")
+    parser.add_argument("--archive-after-days", type=int, default=ARCHIVE_AFTER_DAYS,
+                        help="Move history older than this many days to the archive")
+    parser.add_argument("--archive", default=ARCHIVE_PATH, help="Archive database file")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would change")
+    args = parser.parse_args(argv)
+
+    result = run_retention(args.database, args.full_detail_days, args.archive_after_days,
+                           args.archive, args.batch_size, args.dry_run)
+    prefix = "Would have " if args.dry_run else ""
+    print(f"{prefix}compacted {result['compacted']} and archived {result['archived']} Travel_History rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+from collections import OrderedDict
+import streamlit as st
+from utils.database import get_read_connection, data_version
+
+# Results returned by one search
+SEARCH_LIMIT = 20
+
+# Choices offered by the customer picker, and searches it remembers per session
+PICKER_LIMIT = 10
+PICKER_CACHE_SIZE = 64
+
+# Matches ranked per search; a one-letter prefix can match most of the table, and
+# ranking every match is what makes a search slow, so only the first ones are ranked
+SEARCH_CANDIDATES = 1000
+
+# Hangul names are indexed as all their suffixes so a prefix query finds any substring
+# ('동규' matches '이동규'); names longer than this are only searchable by their first part
+HANGUL_SUFFIXES = 8
+
+# unicode61 folds case and diacritics; prefix indexes make 2-3 character prefix queries cheap
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+def _suffixes(expression):
+    """SQL expression listing every suffix of a space-free text, space separated."""
+    text = f"replace(IFNULL({expression}, ''), ' ', '')"
+    return " || ' ' || ".join(f"substr({text}, {start})" for start in range(1, HANGUL_SUFFIXES + 1))
+
+
+def _customer_values(row):
+    names = f"IFNULL({row}.first_name, '') || ' ' || IFNULL({row}.middle_name, '') || ' ' || IFNULL({row}.last_name, '')"
+    return f"{row}.customer_id, {names}, {_suffixes(f'{row}.hangul_name')}"
+
+
+def _travel_values(row):
+    return f"{row}.travel_id, IFNULL({row}.confirmation_code, ''), IFNULL({row}.Notes, '')"
+
+
+SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS Customer_Search USING fts5(
+    names, hangul, {FTS_OPTIONS}
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS Travel_Search USING fts5(
+    confirmation_code, Notes, {FTS_OPTIONS}
+);
+
+CREATE TRIGGER IF NOT EXISTS customer_search_insert
+AFTER INSERT ON Customer
+FOR EACH ROW
+BEGIN
+    INSERT INTO Customer_Search (rowid, names, hangul) VALUES ({_customer_values("NEW")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS customer_search_delete
+AFTER DELETE ON Customer
+FOR EACH ROW
+BEGIN
+    DELETE FROM Customer_Search WHERE rowid = OLD.customer_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS customer_search_update
+AFTER UPDATE OF first_name, middle_name, last_name, hangul_name ON Customer
+FOR EACH ROW
+BEGIN
+    DELETE FROM Customer_Search WHERE rowid = OLD.customer_id;
+    INSERT INTO Customer_Search (rowid, names, hangul) VALUES ({_customer_values("NEW")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS travel_search_insert
+AFTER INSERT ON Travel
+FOR EACH ROW
+BEGIN
+    INSERT INTO Travel_Search (rowid, confirmation_code, Notes) VALUES ({_travel_values("NEW")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS travel_search_delete
+AFTER DELETE ON Travel
+FOR EACH ROW
+BEGIN
+    DELETE FROM Travel_Search WHERE rowid = OLD.travel_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS travel_search_update
+AFTER UPDATE OF confirmation_code, Notes ON Travel
+FOR EACH ROW
+BEGIN
+    DELETE FROM Travel_Search WHERE rowid = OLD.travel_id;
+    INSERT INTO Travel_Search (rowid, confirmation_code, Notes) VALUES ({_travel_values("NEW")});
+END;
+"""
+
+
+# --- Maintenance ---
+
+def rebuild_search_index(conn, optimize=True):
+    """Refills both search tables from Customer and Travel (used by migrations and for repair).
+
+    optimize merges the index segments afterwards; a bulk load can skip it.
+    """
+    conn.execute("DELETE FROM Customer_Search")
+    conn.execute(
+        "INSERT INTO Customer_Search (rowid, names, hangul) "
+        f"SELECT {_customer_values('Customer')} FROM Customer"
+    )
+    conn.execute("DELETE FROM Travel_Search")
+    conn.execute(
+        f"INSERT INTO Travel_Search (rowid, confirmation_code, Notes) SELECT {_travel_values('Travel')} FROM Travel"
+    )
+    if optimize:
+        conn.execute("INSERT INTO Customer_Search (Customer_Search) VALUES ('optimize')")
+        conn.execute("INSERT INTO Travel_Search (Travel_Search) VALUES ('optimize')")
+
+
+def create_search_index(conn, run_script):
+    """Migration 2: search tables, their sync triggers and the initial backfill."""
+    run_script(conn, SEARCH_SCHEMA)
+    rebuild_search_index(conn)
+
+
+# --- Queries ---
+
+def match_expression(text):
+    """Turns what the user typed into an FTS5 query: every word must match as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    treated as plain text. Returns None when there is nothing to search for.
+    """
+    terms = [term.replace('"', '""') for term in (text or "").split()]
+    terms = [term for term in terms if term.strip('"')]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_customers(text, limit=SEARCH_LIMIT, active_only=True, representatives_only=False):
+    """Best-ranked customers whose names or hangul name match text, as a DataFrame."""
+    import pandas as pd
+
+    match = match_expression(text)
+    columns = ["customer_id", "first_name", "middle_name", "last_name", "hangul_name", "is_representative"]
+    if match is None:
+        return pd.DataFrame(columns=columns)
+    # Filtered inside the candidate query, so inactive or non-representative matches
+    # do not use up SEARCH_CANDIDATES and hide the customers asked for
+    conditions = ["Customer_Search MATCH ?"] + (["c.status = 1"] if active_only else []) + \
+        (["c.is_representative = 1"] if representatives_only else [])
+    query = (
+        f"SELECT {', '.join(columns)} FROM ("
+        f"SELECT {', '.join('c.' + col for col in columns)}, Customer_Search.rank FROM Customer_Search "
+        f"JOIN Customer c ON c.customer_id = Customer_Search.rowid WHERE {' AND '.join(conditions)} LIMIT ?"
+        ") ORDER BY rank LIMIT ?"
+    )
+    with get_read_connection() as conn:
+        cursor = conn.execute(query, (match, SEARCH_CANDIDATES, limit))
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
+def search_travels(text, limit=SEARCH_LIMIT):
+    """Best-ranked bookings whose confirmation code or Notes match text, as Travel_View rows."""
+    import pandas as pd
+
+    match = match_expression(text)
+    if match is None:
+        return pd.DataFrame()
+    with get_read_connection() as conn:
+        return pd.read_sql_query(
+            "SELECT v.* FROM (SELECT rowid, rank FROM Travel_Search WHERE Travel_Search MATCH ? LIMIT ?) s "
+            "JOIN Travel_View v ON v.travel_id = s.rowid ORDER BY s.rank LIMIT ?",
+            conn, params=(match, SEARCH_CANDIDATES, limit),
+        )
+
+
+# --- Customer Picker ---
+
+def _customer_label(row):
+    name = " ".join(part for part in (row.first_name, row.middle_name, row.last_name) if part)
+    hangul = f" ({row.hangul_name})" if row.hangul_name else ""
+    return f"{name}{hangul} · #{row.customer_id}"
+
+
+def _picker_matches(text, representatives_only):
+    """{customer_id: label} for text, remembered per session (LRU) until the database changes."""
+    cache = st.session_state.setdefault("customer_picker_cache", OrderedDict())
+    key = (" ".join(text.lower().split()), representatives_only, data_version())
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    df = search_customers(text, limit=PICKER_LIMIT, representatives_only=representatives_only)
+    matches = {int(row.customer_id): _customer_label(row) for row in df.itertuples(index=False)}
+    cache[key] = matches
+    while len(cache) > PICKER_CACHE_SIZE:
+        cache.popitem(last=False)
+    return matches
+
+
+def customer_picker(label, key, representatives_only=False, help=None):
+    """Search-as-you-type customer selector; returns the chosen customer_id or None.
+
+    Only the best PICKER_LIMIT matches for what was typed are sent to the
+    browser. Text inputs inside st.form do not rerun the page, so place the
+    picker outside any form.
+    """
+    text = st.text_input(label, key=f"{key}_text", placeholder="Type a name or hangul name", help=help)
+    try:
+        matches = _picker_matches(text, representatives_only) if text.strip() else {}
+    except Exception as e:
+        st.error(f"Error searching customers: {e}")
+        matches = {}
+    if text.strip() and not matches:
+        st.caption("No matching customer.")
+    # New search text: preselect the best match
+    if st.session_state.get(f"{key}_searched") != text:
+        st.session_state[f"{key}_searched"] = text
+        st.session_state[f"{key}_choice"] = next(iter(matches), None)
+    return st.selectbox(
+        f"{label} match", options=[None] + list(matches),
+        format_func=lambda customer_id: "Select..." if customer_id is None else matches[customer_id],
+        key=f"{key}_choice", label_visibility="collapsed", disabled=not matches,
+    )
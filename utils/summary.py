@@ -0,0 +1,131 @@
+from utils.database import get_read_connection
+
+# Totals kept in Travel_Summary
+SUMMARY_COLUMNS = ["deposite", "payment", "event_expense", "airfair_IB", "airfair_OB"]
+
+# scope -> expression giving the group key of a Travel row ({row} is NEW or OLD)
+SUMMARY_SCOPES = {
+    "all": "''",
+    "vendor": "IFNULL({row}.vendor_id, '')",
+    "product": "IFNULL({row}.product_id, '')",
+    "month": "IFNULL(substr({row}.pickup_time, 1, 7), '')",  # YYYY-MM of the pickup
+}
+
+
+def _apply_row(row, sign):
+    """Upserts adding (sign '+') or removing (sign '-') one Travel row from every scope."""
+    statements = []
+    for scope, key in SUMMARY_SCOPES.items():
+        values = ", ".join(f"{sign}CAST(IFNULL({row}.{col}, 0) AS INTEGER)" for col in SUMMARY_COLUMNS)
+        updates = ", ".join(f"{col} = {col} + excluded.{col}" for col in SUMMARY_COLUMNS)
+        statements.append(
+            f"    INSERT INTO Travel_Summary (scope, key, record_count, {', '.join(SUMMARY_COLUMNS)})\n"
+            f"    VALUES ('{scope}', {key.format(row=row)}, {sign}1, {values})\n"
+            f"    ON CONFLICT (scope, key) DO UPDATE SET record_count = record_count + excluded.record_count, {updates};"
+        )
+    return "\n".join(statements)
+
+
+SUMMARY_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS Travel_Summary (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    record_count INTEGER DEFAULT 0,
+    {', '.join(f'{col} INTEGER DEFAULT 0' for col in SUMMARY_COLUMNS)},
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS travel_summary_insert
+AFTER INSERT ON Travel
+FOR EACH ROW
+BEGIN
+{_apply_row("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS travel_summary_delete
+AFTER DELETE ON Travel
+FOR EACH ROW
+BEGIN
+{_apply_row("OLD", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS travel_summary_update
+AFTER UPDATE ON Travel
+FOR EACH ROW
+BEGIN
+{_apply_row("OLD", "-")}
+{_apply_row("NEW", "+")}
+END;
+"""
+
+# Columns a Travel row's contribution to Travel_Summary depends on
+SUMMARY_INPUT_COLUMNS = ["vendor_id", "product_id", "pickup_time"] + SUMMARY_COLUMNS
+
+# Migration 6: the update trigger only moves a row between groups when one of its inputs
+# changed, instead of 2 x 4 upserts for every UPDATE of Travel (e.g. a Notes edit)
+SUMMARY_UPDATE_TRIGGER = f"""
+DROP TRIGGER IF EXISTS travel_summary_update;
+
+CREATE TRIGGER travel_summary_update
+AFTER UPDATE OF {', '.join(SUMMARY_INPUT_COLUMNS)} ON Travel
+FOR EACH ROW
+WHEN {' OR '.join(f'NEW.{col} IS NOT OLD.{col}' for col in SUMMARY_INPUT_COLUMNS)}
+BEGIN
+{_apply_row("OLD", "-")}
+{_apply_row("NEW", "+")}
+END;
+"""
+
+REBUILD_QUERY = " UNION ALL ".join(
+    f"SELECT '{scope}', {key.format(row='Travel')}, COUNT(*), "
+    + ", ".join(f"TOTAL(CAST(IFNULL({col}, 0) AS INTEGER))" for col in SUMMARY_COLUMNS)
+    + " FROM Travel GROUP BY 2"
+    for scope, key in SUMMARY_SCOPES.items()
+)
+
+
+# Scopes keyed by a lookup id: (name table, id column) used to show names
+SCOPE_NAMES = {
+    "vendor": ("Vendor", "vendor_id"),
+    "product": ("Product", "product_id"),
+}
+
+
+# --- Maintenance ---
+
+def rebuild_travel_summary(conn):
+    """Recomputes Travel_Summary from scratch (used by migrations and for repair)."""
+    conn.execute("DELETE FROM Travel_Summary")
+    conn.execute(
+        f"INSERT INTO Travel_Summary (scope, key, record_count, {', '.join(SUMMARY_COLUMNS)}) {REBUILD_QUERY}"
+    )
+
+
+# --- Reads ---
+
+def get_summary_totals():
+    """Overall totals as a dict (record_count plus each money column)."""
+    with get_read_connection() as conn:
+        cursor = conn.execute("SELECT * FROM Travel_Summary WHERE scope = 'all' AND key = ''")
+        row = cursor.fetchone()
+        columns = [col[0] for col in cursor.description]
+    totals = dict(zip(columns, row)) if row else {}
+    return {col: totals.get(col) or 0 for col in ["record_count"] + SUMMARY_COLUMNS}
+
+
+def get_summary_breakdown(scope):
+    """Per-group totals for 'vendor', 'product' or 'month', skipping emptied groups."""
+    import pandas as pd
+
+    columns = "s.record_count, " + ", ".join(f"s.{col}" for col in SUMMARY_COLUMNS)
+    if scope in SCOPE_NAMES:
+        table, key = SCOPE_NAMES[scope]
+        query = (
+            f"SELECT IFNULL(n.{table}, s.key) AS {table}, {columns} FROM Travel_Summary s "
+            f"LEFT JOIN {table} n ON n.{key} = s.key "
+            "WHERE s.scope = ? AND s.record_count > 0 ORDER BY 1"
+        )
+    else:
+        query = f"SELECT s.key, {columns} FROM Travel_Summary s WHERE s.scope = ? AND s.record_count > 0 ORDER BY 1"
+    with get_read_connection() as conn:
+        return pd.read_sql_query(query, conn, params=(scope,))
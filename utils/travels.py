@@ -0,0 +1,157 @@
+import streamlit as st
+from utils.database import get_read_connection
+from utils.frames import compact_frame
+from utils.search import match_expression
+
+# Columns the listing may be sorted by (whitelisted because they are spliced into SQL).
+# Only indexed Travel columns: a keyset page on anything else, such as a joined
+# name, scans and sorts the whole table for every page.
+SORTABLE_COLUMNS = ["travel_id", "pickup_time", "confirmation_code"]
+
+# Column types of the loaded Travel_View (see compact_frame); the name columns are
+# either read-only or picked from the lookups in the editor, so they can be categorical
+TRAVEL_VIEW_TYPES = {
+    "categorical": ["Representative", "Customer", "Client", "Product", "Vendor", "Flight", "Pickup"],
+    "integer": [
+        "travel_id", "airfair_IB", "airfair_OB", "deposite", "payment", "event_expense",
+        "representative_id", "client_id", "product_id", "vendor_id", "customer_id", "flight_id", "pickup_id",
+    ],
+    "datetime": ["pickup_time", "time_IB", "time_OB"],
+}
+
+# Upper bound appended to a prefix so a range scan can use the index
+PREFIX_END = "\U0010ffff"
+
+
+# --- Filters ---
+
+def build_travel_filters(filters):
+    """Turns a filters dict into a SQL WHERE clause and its parameters.
+
+    Supported keys (all optional): date_from, date_to (dates, compared to
+    pickup_time), vendor_id, product_id, client_id, customer_id,
+    representative_id, confirmation_code (prefix match) and search (words matched against
+    confirmation codes and Notes through Travel_Search). Every condition is on a Travel column,
+    so the clause works against Travel and Travel_View alike.
+    """
+    filters = filters or {}
+    clauses = []
+    params = []
+
+    if filters.get("date_from"):
+        clauses.append("pickup_time >= ?")
+        params.append(str(filters["date_from"]))
+    if filters.get("date_to"):
+        # Inclusive end date: everything before the start of the next day
+        clauses.append("pickup_time < date(?, '+1 day')")
+        params.append(str(filters["date_to"]))
+    for column in ("vendor_id", "product_id", "client_id", "customer_id", "representative_id"):
+        if filters.get(column) is not None:
+            clauses.append(f"{column} = ?")
+            params.append(int(filters[column]))
+    if filters.get("confirmation_code"):
+        code = filters["confirmation_code"].strip()
+        clauses.append("confirmation_code >= ? AND confirmation_code < ?")
+        params.extend([code, code + PREFIX_END])
+    match = match_expression(filters.get("search"))
+    if match:
+        clauses.append("travel_id IN (SELECT rowid FROM Travel_Search WHERE Travel_Search MATCH ?)")
+        params.append(match)
+
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return where, params
+
+
+def _keyset_clause(sort_by, descending, cursor):
+    """Condition selecting rows strictly after the (sort value, travel_id) cursor.
+
+    SQLite sorts NULLs first, so they come last in descending order.
+    """
+    value, last_id = cursor
+    if sort_by == "travel_id":
+        return ("travel_id < ?" if descending else "travel_id > ?"), [last_id]
+    op = "<" if descending else ">"
+    if value is None:
+        if descending:
+            return f"({sort_by} IS NULL AND travel_id < ?)", [last_id]
+        return f"(({sort_by} IS NULL AND travel_id > ?) OR {sort_by} IS NOT NULL)", [last_id]
+    clause = f"(({sort_by}, travel_id) {op} (?, ?))"
+    if descending:
+        clause = f"({clause} OR {sort_by} IS NULL)"
+    return clause, [value, last_id]
+
+
+# --- Queries ---
+
+def fetch_travel_page(filters=None, sort_by="travel_id", descending=True, page_size=50, cursor=None):
+    """Fetches one window of Travel_View rows (names resolved) using keyset pagination.
+
+    Returns (df, next_cursor). Pass next_cursor back in to get the following
+    page; it is None when there are no more rows.
+    """
+    import pandas as pd
+
+    if sort_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Cannot sort Travel by {sort_by!r}")
+
+    where, params = build_travel_filters(filters)
+    if cursor is not None:
+        clause, cursor_params = _keyset_clause(sort_by, descending, cursor)
+        where = f"{where} AND {clause}" if where else f" WHERE {clause}"
+        params = params + cursor_params
+
+    direction = "DESC" if descending else "ASC"
+    order = f"travel_id {direction}" if sort_by == "travel_id" else f"{sort_by} {direction}, travel_id {direction}"
+    query = f"SELECT * FROM Travel_View{where} ORDER BY {order} LIMIT ?"
+
+    try:
+        with get_read_connection() as conn:
+            # Fetch one extra row to find out whether another page exists
+            cur = conn.execute(query, params + [page_size + 1])
+            rows = cur.fetchall()
+            columns = [col[0] for col in cur.description]
+            df = pd.DataFrame(rows[:page_size], columns=columns)
+    except Exception as e:
+        st.error(f"Error fetching travel data: {e}")
+        return pd.DataFrame(), None
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = rows[page_size - 1]
+        next_cursor = (last[columns.index(sort_by)], last[columns.index("travel_id")])
+    return df, next_cursor
+
+
+def count_travels(filters=None, exact=True):
+    """Counts rows matching the filters.
+
+    With exact=False and no filters the count is estimated from the id range,
+    which is O(1) but overcounts deleted rows.
+    """
+    where, params = build_travel_filters(filters)
+    try:
+        with get_read_connection() as conn:
+            if not exact and not where:
+                # Separate subqueries: SQLite only answers a lone MIN() or MAX() from the index
+                row = conn.execute(
+                    "SELECT IFNULL((SELECT MAX(travel_id) FROM Travel) - (SELECT MIN(travel_id) FROM Travel) + 1, 0)"
+                ).fetchone()
+            else:
+                row = conn.execute(f"SELECT COUNT(*) FROM Travel{where}", params).fetchone()
+            return row[0]
+    except Exception as e:
+        st.error(f"Error counting travel data: {e}")
+        return 0
+
+
+def load_travel_view(categories=None):
+    """Every Travel row with its names resolved, ordered by travel_id (for the editor page).
+
+    Typed by TRAVEL_VIEW_TYPES; categories ({column: names}) adds the names an
+    editor may pick that no row uses yet.
+    """
+    import pandas as pd
+
+    with get_read_connection() as conn:
+        df = pd.read_sql_query("SELECT * FROM Travel_View ORDER BY travel_id", conn)
+    return compact_frame(df, categories=categories, **TRAVEL_VIEW_TYPES)
@@ -0,0 +1,184 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+import streamlit as st
+from utils.database import (DB_PATH, BUSY_TIMEOUT_MS, CONNECTION_PRAGMAS, InstrumentedConnection,
+                            get_pool)
+
+# Most jobs one transaction takes from the queue; small writes arriving together share a commit
+MAX_BATCH_JOBS = int(os.environ.get("TRAVEL_WRITER_BATCH", "64"))
+
+# How long a page waits for its write before reporting a failure (seconds)
+WRITE_TIMEOUT = 30
+
+
+class _Job:
+    __slots__ = ("function", "args", "future", "queued")
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+        self.future = Future()
+        self.queued = time.perf_counter()
+
+
+class Writer:
+    """The one thread that writes to the database.
+
+    Write jobs are functions called as function(conn, *args) on the writer's
+    connection. Whatever is queued when the writer is free runs in one
+    transaction, each job inside its own savepoint: a job that raises is
+    rolled back alone and its future gets the exception, the others are
+    committed together. Futures resolve only after the COMMIT, so a result
+    means the write is durable. Jobs must not call commit() or rollback().
+    """
+
+    def __init__(self, path, max_batch=MAX_BATCH_JOBS):
+        self.path = path
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "jobs": 0, "failed_jobs": 0, "transactions": 0, "failed_transactions": 0, "max_batch": 0,
+            "queue_wait_ms": 0.0, "max_queue_wait_ms": 0.0,
+            "lock_wait_ms": 0.0, "max_lock_wait_ms": 0.0, "transaction_ms": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, function, *args):
+        """Queues function(conn, *args); returns a concurrent.futures.Future for its result."""
+        job = _Job(function, args)
+        self._queue.put(job)
+        return job.future
+
+    def metrics(self):
+        """Counters since start, plus the current queue depth."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = self._queue.qsize()
+        return metrics
+
+    # --- Writer thread ---
+
+    def _connect(self):
+        # Transactions are issued explicitly (BEGIN IMMEDIATE / SAVEPOINT)
+        conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None,
+                               timeout=BUSY_TIMEOUT_MS / 1000, factory=InstrumentedConnection)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _run(self):
+        conn = None
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < self.max_batch:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            jobs = [job for job in jobs if job.future.set_running_or_notify_cancel()]
+            if not jobs:
+                continue
+            try:
+                if conn is None:
+                    conn = self._connect()
+                self._run_transaction(conn, jobs)
+            except Exception as e:
+                with self._lock:
+                    self._metrics["failed_transactions"] += 1
+                if conn is not None and conn.in_transaction:
+                    try:
+                        conn.execute("ROLLBACK")
+                    except sqlite3.Error:
+                        conn.close()
+                        conn = None  # Reopened for the next batch
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def _run_transaction(self, conn, jobs):
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")  # Waits up to the busy timeout for other processes
+        locked = time.perf_counter()
+
+        outcomes = []
+        for job in jobs:
+            conn.execute("SAVEPOINT job")
+            try:
+                outcomes.append((job, None, job.function(conn, *job.args)))
+                conn.execute("RELEASE job")
+            except Exception as e:
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                outcomes.append((job, e, None))
+        conn.execute("COMMIT")
+        finished = time.perf_counter()
+
+        queue_waits = [(started - job.queued) * 1000 for job in jobs]
+        with self._lock:
+            metrics = self._metrics
+            metrics["jobs"] += len(jobs)
+            metrics["failed_jobs"] += sum(error is not None for _, error, _ in outcomes)
+            metrics["transactions"] += 1
+            metrics["max_batch"] = max(metrics["max_batch"], len(jobs))
+            metrics["queue_wait_ms"] += sum(queue_waits)
+            metrics["max_queue_wait_ms"] = max(metrics["max_queue_wait_ms"], *queue_waits)
+            metrics["lock_wait_ms"] += (locked - started) * 1000
+            metrics["max_lock_wait_ms"] = max(metrics["max_lock_wait_ms"], (locked - started) * 1000)
+            metrics["transaction_ms"] += (finished - locked) * 1000
+
+        for job, error, result in outcomes:
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+
+
+@st.cache_resource
+def get_writer():
+    """Process-wide writer thread, started after the schema is up to date."""
+    get_pool()  # Runs pending migrations before anything is queued
+    return Writer(DB_PATH)
+
+
+def submit_write(function, *args):
+    """Queues function(conn, *args) on the writer; returns a Future."""
+    return get_writer().submit(function, *args)
+
+
+def run_write(function, *args, timeout=WRITE_TIMEOUT):
+    """Queues function(conn, *args) and waits for it; returns its result or raises its error.
+
+    On timeout a job still in the queue is cancelled, so it never runs. One the
+    writer has already started may still commit, and the TimeoutError says so:
+    retrying it blindly could apply it twice.
+    """
+    future = submit_write(function, *args)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        if future.cancel():
+            raise TimeoutError(f"Write was still queued after {timeout} s and was cancelled; "
+                               "nothing was written.") from None
+        if future.done():  # Finished between the timeout and cancel()
+            return future.result()
+        raise TimeoutError(f"Write still running after {timeout} s; it may yet be applied, "
+                           "so check before retrying.") from None
+
+
+def execute_write(sql, params=(), timeout=WRITE_TIMEOUT):
+    """Runs one statement on the writer; returns (lastrowid, rowcount)."""
+    def execute(conn):
+        cursor = conn.execute(sql, params)
+        return cursor.lastrowid, cursor.rowcount
+    return run_write(execute, timeout=timeout)
+
+
+def writer_metrics():
+    """Writer counters since the process started, plus the current queue depth."""
+    return get_writer().metrics()